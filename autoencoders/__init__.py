@@ -19,3 +19,4 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTI
 """
 
 from .autoencoder import AutoEncoder
+from .paired_evaluation import PairedErrorCounts, PairedEvaluation
@@ -24,9 +24,12 @@ import warnings
 
 
 from encoders import Encoder
-from channels import AWGN
+from channels import AWGN, ImportanceSamplingAWGN
 from decoders import Decoder
+from decoders.codebook import minimum_weight_codewords
 from code_generators import CodeGenerator
+from metrics import PerSNRBitErrorRate, PerSNRBlockErrorRate
+from tools import decibeltolinear
 
 
 class AutoEncoder(tf.keras.Model):
@@ -41,6 +44,22 @@ class AutoEncoder(tf.keras.Model):
         H=None,
         trainable_code=True,
         trainable_decoder=True,
+        decoder_engine="dense",
+        decoder_early_stopping=False,
+        decoder_core="rnn",
+        decoder_ml_chunk_size=None,
+        decoder_ml_metric="correlation",
+        decoder_ml_algorithm="auto",
+        decoder_ml_cache_dir=None,
+        decoder_osd_order=2,
+        decoder_chase_n_flips=3,
+        decoder_fallback=None,
+        all_zero_codeword=False,
+        evaluation_noise_powers_db=None,
+        importance_sampling=None,
+        importance_sampling_variance_scaling=2.0,
+        importance_sampling_translation=1.0,
+        stopping_rule=None,
         **kwargs,
     ):
         super(AutoEncoder, self).__init__(**kwargs)
@@ -52,7 +71,30 @@ class AutoEncoder(tf.keras.Model):
             n, k, G, H, trainable_code, name="code_generator"
         )
         self.encoder = Encoder(n, k, name="encoder")
-        self.channel = AWGN(noise_power_db=training_noise_power_db, name="channel")
+        # Importance sampling: the evaluation noise is biased ("scaling" or "translation" toward the minimum weight
+        # codewords, see channels.ImportanceSamplingAWGN) and the errors are weighted by the likelihood ratios of the
+        # noise samples (sample_weight of the weighted metrics built with likelihood_ratios=True, see test_step)
+        self.importance_sampling = importance_sampling
+        if importance_sampling is None:
+            self.channel = AWGN(noise_power_db=training_noise_power_db, name="channel")
+        else:
+            translation_codewords = None
+            if importance_sampling == "translation":
+                if G == None:
+                    raise ValueError(
+                        "The translation importance sampling requires the Generator matrix"
+                    )
+                translation_codewords = minimum_weight_codewords(
+                    G, decoder_ml_cache_dir
+                )
+            self.channel = ImportanceSamplingAWGN(
+                noise_power_db=training_noise_power_db,
+                method=importance_sampling,
+                variance_scaling=importance_sampling_variance_scaling,
+                translation_codewords=translation_codewords,
+                translation=importance_sampling_translation,
+                name="channel",
+            )
         self.decoder = Decoder(
             n,
             n - k,
@@ -60,17 +102,36 @@ class AutoEncoder(tf.keras.Model):
             n_iter=n_iter,
             trainable=trainable_decoder,
             conf=conf,
+            engine=decoder_engine,
+            H=H,
+            early_stopping=decoder_early_stopping,
+            core=decoder_core,
+            ml_chunk_size=decoder_ml_chunk_size,
+            ml_metric=decoder_ml_metric,
+            ml_algorithm=decoder_ml_algorithm,
+            ml_cache_dir=decoder_ml_cache_dir,
+            osd_order=decoder_osd_order,
+            chase_n_flips=decoder_chase_n_flips,
+            fallback=decoder_fallback,
             name="decoder",
         )
 
-        if conf == "ML":
+        if conf in ["ML", "OSD"]:
             if G == None:
                 warnings.warn(
-                    "Decoder type was set to ML but no Generator matrix was provided"
+                    f"Decoder type was set to {conf} but no Generator matrix was provided"
                 )
             else:  #!!!!!!!!!!!!!! WORKAROUND
                 self.decoder.decoder.init_codebook(G)
 
+        if decoder_fallback in ["ML", "OSD"] and G != None:
+            self.decoder.decoder.fallback_stage.init_codebook(G)
+
+        if conf in ["syndrome", "Chase"] and H == None:
+            warnings.warn(
+                f"Decoder type was set to {conf} but no Parity-Check matrix was provided"
+            )
+
         if conf in ["BP", "GNBP"]:
             if G == None or H == None:
                 warnings.warn(
@@ -91,14 +152,283 @@ class AutoEncoder(tf.keras.Model):
         self.n = n
         self.k = k
         self.training_noise_power_db = training_noise_power_db
+        self.set_all_zero_codeword(all_zero_codeword)
+
+        # SNR sweep: the inputs tagged with an SNR index (see dataset.random_messages_snr_dataset) are sent through the
+        # channel with the noise power of their index, and the errors are accumulated per SNR index by the "SNR_BER"
+        # and "SNR_BLER" metrics (the whole BER/BLER curve is evaluated by a single model.evaluate). The noise is drawn
+        # from the stateless streams of the noise key of the batch when provided (reproducible, shardable evaluation)
+        self.evaluation_noise_powers_db = evaluation_noise_powers_db
+        if evaluation_noise_powers_db is not None:
+            n_snr = len(evaluation_noise_powers_db)
+            self.evaluation_noise_powers = decibeltolinear(
+                tf.constant(evaluation_noise_powers_db, dtype=tf.float32)
+            )
+            likelihood_ratios = importance_sampling is not None
+            self.snr_ber = PerSNRBitErrorRate(
+                n_snr, name="SNR_BER", likelihood_ratios=likelihood_ratios
+            )
+            self.snr_bler = PerSNRBlockErrorRate(
+                n_snr, name="SNR_BLER", likelihood_ratios=likelihood_ratios
+            )
+
+        # Number of evaluation steps unknown to keras (see evaluate)
+        self.evaluation_size_unknown = False
+        self.set_stopping_rule(stopping_rule)
+
+    def set_all_zero_codeword(self, all_zero_codeword=True):
+        """
+        Enable (or disable) the all-zero codeword evaluation: in inference, the BPSK symbols of the all-zero codeword
+        are sent to the channel without encoding. For a linear code over the (symmetric) AWGN channel, the error rate of
+        a symmetric decoder does not depend on the transmitted codeword. The messages (labels) must be all-zero, e.g.
+        generated by dataset.all_zero_dataset.
+
+        Args:
+            all_zero_codeword (bool) [default=True]: whether the all-zero codeword is transmitted in inference
+
+        Raises:
+            ValueError: the decoder is not symmetric (see Decoder.symmetric)
+        """
+        if all_zero_codeword and not self.decoder.symmetric:
+            raise ValueError(
+                f"The all-zero codeword evaluation requires a symmetric decoder (decoder type {self.decoder.conf})"
+            )
+        self.all_zero_codeword = all_zero_codeword
+        # The evaluation and prediction functions already traced are rebuilt
+        self.test_function = None
+        self.predict_function = None
+        return True
+
+    def set_stopping_rule(self, stopping_rule=None):
+        """
+        Set (or remove) the sequential stopping rule of the evaluation (see callbacks.StoppingRule): the rule is
+        evaluated in the graph after every batch, the batches after the stop are skipped within the same execution of
+        steps_per_execution batches (see Model.compile) and the following executions are skipped on the host (the
+        evaluation returns the statistics at the stop). An evaluation of unknown size (dataset of unknown cardinality or
+        generator, without steps) ends at the execution following the stop. The stopping rule does not support
+        distribution strategies.
+
+        Args:
+            stopping_rule (callbacks.StoppingRule) [default=None]: stopping rule, evaluation of all the steps when None
+        """
+        self.stopping_rule = stopping_rule
+        # The evaluation function already traced is rebuilt
+        self.test_function = None
+        return True
+
+    def reset_metrics(self):
+        super(AutoEncoder, self).reset_metrics()
+        if self.stopping_rule is not None:
+            self.stopping_rule.reset_state()
+
+    def evaluate(
+        self,
+        x=None,
+        y=None,
+        batch_size=None,
+        verbose=1,
+        sample_weight=None,
+        steps=None,
+        **kwargs,
+    ):
+        # Without steps, keras iterates over the dataset of unknown cardinality (or generator) until its end: the
+        # evaluation is then ended by the stopping rule (see make_test_function)
+        self.evaluation_size_unknown = steps is None and (
+            (isinstance(x, tf.data.Dataset) and x.cardinality() < 0)
+            or hasattr(x, "__next__")
+        )
+        return super(AutoEncoder, self).evaluate(
+            x=x,
+            y=y,
+            batch_size=batch_size,
+            verbose=verbose,
+            sample_weight=sample_weight,
+            steps=steps,
+            **kwargs,
+        )
+
+    def make_test_function(self, force=False):
+        """
+        Evaluation function of the stopping rule (see set_stopping_rule), the keras evaluation function otherwise.
+        Written against the evaluation loop of keras 2.8 (tf.keras.Model.evaluate and DataHandler): it relies on the
+        private attributes _steps_per_execution, _test_counter and _distribution_strategy of the model, and ends the
+        evaluation of unknown size by raising StopIteration (end of the data for keras). The evaluation of known size
+        runs its remaining steps without a call to the graph, which would be seen by keras as insufficient data.
+
+        Raises:
+            ValueError: the model uses a distribution strategy
+        """
+        if self.stopping_rule is None:
+            return super(AutoEncoder, self).make_test_function(force)
+        if self.test_function is not None and not force:
+            return self.test_function
+        if self._distribution_strategy is not None:
+            raise ValueError(
+                "The stopping rule of the evaluation does not support distribution strategies"
+            )
 
-    def call(self, inputs, training=False):
+        def test_function(iterator):
+            """Runs the batches of an execution until the stopping rule is met"""
+            for _ in tf.range(self._steps_per_execution):
+                if self.stopping_rule.stopped:
+                    break
+                data = next(iterator)
+                logs = self.test_step(data)
+                (_, y, _) = tf.keras.utils.unpack_x_y_sample_weight(data)
+                self.stopping_rule.update_state(logs, tf.shape(y, out_type=tf.int64)[0])
+                self._test_counter.assign_add(1)
+            return self.metrics_result()
+
+        if not self.run_eagerly:
+            test_function = tf.function(test_function, experimental_relax_shapes=True)
+
+        last_logs = {}
+
+        def run_test_function(iterator):
+            """Skips the executions after the stop (the statistics at the stop are returned)"""
+            if self.stopping_rule.stopped:
+                if self.evaluation_size_unknown:
+                    # Keras keeps the logs of the previous execution
+                    raise StopIteration("stopping rule")
+                return last_logs
+            last_logs.update(test_function(iterator))
+            return last_logs
+
+        self.test_function = run_test_function
+        return self.test_function
+
+    def test_step(self, data):
+        (x, y, sample_weight) = tf.keras.utils.unpack_x_y_sample_weight(data)
+        (y_pred, likelihood_ratios) = self(
+            x, training=False, return_likelihood_ratios=True
+        )
+        if self.importance_sampling is not None:
+            # Errors weighted by the likelihood ratios of the noise samples
+            if sample_weight is not None:
+                likelihood_ratios *= tf.reshape(sample_weight, [-1])
+            sample_weight = likelihood_ratios
+        # Errors per SNR index of the inputs tagged with SNR indices (evaluation only)
+        (_, snr_indices, _) = unpack_snr_inputs(x)
+        if snr_indices is not None:
+            self.snr_ber.update_state(y, y_pred, snr_indices, sample_weight)
+            self.snr_bler.update_state(y, y_pred, snr_indices, sample_weight)
+        self.compiled_loss(y, y_pred, sample_weight, regularization_losses=self.losses)
+        self.compiled_metrics.update_state(y, y_pred, sample_weight)
+        return self.metrics_result()
+
+    def metrics_result(self):
+        """Logs of the results of the metrics, the results of the metrics returning a dict are merged"""
+        logs = {}
+        for metric in self.metrics:
+            result = metric.result()
+            if isinstance(result, dict):
+                logs.update(result)
+            else:
+                logs[metric.name] = result
+        return logs
+
+    def transmit(
+        self,
+        messages,
+        noise_power=None,
+        noise_seed=None,
+        snr_indices=None,
+        n_snr=1,
+        training=False,
+    ):
+        """
+        Encode, transmit and decode the messages.
+
+        Args:
+            messages ([batch, k] tensor): messages
+            noise_power ([batch, 1] tensor) [default=None]: per sample noise power, the channel noise power when None
+            noise_seed, snr_indices, n_snr: stateless noise of the channel (see channels.AWGN.call)
+            training (bool) [default=False]: training mode
+
+        Returns:
+            ([batch, k] tensor, [batch] tensor): decoded messages and likelihood ratios of the noise samples (ones
+                without importance sampling)
+        """
         (G, H) = self.code_generator(tf.constant([1]), training=training)
-        symbols = self.encoder(inputs=[inputs, G], training=training)
+        if self.all_zero_codeword and not training:
+            tf.debugging.assert_equal(
+                messages,
+                tf.zeros_like(messages),
+                message="The all-zero codeword evaluation requires all-zero messages",
+            )
+            # BPSK symbols of the all-zero codeword (bit 0 -> -1)
+            symbols = -tf.ones([tf.shape(messages)[0], self.n])
+        else:
+            symbols = self.encoder(inputs=[messages, G], training=training)
 
-        noisy_symbols = self.channel(symbols, training=training)
-        sigma2 = self.channel.noise_power
+        if noise_power is None:
+            noisy_symbols = self.channel(
+                symbols,
+                training=training,
+                noise_seed=noise_seed,
+                snr_indices=snr_indices,
+                n_snr=n_snr,
+            )
+            noise_power = self.channel.noise_power
+        else:
+            noisy_symbols = self.channel(
+                symbols,
+                training=training,
+                noise_power=noise_power,
+                noise_seed=noise_seed,
+                snr_indices=snr_indices,
+                n_snr=n_snr,
+            )
+        if self.importance_sampling is None:
+            likelihood_ratios = tf.ones([tf.shape(messages)[0]])
+        else:
+            (noisy_symbols, likelihood_ratios) = noisy_symbols
         reconstructed_messages = self.decoder(
-            inputs=[noisy_symbols, G, H, sigma2], training=training
+            inputs=[noisy_symbols, G, H, noise_power], training=training
+        )
+        return reconstructed_messages, likelihood_ratios
+
+    def call(self, inputs, training=False, return_likelihood_ratios=False):
+        (inputs, snr_indices, noise_seed) = unpack_snr_inputs(inputs)
+        if snr_indices is not None and self.evaluation_noise_powers_db is None:
+            raise ValueError(
+                "Inputs tagged with SNR indices require the evaluation_noise_powers_db of the SNR sweep"
+            )
+
+        if snr_indices is None:
+            sigma2 = None
+            n_snr = 1
+        else:
+            # Per sample noise power [batch, 1]
+            sigma2 = tf.expand_dims(
+                tf.gather(self.evaluation_noise_powers, snr_indices), axis=-1
+            )
+            n_snr = len(self.evaluation_noise_powers_db)
+        (reconstructed_messages, likelihood_ratios) = self.transmit(
+            inputs,
+            noise_power=sigma2,
+            noise_seed=noise_seed,
+            snr_indices=snr_indices,
+            n_snr=n_snr,
+            training=training,
         )
+
+        if return_likelihood_ratios:
+            return reconstructed_messages, likelihood_ratios
         return reconstructed_messages
+
+
+def unpack_snr_inputs(inputs):
+    """
+    Messages, SNR indices and stateless noise key of the inputs tagged with the SNR index of each sample (and the
+    noise key of the batch), see dataset.random_messages_snr_dataset.
+
+    Returns:
+        ([batch, k] tensor, [batch] tensor, [2] tensor): messages, SNR indices and noise key (None when not provided)
+    """
+    if not isinstance(inputs, (tuple, list)):
+        return (inputs, None, None)
+    if len(inputs) == 3:
+        return tuple(inputs)
+    (messages, snr_indices) = inputs
+    return (messages, snr_indices, None)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Paired evaluation of auto-encoders
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import statistics
+
+import numpy as np
+import tensorflow as tf
+
+from dataset import random_messages_snr_dataset
+from metrics.per_snr import hard_decisions
+from tools import decibeltolinear
+
+
+class PairedErrorCounts:
+    """
+    Error counts of several models evaluated on the same samples (common random numbers): the per sample errors of the
+    models are correlated and the error rate differences between models are estimated with paired confidence intervals,
+    much tighter than the intervals of independent evaluations.
+
+    Args:
+        names (list of str): names of the models
+        k (int): number of information bits
+        noise_powers_db (list of float): noise power (dB) of each SNR index
+        samples ([S] int64 array): number of samples of each SNR index
+        bit_errors ([M, S] int64 array): number of bit errors of each model and SNR index
+        block_errors ([M, S] int64 array): number of block errors of each model and SNR index
+        bit_errors_products ([M, M, S] int64 array): sum over the samples of the products of the bit errors of two
+            models (sum of e_i e_j, e being the number of bit errors of a sample)
+        block_errors_products ([M, M, S] int64 array): number of samples in error for both models
+    """
+
+    def __init__(
+        self,
+        names,
+        k,
+        noise_powers_db,
+        samples,
+        bit_errors,
+        block_errors,
+        bit_errors_products,
+        block_errors_products,
+    ):
+        self.names = list(names)
+        self.k = k
+        self.noise_powers_db = list(noise_powers_db)
+        self.samples = samples
+        self.bit_errors = bit_errors
+        self.block_errors = block_errors
+        self.bit_errors_products = bit_errors_products
+        self.block_errors_products = block_errors_products
+
+    def index(self, model):
+        """index of a model given by its index or name"""
+        if isinstance(model, str):
+            return self.names.index(model)
+        return model
+
+    def counts(self, metric="BLER"):
+        """errors [M, S], products [M, M, S] and per sample errors normalization of the metric ("BER" or "BLER")"""
+        if metric == "BER":
+            return (self.bit_errors, self.bit_errors_products, self.k)
+        if metric == "BLER":
+            return (self.block_errors, self.block_errors_products, 1)
+        raise ValueError(f"Unknown metric '{metric}'")
+
+    def ber(self):
+        """[M, S] bit error rates"""
+        return self.bit_errors / (self.k * self.samples)
+
+    def bler(self):
+        """[M, S] block error rates"""
+        return self.block_errors / self.samples
+
+    def difference(self, i, j, metric="BLER", fraction=0.95, paired=True):
+        """
+        Error rate difference between the models i and j (names or indices) and its confidence interval (normal
+        approximation) at each SNR index.
+
+        Args:
+            i, j (int or str): models
+            metric (str) [default="BLER"]: "BER" or "BLER"
+            fraction (float) [default=0.95]: fraction of the values in the interval
+            paired (bool) [default=True]: paired interval (variance of the per sample differences) or interval of
+                independent evaluations with the same number of samples (sum of the variances of the two error rates),
+                for comparison
+
+        Returns:
+            ([S] array, [S] array, [S] array, [S] array): span, lower bound, difference, upper bound
+        """
+        (i, j) = (self.index(i), self.index(j))
+        (errors, products, normalization) = self.counts(metric)
+        samples = self.samples.astype(np.float64)
+        scale = float(normalization) ** 2
+        mean_i = errors[i] / (normalization * samples)
+        mean_j = errors[j] / (normalization * samples)
+        difference = mean_i - mean_j
+        if paired:
+            squared_differences = (
+                products[i, i] + products[j, j] - 2 * products[i, j]
+            ) / (scale * samples)
+            variance = (squared_differences - difference ** 2) / samples
+        else:
+            variance_i = (products[i, i] / (scale * samples) - mean_i ** 2) / samples
+            variance_j = (products[j, j] / (scale * samples) - mean_j ** 2) / samples
+            variance = variance_i + variance_j
+        z = statistics.NormalDist().inv_cdf(1 - (1 - fraction) / 2)
+        half_span = z * np.sqrt(np.maximum(variance, 0.0))
+        return (
+            2 * half_span,
+            difference - half_span,
+            difference,
+            difference + half_span,
+        )
+
+
+class PairedEvaluation:
+    """
+    Evaluation of several models (e.g. all the models of a study) on the same samples: each batch of messages and its
+    channel noise are generated once from the stateless keys of the batch (see dataset.random_messages_snr_dataset)
+    and decoded by every model in the same pass. The noise of a sample only depends on (seed, SNR index, batch index),
+    the models see the same noise realizations (common random numbers) and the errors are recorded per pair of models.
+
+    Args:
+        models (list of AutoEncoder): models of the same n and k, without importance sampling
+        noise_powers_db (list of float): noise powers (dB) of the SNR sweep, the samples of each batch being evenly
+            spread over the SNR indices
+        names (list of str) [default=None]: names of the models, the model names when None
+
+    Raises:
+        ValueError: the models do not share n and k or use importance sampling, or the number of names differs from the
+            number of models
+    """
+
+    def __init__(self, models, noise_powers_db, names=None):
+        if len({(model.n, model.k) for model in models}) != 1:
+            raise ValueError(
+                "The paired evaluation requires models of the same n and k"
+            )
+        if any(model.importance_sampling is not None for model in models):
+            raise ValueError(
+                "The paired evaluation does not support the importance sampling channel"
+            )
+        self.models = list(models)
+        self.noise_powers_db = list(noise_powers_db)
+        if names is not None and len(names) != len(models):
+            raise ValueError(
+                f"The paired evaluation requires a name per model ({len(names)} names for {len(models)} models)"
+            )
+        self.names = [model.name for model in models] if names is None else names
+        self.n_snr = len(noise_powers_db)
+        self.k = models[0].k
+        self.noise_powers = decibeltolinear(
+            tf.constant(noise_powers_db, dtype=tf.float32)
+        )
+        # Traced once for all the evaluations, the whole dataset is iterated in the graph
+        self.evaluation_loop = tf.function(self.accumulate)
+
+    def step(self, messages, snr_indices, noise_seed):
+        """
+        Decode a batch with every model.
+
+        Returns:
+            ([S], [S, M], [S, M], [S, M, M], [S, M, M] int64 tensors): number of samples, bit errors, block errors and
+                sums of the products of the bit and block errors of two models of each SNR index
+        """
+        # Per sample noise power [batch, 1]
+        sigma2 = tf.expand_dims(tf.gather(self.noise_powers, snr_indices), axis=-1)
+        bit_errors = []
+        for model in self.models:
+            (reconstructed_messages, _) = model.transmit(
+                messages,
+                noise_power=sigma2,
+                noise_seed=noise_seed,
+                snr_indices=snr_indices,
+                n_snr=self.n_snr,
+            )
+            bit_errors.append(
+                tf.reduce_sum(
+                    tf.abs(messages - hard_decisions(reconstructed_messages)), axis=-1
+                )
+            )
+        # [batch, M] errors of each sample and model
+        bit_errors = tf.cast(tf.stack(bit_errors, axis=-1), tf.int64)
+        block_errors = tf.minimum(bit_errors, 1)
+
+        def per_snr(values):
+            return tf.math.unsorted_segment_sum(values, snr_indices, self.n_snr)
+
+        def products(errors):
+            return per_snr(tf.expand_dims(errors, -1) * tf.expand_dims(errors, -2))
+
+        return (
+            per_snr(tf.ones_like(snr_indices, dtype=tf.int64)),
+            per_snr(bit_errors),
+            per_snr(block_errors),
+            products(bit_errors),
+            products(block_errors),
+        )
+
+    def accumulate(self, dataset):
+        """sums of the counts of the batches of the dataset (see step)"""
+        (n_models, n_snr) = (len(self.models), self.n_snr)
+        # int64 accumulators (exact counts)
+        totals = (
+            tf.zeros([n_snr], dtype=tf.int64),
+            tf.zeros([n_snr, n_models], dtype=tf.int64),
+            tf.zeros([n_snr, n_models], dtype=tf.int64),
+            tf.zeros([n_snr, n_models, n_models], dtype=tf.int64),
+            tf.zeros([n_snr, n_models, n_models], dtype=tf.int64),
+        )
+        for ((messages, snr_indices, noise_seed), _) in dataset:
+            counts = self.step(messages, snr_indices, noise_seed)
+            totals = tuple(total + count for (total, count) in zip(totals, counts))
+        return totals
+
+    def evaluate(self, batch=256, steps=100, seed=0, start=0, step=1, all_zero=False):
+        """
+        Args:
+            batch (int) [default=256]: batch size (all SNR indices)
+            steps (int) [default=100]: number of batches
+            seed (int) [default=0]: seed of the messages and noise
+            start, step (int) [default=0, 1]: batch indices (resumed or sharded evaluation, see
+                random_messages_snr_dataset)
+            all_zero (bool) [default=False]: all-zero messages (see AutoEncoder.set_all_zero_codeword)
+
+        Returns:
+            PairedErrorCounts
+
+        Raises:
+            ValueError: all-zero messages with a decoder which is not symmetric (see Decoder.symmetric)
+        """
+        if all_zero and not all(model.decoder.symmetric for model in self.models):
+            raise ValueError(
+                "The all-zero messages evaluation requires models with symmetric decoders"
+            )
+        dataset = random_messages_snr_dataset(
+            self.k,
+            self.n_snr,
+            batch=batch,
+            seed=seed,
+            all_zero=all_zero,
+            start=start,
+            step=step,
+        ).take(steps)
+
+        totals = self.evaluation_loop(dataset)
+        (samples, bit_errors, block_errors, bit_products, block_products) = [
+            total.numpy() for total in totals
+        ]
+        return PairedErrorCounts(
+            self.names,
+            self.k,
+            self.noise_powers_db,
+            samples,
+            np.moveaxis(bit_errors, 0, -1),
+            np.moveaxis(block_errors, 0, -1),
+            np.moveaxis(bit_products, 0, -1),
+            np.moveaxis(block_products, 0, -1),
+        )
@@ -0,0 +1,348 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from .autoencoder import AutoEncoder
+from decoders import Decoder
+from channels import stateless_normal_streams
+from dataset import (
+    all_zero_dataset,
+    random_messages_dataset,
+    random_messages_snr_dataset,
+)
+from metrics import (
+    BitErrorRate,
+    BlockErrorRate,
+    BinomialProportionConfidenceInterval,
+    ErrorStatistics,
+)
+from callbacks import StoppingRule
+from tools import ebno_db_to_snr_db, load_code
+
+
+def create_model(conf="BP", **kwargs):
+    return AutoEncoder(
+        15,
+        7,
+        5,
+        conf,
+        0.0,
+        G=tf.constant(load_code("BCH_15_7"), dtype=tf.float32),
+        H=tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32),
+        trainable_code=False,
+        trainable_decoder=False,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    "conf,kwargs,symmetric",
+    [
+        ("A", {}, True),
+        ("BP", {}, True),
+        ("NMS", {}, True),
+        ("ML", {}, True),
+        ("ML", {"ml_metric": "hamming"}, False),
+        ("OSD", {}, True),
+        ("syndrome", {}, True),
+        ("Chase", {}, True),
+        ("BP", {"fallback": "OSD"}, True),
+        ("BP", {"fallback": "ML", "ml_metric": "hamming"}, False),
+    ],
+)
+def test_decoder_symmetric(conf, kwargs, symmetric):
+    H = load_code("BCH_15_7", "H_systematic")
+    assert Decoder(15, 8, 7, conf=conf, H=H, **kwargs).symmetric == symmetric
+
+
+@pytest.mark.parametrize("conf", ["BP", "ML"])
+def test_all_zero_codeword_eq_encoded_zero_messages(conf):
+    messages = tf.zeros([100, 7])
+    model = create_model(conf)
+    tf.random.set_seed(3)
+    expected = model(messages)
+
+    model.set_all_zero_codeword()
+    tf.random.set_seed(3)
+    tf.debugging.assert_equal(model(messages), expected)
+
+
+def test_all_zero_codeword_evaluate():
+    model = create_model(all_zero_codeword=True)
+    model.compile(loss="binary_crossentropy", metrics=[BitErrorRate()])
+    (_, ber) = model.evaluate(all_zero_dataset(7, batch=100).take(5), verbose=0)
+    assert 0.0 < ber < 0.5
+
+
+def test_all_zero_codeword_retrace():
+    # Mode switched after a first evaluation: the traced evaluation function is rebuilt
+    model = create_model()
+    model.compile(loss="binary_crossentropy")
+    model.evaluate(tf.ones([100, 7]), tf.ones([100, 7]), verbose=0)
+    model.set_all_zero_codeword()
+    with pytest.raises(tf.errors.InvalidArgumentError):
+        model.evaluate(tf.ones([100, 7]), tf.ones([100, 7]), verbose=0)
+    model.set_all_zero_codeword(False)
+    model.evaluate(tf.ones([100, 7]), tf.ones([100, 7]), verbose=0)
+
+
+def test_all_zero_codeword_non_zero_messages():
+    model = create_model(all_zero_codeword=True)
+    with pytest.raises(tf.errors.InvalidArgumentError):
+        model(tf.ones([10, 7]))
+    # Training: the messages are encoded
+    model(tf.ones([10, 7]), training=True)
+
+
+def test_all_zero_codeword_non_symmetric_decoder():
+    with pytest.raises(ValueError):
+        create_model("ML", decoder_ml_metric="hamming", all_zero_codeword=True)
+    model = create_model("ML", decoder_ml_metric="hamming")
+    with pytest.raises(ValueError):
+        model.set_all_zero_codeword()
+
+
+@pytest.mark.parametrize("conf", ["BP", "ML", "Chase"])
+def test_snr_sweep_evaluate(conf):
+    # Noiseless, nominal and pure noise SNR points
+    model = create_model(conf, evaluation_noise_powers_db=[-100.0, 3.0, 40.0])
+    model.compile(loss="binary_crossentropy")
+    logs = model.evaluate(
+        random_messages_snr_dataset(7, 3, batch=300, seed=5).take(4),
+        verbose=0,
+        return_dict=True,
+    )
+    (ber, bler) = (logs["SNR_BER"], logs["SNR_BLER"])
+    assert ber.shape == (3,) and bler.shape == (3,)
+    assert ber[0] == 0.0 and bler[0] == 0.0
+    assert 0.0 < ber[1] < 0.2
+    assert 0.3 < ber[2] < 0.7
+
+    # Metrics reset between evaluations
+    logs = model.evaluate(
+        random_messages_snr_dataset(7, 3, batch=300, seed=5).take(4),
+        verbose=0,
+        return_dict=True,
+    )
+    assert model.snr_bler.total.numpy().tolist() == [400.0, 400.0, 400.0]
+
+
+def test_snr_sweep_metrics_evaluation_only():
+    model = create_model("BP", evaluation_noise_powers_db=[0.0, 40.0])
+    model.compile(loss="binary_crossentropy")
+    dataset = random_messages_snr_dataset(7, 2, batch=100, seed=6).take(2)
+    model.evaluate(dataset, verbose=0)
+    errors = model.snr_ber.errors.numpy()
+    # Forward passes outside the evaluation do not update the SNR metrics
+    model.predict(dataset.map(lambda x, y: x), verbose=0)
+    model(next(iter(dataset))[0])
+    np.testing.assert_array_equal(model.snr_ber.errors.numpy(), errors)
+    assert model.snr_ber.total.numpy().tolist() == [700, 700]
+
+
+def test_snr_sweep_per_sample_noise_power():
+    model = create_model("BP", evaluation_noise_powers_db=[-100.0, 40.0])
+    messages = tf.zeros([6, 7])
+    # Noiseless samples decoded without error
+    decoded = model((messages, tf.constant([0, 1, 0, 1, 0, 1])))
+    tf.debugging.assert_equal(tf.round(decoded[::2]), tf.zeros([3, 7]))
+
+
+def test_snr_sweep_stateless_noise():
+    model = create_model("BP", evaluation_noise_powers_db=[0.0, 3.0, 6.0])
+    model.compile(loss="binary_crossentropy")
+
+    def errors(start=0, step=1, count=4):
+        model.evaluate(
+            random_messages_snr_dataset(
+                7, 3, batch=300, seed=5, start=start, step=step
+            ).take(count),
+            verbose=0,
+        )
+        return model.snr_bler.errors.numpy()
+
+    reference = errors()
+    # Reproducible evaluation
+    np.testing.assert_array_equal(errors(), reference)
+    # Sharded evaluation (batches {0, 2} and {1, 3})
+    np.testing.assert_array_equal(errors(0, 2, 2) + errors(1, 2, 2), reference)
+
+
+def test_stateless_normal_streams():
+    seed = tf.constant([1, 2], dtype=tf.int64)
+    noise = stateless_normal_streams([6, 4], seed, tf.constant([0, 1, 0, 1, 0, 1]), 2)
+    tf.debugging.assert_equal(
+        noise,
+        stateless_normal_streams([6, 4], seed, tf.constant([0, 1, 0, 1, 0, 1]), 2),
+    )
+    # The samples of stream 0 do not depend on the samples of the other streams
+    other_layout = stateless_normal_streams(
+        [6, 4], seed, tf.constant([0, 0, 0, 1, 1, 1]), 2
+    )
+    tf.debugging.assert_equal(noise[::2], other_layout[:3])
+    tf.debugging.assert_equal(noise[1::2], other_layout[3:])
+
+
+def test_snr_sweep_requires_noise_powers():
+    model = create_model("BP")
+    with pytest.raises(ValueError):
+        model((tf.zeros([6, 7]), tf.zeros([6], dtype=tf.int32)))
+
+
+@pytest.mark.parametrize("importance_sampling", ["scaling", "translation"])
+def test_importance_sampling_evaluate(importance_sampling):
+    model = create_model("ML", importance_sampling=importance_sampling)
+    model.channel.noise_power_db = -ebno_db_to_snr_db(4.0, 7 / 15)
+    # Metrics of the likelihood ratios (sample_weight of the weighted metrics)
+    model.compile(
+        loss="binary_crossentropy",
+        weighted_metrics=[
+            BlockErrorRate(likelihood_ratios=True),
+            BinomialProportionConfidenceInterval(
+                monitor_class=BlockErrorRate,
+                monitor_params={"name": "bpci_bler", "likelihood_ratios": True},
+                name="BPCI_BLER",
+            ),
+        ],
+    )
+    tf.random.set_seed(4)
+    logs = model.evaluate(
+        random_messages_dataset(7, batch=2000, seed=4).take(10),
+        verbose=0,
+        return_dict=True,
+    )
+    # ML decoding BLER at Eb/N0 = 4 dB: 6.8e-3 (plain Monte Carlo, 400000 codewords)
+    assert logs["BLER"] == pytest.approx(6.8e-3, rel=0.2)
+    (span, _, bler, _) = logs["BPCI_BLER"]
+    assert bler == logs["BLER"]
+    assert 0.0 < span < 0.2 * bler
+
+
+def test_importance_sampling_likelihood_ratios():
+    model = create_model("BP", importance_sampling="scaling")
+    (_, likelihood_ratios) = model(tf.zeros([10, 7]), return_likelihood_ratios=True)
+    assert likelihood_ratios.shape == (10,)
+    # Unbiased training noise
+    (_, likelihood_ratios) = model(
+        tf.zeros([10, 7]), training=True, return_likelihood_ratios=True
+    )
+    tf.debugging.assert_equal(likelihood_ratios, tf.ones([10]))
+
+
+def test_importance_sampling_translation_requires_G():
+    with pytest.raises(ValueError):
+        AutoEncoder(15, 7, 5, "BP", 0.0, importance_sampling="translation")
+
+
+@pytest.mark.parametrize("steps_per_execution", [1, 8])
+def test_stopping_rule(steps_per_execution):
+    model = create_model(
+        "BP",
+        evaluation_noise_powers_db=[3.0],
+        stopping_rule=StoppingRule(min_errors=40, errors="BLEC"),
+    )
+    model.compile(
+        loss="binary_crossentropy",
+        metrics=[ErrorStatistics()],
+        steps_per_execution=steps_per_execution,
+    )
+    dataset = random_messages_snr_dataset(7, 1, batch=50, seed=3)
+    logs = model.evaluate(dataset.take(100), verbose=0, return_dict=True)
+    batches = model.stopping_rule.frames.numpy() // 50
+    assert logs["BLEC"] >= 40 and batches < 100
+
+    # Statistics of the batches up to the first one reaching the target
+    model.set_stopping_rule(None)
+    assert model.evaluate(dataset.take(batches), verbose=0, return_dict=True) == logs
+    assert (
+        model.evaluate(dataset.take(batches - 1), verbose=0, return_dict=True)["BLEC"]
+        < 40
+    )
+
+
+def test_stopping_rule_max_frames():
+    model = create_model("BP", stopping_rule=StoppingRule(max_frames=120))
+    model.compile(
+        loss="binary_crossentropy", metrics=[ErrorStatistics()], steps_per_execution=4
+    )
+    logs = model.evaluate(
+        random_messages_dataset(7, batch=50, seed=3).take(10),
+        verbose=0,
+        return_dict=True,
+    )
+    assert model.stopping_rule.frames.numpy() == 150
+    assert model.stopping_rule.result()
+    # The rule is reset by every evaluation
+    model.evaluate(random_messages_dataset(7, batch=50, seed=3).take(1), verbose=0)
+    assert model.stopping_rule.frames.numpy() == 50
+
+
+@pytest.mark.parametrize("steps_per_execution", [1, 4])
+def test_stopping_rule_known_size(caplog, steps_per_execution):
+    model = create_model("BP", stopping_rule=StoppingRule(max_frames=100))
+    model.compile(
+        loss="binary_crossentropy",
+        metrics=[ErrorStatistics()],
+        steps_per_execution=steps_per_execution,
+    )
+    batches = []
+    callback = tf.keras.callbacks.LambdaCallback(
+        on_test_batch_end=lambda batch, logs: batches.append(batch)
+    )
+    # The remaining steps after the stop run without insufficient data ("ran out of data" warning)
+    model.evaluate(
+        random_messages_dataset(7, batch=10, seed=3).take(20),
+        verbose=0,
+        callbacks=[callback],
+    )
+    assert model.stopping_rule.frames.numpy() == 100
+    assert batches[-1] == 19
+    assert "ran out of data" not in caplog.text
+
+
+def test_stopping_rule_unknown_cardinality():
+    model = create_model(
+        "BP",
+        evaluation_noise_powers_db=[3.0],
+        stopping_rule=StoppingRule(max_frames=100),
+    )
+    model.compile(loss="binary_crossentropy", metrics=[ErrorStatistics()])
+    # Dataset of unknown cardinality (steps=None): the evaluation ends at the stop
+    dataset = (
+        random_messages_snr_dataset(7, 1, batch=10, seed=3)
+        .take(20)
+        .filter(lambda *batch: True)
+    )
+    assert dataset.cardinality() == tf.data.UNKNOWN_CARDINALITY
+    logs = model.evaluate(dataset, verbose=0, return_dict=True)
+    assert model.stopping_rule.frames.numpy() == 100
+    # Statistics of the batches up to the stop
+    model.set_stopping_rule(None)
+    assert model.evaluate(dataset.take(10), verbose=0, return_dict=True) == logs
+
+
+def test_stopping_rule_rejects_distribution_strategy():
+    strategy = tf.distribute.OneDeviceStrategy("/cpu:0")
+    with strategy.scope():
+        model = create_model("BP", stopping_rule=StoppingRule(max_frames=100))
+        model.compile(loss="binary_crossentropy", metrics=[ErrorStatistics()])
+    with pytest.raises(ValueError):
+        model.evaluate(random_messages_dataset(7, batch=10, seed=3).take(2), verbose=0)
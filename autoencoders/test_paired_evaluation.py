@@ -0,0 +1,96 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import numpy as np
+
+from .paired_evaluation import PairedEvaluation
+from .test_autoencoder import create_model
+from dataset import random_messages_snr_dataset
+
+
+def test_paired_evaluation_matches_evaluate():
+    noise_powers_db = [0.0, 3.0]
+    models = [
+        create_model("BP", evaluation_noise_powers_db=noise_powers_db),
+        create_model("ML", evaluation_noise_powers_db=noise_powers_db),
+    ]
+    evaluation = PairedEvaluation(models, noise_powers_db, names=["BP", "ML"])
+    counts = evaluation.evaluate(batch=200, steps=3, seed=4)
+    np.testing.assert_array_equal(counts.samples, [300, 300])
+    # Same samples and noise as the SNR sweep evaluation of each model
+    for (i, model) in enumerate(models):
+        model.compile(loss="binary_crossentropy")
+        model.evaluate(
+            random_messages_snr_dataset(7, 2, batch=200, seed=4).take(3), verbose=0
+        )
+        np.testing.assert_array_equal(
+            counts.block_errors[i], model.snr_bler.errors.numpy()
+        )
+        np.testing.assert_array_equal(
+            counts.bit_errors[i], model.snr_ber.errors.numpy()
+        )
+    np.testing.assert_array_equal(
+        np.diagonal(counts.block_errors_products).T, counts.block_errors
+    )
+    # ML decoding does better than BP on the same samples
+    assert np.all(counts.bler()[counts.index("ML")] <= counts.bler()[0])
+
+    # Sharded evaluation (batches {0, 2} and {1})
+    shards = [evaluation.evaluate(batch=200, steps=2, seed=4, start=0, step=2)]
+    shards.append(evaluation.evaluate(batch=200, steps=1, seed=4, start=1, step=2))
+    np.testing.assert_array_equal(
+        shards[0].block_errors_products + shards[1].block_errors_products,
+        counts.block_errors_products,
+    )
+
+
+def test_paired_difference():
+    models = [create_model("BP"), create_model("BP"), create_model("ML")]
+    counts = PairedEvaluation(models, [3.0]).evaluate(batch=500, steps=4, seed=1)
+
+    # Identical models: no difference and an empty interval
+    (span, lower, difference, upper) = counts.difference(0, 1, "BER")
+    np.testing.assert_array_equal([span, lower, difference, upper], 0.0)
+
+    (span, lower, difference, upper) = counts.difference(0, 2)
+    np.testing.assert_allclose(difference, counts.bler()[0] - counts.bler()[2])
+    assert np.all(lower < difference) and np.all(difference < upper)
+    # The errors of the models are positively correlated: tighter than independent evaluations
+    (independent_span, _, _, _) = counts.difference(0, 2, paired=False)
+    assert np.all(span < independent_span)
+
+    with pytest.raises(ValueError):
+        counts.difference(0, 2, "FER")
+
+
+def test_paired_evaluation_invalid_models():
+    with pytest.raises(ValueError):
+        PairedEvaluation(
+            [create_model("BP"), create_model("ML", importance_sampling="scaling")],
+            [0.0],
+        )
+    with pytest.raises(ValueError):
+        PairedEvaluation([create_model("BP"), create_model("ML")], [0.0], names=["BP"])
+
+
+def test_paired_evaluation_all_zero_non_symmetric_decoder():
+    paired = PairedEvaluation(
+        [create_model("BP"), create_model("ML", decoder_ml_metric="hamming")], [0.0]
+    )
+    with pytest.raises(ValueError):
+        paired.evaluate(batch=10, steps=1, all_zero=True)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""All-zero codeword evaluation benchmark
+
+Brief: Evaluation time and bit error rate of the auto-encoder with encoded random messages vs the all-zero codeword
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import tensorflow as tf
+
+from autoencoders import AutoEncoder
+from dataset import random_messages_dataset, all_zero_dataset
+from metrics import BitErrorRate
+from benchmarks import load_reference_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="All-zero codeword evaluation benchmark: encoded random messages vs all-zero codeword"
+    )
+    parser.add_argument("--code", default="BCH_63_45")
+    parser.add_argument("--conf", default="syndrome")
+    parser.add_argument("--ebn0_db", type=float, default=4.0)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--steps", type=int, default=50)
+    args = parser.parse_args()
+
+    G, H, _ = load_reference_code(args.code)
+    (k, n) = G.shape
+    noise_power_db = -(10 * tf.math.log(2 * k / n) / tf.math.log(10.0) + args.ebn0_db)
+    model = AutoEncoder(
+        n,
+        k,
+        5,
+        args.conf,
+        float(noise_power_db),
+        G=tf.constant(G, dtype=tf.float32),
+        H=tf.constant(H, dtype=tf.float32),
+        trainable_code=False,
+        trainable_decoder=False,
+    )
+    model.compile(loss="binary_crossentropy", metrics=[BitErrorRate()])
+
+    print(f"{'messages':>10}{'s':>10}{'BER':>12}")
+    datasets = {
+        "random": random_messages_dataset(k, batch=args.batch, seed=0),
+        "all-zero": all_zero_dataset(k, batch=args.batch),
+    }
+    for name, dataset in datasets.items():
+        model.set_all_zero_codeword(name == "all-zero")
+        dataset = dataset.take(args.steps)
+        # Warmup (tracing)
+        model.evaluate(dataset.take(1), verbose=0)
+        start = time.perf_counter()
+        (_, ber) = model.evaluate(dataset, verbose=0)
+        duration = time.perf_counter() - start
+        print(f"{name:>10}{duration:>10.2f}{ber:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
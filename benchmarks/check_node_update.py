@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Check node update benchmark
+
+Brief: Decoding time of the legacy (repeat + reduce_prod) and linear time (prefix products) check node updates
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+
+import tensorflow as tf
+
+from decoders import DecoderStandardBP
+from benchmarks import load_reference_code, timeit, random_llrs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check node update benchmark: legacy repeat/reduce_prod vs prefix products"
+    )
+    parser.add_argument(
+        "--codes", nargs="+", default=["BCH_31_16", "BCH_63_36", "BCH_127_64"]
+    )
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--n_iter", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'code':<12}{'engine':<8}{'update':<8}{'ms/batch':>10}{'codewords/s':>14}")
+    for codename in args.codes:
+        _, _, H = load_reference_code(codename)
+        (m, n) = H.shape
+        H = tf.constant(H)
+        llrs = random_llrs(args.batch, n)
+        for engine in ["dense", "sparse"]:
+            for update in ["repeat", "prefix"]:
+                model = DecoderStandardBP(
+                    n,
+                    m,
+                    n - m,
+                    args.n_iter,
+                    False,
+                    engine=engine,
+                    H=H,
+                    check_node_update=update,
+                )
+                decode = tf.function(lambda: model([llrs, H, 1.0]))
+                duration = timeit(decode, repeats=args.repeats)
+                print(
+                    f"{codename:<12}{engine:<8}{update:<8}{1e3 * duration:>10.2f}{args.batch / duration:>14.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Common random numbers benchmark
+
+Brief: Evaluation time and confidence interval of the error rate differences of the models of a study, independent evaluations vs a single paired evaluation
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from autoencoders import AutoEncoder, PairedEvaluation
+from dataset import random_messages_snr_dataset
+from tools import ebno_db_to_snr_db
+from benchmarks import load_reference_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Common random numbers benchmark: independent evaluations of the models of a study vs a single paired evaluation"
+    )
+    parser.add_argument("--code", default="BCH_31_16")
+    parser.add_argument(
+        "--confs",
+        nargs="+",
+        default=["BP", "GNBP", "OSD"],
+        help="decoders of the study",
+    )
+    parser.add_argument("--ebn0_db", nargs="+", type=float, default=[2.0, 4.0])
+    parser.add_argument(
+        "--batch", type=int, default=200, help="samples per Eb/N0 point and step"
+    )
+    parser.add_argument("--steps", type=int, default=20)
+    args = parser.parse_args()
+
+    G, H, _ = load_reference_code(args.code)
+    (k, n) = G.shape
+    ebn0_dbs = np.array(args.ebn0_db, dtype=np.float32)
+    # mean(Es) assumed to be 1
+    noise_powers_db = (-ebno_db_to_snr_db(ebn0_dbs, k / n).numpy()).tolist()
+    models = [
+        AutoEncoder(
+            n,
+            k,
+            5,
+            conf,
+            0.0,
+            G=tf.constant(G, dtype=tf.float32),
+            H=tf.constant(H, dtype=tf.float32),
+            trainable_code=False,
+            trainable_decoder=False,
+            evaluation_noise_powers_db=noise_powers_db,
+        )
+        for conf in args.confs
+    ]
+    batch = args.batch * len(ebn0_dbs)
+
+    # Independent evaluations: one model.evaluate per model, each with its own samples
+    for model in models:
+        model.compile(loss="binary_crossentropy")
+        model.evaluate(
+            random_messages_snr_dataset(k, len(ebn0_dbs), batch=batch, seed=0).take(1),
+            verbose=0,
+        )
+    start = time.perf_counter()
+    for (i, model) in enumerate(models):
+        model.evaluate(
+            random_messages_snr_dataset(k, len(ebn0_dbs), batch=batch, seed=i).take(
+                args.steps
+            ),
+            verbose=0,
+        )
+    independent_duration = time.perf_counter() - start
+
+    # Single paired evaluation: each batch generated once and decoded by every model
+    evaluation = PairedEvaluation(models, noise_powers_db, names=args.confs)
+    evaluation.evaluate(batch=batch, steps=1)
+    start = time.perf_counter()
+    counts = evaluation.evaluate(batch=batch, steps=args.steps)
+    paired_duration = time.perf_counter() - start
+
+    print(
+        f"{'models':>16}{'Eb/N0':>6}{'BLER diff':>12}{'paired CI':>12}{'indep. CI':>12}{'frames ratio':>14}"
+    )
+    for i in range(len(models)):
+        for j in range(i + 1, len(models)):
+            (paired_span, _, difference, _) = counts.difference(i, j)
+            (independent_span, _, _, _) = counts.difference(i, j, paired=False)
+            for (s, ebn0_db) in enumerate(ebn0_dbs):
+                # Number of independent frames for the span of the paired evaluation
+                ratio = (independent_span[s] / paired_span[s]) ** 2
+                print(
+                    f"{args.confs[i] + ' - ' + args.confs[j]:>16}{ebn0_db:>6.1f}{difference[s]:>12.2e}{paired_span[s]:>12.2e}{independent_span[s]:>12.2e}{ratio:>14.1f}"
+                )
+    print(
+        f"independent evaluations: {independent_duration:.2f} s, paired evaluation: {paired_duration:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
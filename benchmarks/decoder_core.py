@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Decoder core benchmark
+
+Brief: Decoding throughput of the tf.keras.layers.RNN, statically unrolled and XLA compiled decoder cores
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+
+import tensorflow as tf
+
+from decoders import DecoderA, DecoderStandardBP
+from benchmarks import load_reference_code, timeit, random_llrs
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decoder core benchmark: tf.keras.layers.RNN vs static unroll vs XLA compiled unroll"
+    )
+    parser.add_argument("--codes", nargs="+", default=["BCH_31_16", "BCH_63_36"])
+    parser.add_argument("--engine", default="sparse", choices=["dense", "sparse"])
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--n_iter", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'code':<12}{'decoder':<20}{'core':<10}{'ms/batch':>10}{'codewords/s':>14}")
+    for codename in args.codes:
+        _, _, H = load_reference_code(codename)
+        (m, n) = H.shape
+        H = tf.constant(H)
+        symbols = random_llrs(args.batch, n, scale=-1.0)
+        for decoder_class in [DecoderStandardBP, DecoderA]:
+            for core in ["rnn", "unrolled", "xla"]:
+                model = decoder_class(
+                    n,
+                    m,
+                    n - m,
+                    args.n_iter,
+                    decoder_class is DecoderA,
+                    engine=args.engine,
+                    H=H,
+                    core=core,
+                )
+                decode = tf.function(lambda: model([symbols, H, 1.0]))
+                duration = timeit(decode, repeats=args.repeats)
+                print(
+                    f"{codename:<12}{decoder_class.__name__:<20}{core:<10}{1e3 * duration:>10.2f}{args.batch / duration:>14.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
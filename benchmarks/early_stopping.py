@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Early termination benchmark
+
+Brief: Decoding time of the standard BP decoder with and without syndrome-based early termination over a range of Eb/N0
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from decoders import DecoderStandardBP
+from decoders.decoder import early_stopping_decoding
+from benchmarks import load_reference_code, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Early termination benchmark: full decoding vs syndrome-based early termination"
+    )
+    parser.add_argument("--code", default="BCH_63_36")
+    parser.add_argument("--engine", default="sparse", choices=["dense", "sparse"])
+    parser.add_argument(
+        "--ebn0_db", nargs="+", type=float, default=[1.0, 3.0, 5.0, 7.0]
+    )
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--n_iter", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    _, _, H = load_reference_code(args.code)
+    m, n = H.shape
+    k = n - m
+    H = tf.constant(H)
+
+    models = {
+        early_stopping: DecoderStandardBP(
+            n,
+            m,
+            k,
+            args.n_iter,
+            False,
+            engine=args.engine,
+            H=H,
+            early_stopping=early_stopping,
+        )
+        for early_stopping in [False, True]
+    }
+
+    print(
+        f"{'Eb/N0':>6}{'full ms':>10}{'early ms':>10}{'speedup':>9}{'avg iter':>10}{'codewords/s':>14}"
+    )
+    rng = np.random.default_rng(0)
+    for ebn0_db in args.ebn0_db:
+        sigma2 = 1.0 / (2 * (k / n) * 10 ** (ebn0_db / 10))
+        # BPSK symbols of the all-zero codeword
+        symbols = tf.constant(
+            -1.0 + np.sqrt(sigma2) * rng.normal(size=(args.batch, n)), dtype=tf.float32
+        )
+
+        durations = {}
+        for early_stopping, model in models.items():
+            decode = tf.function(lambda: model([symbols, H, sigma2]))
+            durations[early_stopping] = timeit(decode, repeats=args.repeats)
+
+        _, iterations = early_stopping_decoding(
+            models[True].RNN_cell, -4.0 * symbols / sigma2, H, args.n_iter
+        )
+        print(
+            f"{ebn0_db:>6.1f}{1e3 * durations[False]:>10.2f}{1e3 * durations[True]:>10.2f}"
+            f"{durations[False] / durations[True]:>9.2f}{np.mean(iterations.numpy()):>10.2f}"
+            f"{args.batch / durations[True]:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
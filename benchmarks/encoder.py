@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Encoder benchmark
+
+Brief: Encoding time of the differentiable bipolar product encoder vs the inference matmul modulo 2 fast path
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+
+import tensorflow as tf
+
+from encoders import Encoder
+from benchmarks import load_reference_code, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Encoder benchmark: bipolar product vs matmul modulo 2 (inference fast path)"
+    )
+    parser.add_argument(
+        "--codes", nargs="+", default=["BCH_31_16", "BCH_63_45", "BCH_127_64"]
+    )
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'code':>12}{'product (ms)':>14}{'fast (ms)':>12}{'speedup':>10}")
+    for code in args.codes:
+        G, _, _ = load_reference_code(code)
+        (k, n) = G.shape
+        G = tf.constant(G, dtype=tf.float32)
+        messages = tf.cast(
+            tf.random.stateless_uniform(
+                [args.batch, k], seed=[0, 0], maxval=2, dtype=tf.int32
+            ),
+            tf.float32,
+        )
+
+        durations = []
+        for fast_inference in [False, True]:
+            encoder = Encoder(n, k, fast_inference=fast_inference)
+            encode = tf.function(lambda: encoder([messages, G], training=False))
+            durations.append(timeit(encode, repeats=args.repeats))
+        print(
+            f"{code:>12}{1e3 * durations[0]:>14.2f}{1e3 * durations[1]:>12.2f}{durations[0] / durations[1]:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
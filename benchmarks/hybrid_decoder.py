@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Hybrid decoder benchmark
+
+Brief: Decoding time and block error rate of BP, of the slow decoders and of BP with fallback to the slow decoders
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from decoders import Decoder
+from benchmarks import load_reference_code, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hybrid decoder benchmark: BP vs slow decoder vs BP with fallback to the slow decoder"
+    )
+    parser.add_argument("--code", default="BCH_31_16")
+    parser.add_argument("--fallback", nargs="+", default=["ML", "OSD"])
+    parser.add_argument(
+        "--ebn0_db", nargs="+", type=float, default=[1.0, 3.0, 5.0]
+    )
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--n_iter", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    G, H, _ = load_reference_code(args.code)
+    (m, n) = H.shape
+    k = n - m
+    (G, H) = (tf.constant(G), tf.constant(H))
+
+    models = {"BP": Decoder(n, m, k, args.n_iter, False, conf="BP", H=H)}
+    for fallback in args.fallback:
+        models[fallback] = Decoder(n, m, k, conf=fallback)
+        models[f"BP+{fallback}"] = Decoder(
+            n, m, k, args.n_iter, False, conf="BP", H=H, fallback=fallback
+        )
+
+    print(
+        f"{'Eb/N0':>6}{'decoder':>10}{'ms':>10}{'codewords/s':>14}{'BLER':>10}{'escalated':>11}"
+    )
+    rng = np.random.default_rng(0)
+    for ebn0_db in args.ebn0_db:
+        sigma2 = 1.0 / (2 * (k / n) * 10 ** (ebn0_db / 10))
+        # BPSK symbols of the all-zero codeword
+        symbols = tf.constant(
+            -1.0 + np.sqrt(sigma2) * rng.normal(size=(args.batch, n)), dtype=tf.float32
+        )
+
+        for (name, model) in models.items():
+            # First (eager) call: the codebooks are built from G
+            words = tf.math.round(model([symbols, G, H, sigma2])).numpy()
+            decode = tf.function(lambda: model([symbols, G, H, sigma2]))
+            duration = timeit(decode, repeats=args.repeats, warmup=1)
+
+            escalation = {metric.name: metric for metric in model.metrics}.get(
+                "escalation_fraction"
+            )
+            escalated = (
+                f"{escalation.result().numpy():>11.3f}" if escalation else f"{'-':>11}"
+            )
+            print(
+                f"{ebn0_db:>6.1f}{name:>10}{1e3 * duration:>10.1f}{args.batch / duration:>14.0f}"
+                f"{np.mean(np.any(words != 0, axis=-1)):>10.4f}{escalated}"
+            )
+            for metric in model.metrics:
+                metric.reset_state()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Importance sampling benchmark
+
+Brief: Block error rate estimation of the auto-encoder with plain Monte Carlo vs importance sampling (variance scaling, mean translation) at high Eb/N0
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from autoencoders import AutoEncoder
+from dataset import random_messages_dataset
+from metrics import BlockErrorRate, BinomialProportionConfidenceInterval
+from tools import ebno_db_to_snr_db
+from benchmarks import load_reference_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importance sampling benchmark: BLER estimation with plain Monte Carlo vs importance sampling"
+    )
+    parser.add_argument("--code", default="BCH_15_7")
+    parser.add_argument("--conf", default="ML")
+    parser.add_argument(
+        "--ebn0_db", nargs="+", type=float, default=[4.0, 6.0, 8.0, 9.0]
+    )
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=0.1,
+        help="relative confidence interval span of the extrapolated number of codewords",
+    )
+    args = parser.parse_args()
+
+    G, H, _ = load_reference_code(args.code)
+    (k, n) = G.shape
+    print(
+        f"{'Eb/N0':>6}{'method':>13}{'BLER':>12}{'CI/BLER':>10}{'codewords':>12}{'to target':>12}{'time (s)':>10}"
+    )
+    for ebn0_db in args.ebn0_db:
+        # mean(Es) assumed to be 1
+        noise_power_db = float(-ebno_db_to_snr_db(ebn0_db, k / n))
+        for importance_sampling in [None, "scaling", "translation"]:
+            model = AutoEncoder(
+                n,
+                k,
+                5,
+                args.conf,
+                noise_power_db,
+                G=tf.constant(G, dtype=tf.float32),
+                H=tf.constant(H, dtype=tf.float32),
+                trainable_code=False,
+                trainable_decoder=False,
+                importance_sampling=importance_sampling,
+            )
+            model.compile(
+                loss="binary_crossentropy",
+                weighted_metrics=[
+                    BlockErrorRate(likelihood_ratios=True),
+                    BinomialProportionConfidenceInterval(
+                        monitor_class=BlockErrorRate,
+                        monitor_params={"name": "bpci_bler", "likelihood_ratios": True},
+                        name="BPCI_BLER",
+                    ),
+                ],
+            )
+            dataset = random_messages_dataset(k, batch=args.batch, seed=0)
+            model.evaluate(dataset.take(1), verbose=0)
+            start = time.perf_counter()
+            logs = model.evaluate(
+                dataset.take(args.steps), verbose=0, return_dict=True
+            )
+            duration = time.perf_counter() - start
+
+            codewords = args.batch * args.steps
+            (span, _, bler, _) = logs["BPCI_BLER"]
+            if bler > 0.0:
+                relative_span = span / bler
+                # The span decreases as 1/sqrt(codewords)
+                to_target = codewords * (relative_span / args.target) ** 2
+            else:
+                (relative_span, to_target) = (np.inf, np.inf)
+            method = "Monte Carlo" if importance_sampling is None else importance_sampling
+            print(
+                f"{ebn0_db:>6.1f}{method:>13}{bler:>12.2e}{relative_span:>10.3f}{codewords:>12}{to_target:>12.2e}{duration:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""ML decoder benchmark
+
+Brief: Decoding throughput of the exhaustive ML decoder with the legacy distance metric and with the correlation metric,
+and of the trellis ML decoder
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from decoders import MinDistanceDecoder, TrellisDecoder, ml_decoder_algorithm
+from benchmarks import load_reference_code, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ML decoder benchmark: legacy distance metric vs correlation (matmul) metric vs trellis"
+    )
+    parser.add_argument(
+        "--codes", nargs="+", default=["BCH_31_11", "BCH_31_16", "BCH_63_45"]
+    )
+    parser.add_argument(
+        "--max_codebook_bits",
+        type=int,
+        default=20,
+        help="the codebook search is skipped for larger k",
+    )
+    parser.add_argument(
+        "--max_trellis_bits",
+        type=int,
+        default=18,
+        help="the trellis decoding is skipped for larger n-k",
+    )
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--chunk_size", type=int, default=None)
+    parser.add_argument("--ebn0_db", type=float, default=3.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'code':<12}{'distance ms':>13}{'correlation ms':>16}{'trellis ms':>12}{'auto':>10}{'disagreements':>15}"
+    )
+    rng = np.random.default_rng(0)
+    for codename in args.codes:
+        G, H, _ = load_reference_code(codename)
+        (k, n) = G.shape
+        G = tf.constant(G)
+        sigma2 = 1.0 / (2 * (k / n) * 10 ** (args.ebn0_db / 10))
+        # BPSK symbols of the all-zero codeword
+        symbols = tf.constant(
+            -1.0 + np.sqrt(sigma2) * rng.normal(size=(args.batch, n)), dtype=tf.float32
+        )
+
+        models = {}
+        if k <= args.max_codebook_bits:
+            for metric in ["distance", "correlation"]:
+                models[metric] = MinDistanceDecoder(
+                    n, k, G=G, chunk_size=args.chunk_size, metric=metric
+                )
+        if n - k <= args.max_trellis_bits:
+            models["trellis"] = TrellisDecoder(n, k, G=G)
+
+        durations = {}
+        words = {}
+        for (name, model) in models.items():
+            decode = tf.function(lambda: model([symbols, G, sigma2]))
+            durations[name] = timeit(decode, repeats=args.repeats, warmup=1)
+            words[name] = decode().numpy()
+
+        # Number of codewords decoded differently by the legacy metric and by the ML (correlation) metric
+        if "distance" in words:
+            disagreements = np.sum(
+                np.any(words["distance"] != words["correlation"], axis=-1)
+            )
+        else:
+            disagreements = "-"
+        print(
+            f"{codename:<12}"
+            + "".join(
+                f"{1e3 * durations.get(name, np.nan):>{width}.1f}"
+                for (name, width) in [
+                    ("distance", 13),
+                    ("correlation", 16),
+                    ("trellis", 12),
+                ]
+            )
+            + f"{ml_decoder_algorithm(n, k):>10}{disagreements:>15}"
+        )
+
+if __name__ == "__main__":
+    main()
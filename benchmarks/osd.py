@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""OSD benchmark
+
+Brief: Decoding time and block error rate of the OSD decoder of order 0 to 3 compared to exhaustive ML decoding
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+
+import numpy as np
+import tensorflow as tf
+
+from decoders import MinDistanceDecoder, OrderedStatisticsDecoder
+from benchmarks import load_reference_code, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OSD benchmark: OSD of order 0 to 3 vs exhaustive ML decoding"
+    )
+    parser.add_argument("--code", default="BCH_31_16")
+    parser.add_argument(
+        "--ebn0_db", nargs="+", type=float, default=[1.0, 3.0, 5.0]
+    )
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument(
+        "--minimum_distance",
+        type=int,
+        default=None,
+        help="minimum distance of the code used by the OSD optimality test",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    G, _, _ = load_reference_code(args.code)
+    (k, n) = G.shape
+    G = tf.constant(G)
+    models = {"ML": MinDistanceDecoder(n, k, G=G)}
+    for order in range(4):
+        for early_stopping in [False, True]:
+            models[f"OSD-{order}{'-ES' if early_stopping else ''}"] = (
+                OrderedStatisticsDecoder(
+                    n,
+                    k,
+                    G=G,
+                    order=order,
+                    early_stopping=early_stopping,
+                    minimum_distance=args.minimum_distance,
+                )
+            )
+
+    print(f"{'Eb/N0':>6}{'decoder':>12}{'ms':>10}{'BLER':>10}{'!= ML':>8}")
+    rng = np.random.default_rng(0)
+    for ebn0_db in args.ebn0_db:
+        sigma2 = 1.0 / (2 * (k / n) * 10 ** (ebn0_db / 10))
+        # BPSK symbols of the all-zero codeword
+        symbols = tf.constant(
+            -1.0 + np.sqrt(sigma2) * rng.normal(size=(args.batch, n)), dtype=tf.float32
+        )
+
+        words = {}
+        for (name, model) in models.items():
+            decode = tf.function(lambda: model([symbols, G, sigma2]))
+            duration = timeit(decode, repeats=args.repeats, warmup=1)
+            words[name] = decode().numpy()
+            block_errors = np.any(words[name] != 0, axis=-1)
+            disagreements = np.sum(np.any(words[name] != words["ML"], axis=-1))
+            print(
+                f"{ebn0_db:>6.1f}{name:>12}{1e3 * duration:>10.1f}{np.mean(block_errors):>10.4f}{disagreements:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
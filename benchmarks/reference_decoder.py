@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Reference decoder benchmark
+
+Brief: Decoding throughput of the reference FactorGraph decoder, of its vectorized batch version and of the process pool
+parallel version
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from decoders import (
+    SumProduct,
+    MinSum,
+    FactorGraph,
+    BatchFactorGraph,
+    ParallelFactorGraphDecoder,
+)
+from benchmarks import load_reference_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Reference decoder benchmark: FactorGraph (per codeword) vs BatchFactorGraph (vectorized) vs ParallelFactorGraphDecoder (process pool)"
+    )
+    parser.add_argument("--codes", nargs="+", default=["BCH_31_16", "BCH_63_45"])
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument(
+        "--reference_batch",
+        type=int,
+        default=200,
+        help="number of codewords decoded by the (slow) FactorGraph",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes of the parallel decoder (defaults to the number of CPUs)",
+    )
+    parser.add_argument("--n_iter", type=int, default=5)
+    parser.add_argument("--noise_std", type=float, default=0.8)
+    args = parser.parse_args()
+
+    print(
+        f"{'code':<12}{'algorithm':<12}{'FactorGraph cw/s':>18}{'Batch cw/s':>14}{'speedup':>10}{'Parallel cw/s':>15}{'avg iter':>10}"
+    )
+    rng = np.random.default_rng(0)
+    for codename in args.codes:
+        _, H, _ = load_reference_code(codename)
+        (m, n) = H.shape
+        systematic_bits = [True] * (n - m) + [False] * m
+        # LLRs of the all-zero codeword
+        LLRs = 4.0 * (1.0 + args.noise_std * rng.normal(size=(args.batch, n)))
+
+        for algorithm in [SumProduct, MinSum]:
+            reference = FactorGraph(codename, H, systematic_bits, algorithm=algorithm())
+            start = time.perf_counter()
+            with np.errstate(divide="ignore"):
+                reference.decode(LLRs[: args.reference_batch], args.n_iter)
+            reference_throughput = args.reference_batch / (time.perf_counter() - start)
+
+            batch = BatchFactorGraph(
+                codename, H, systematic_bits, algorithm=algorithm()
+            )
+            start = time.perf_counter()
+            batch.decode(LLRs, args.n_iter)
+            batch_throughput = args.batch / (time.perf_counter() - start)
+
+            with ParallelFactorGraphDecoder(
+                codename,
+                H,
+                systematic_bits,
+                algorithm=algorithm(),
+                max_workers=args.workers,
+            ) as parallel:
+                # Warmup: start the workers and build their graphs
+                parallel.decode(LLRs[:1], args.n_iter)
+                start = time.perf_counter()
+                parallel.decode(LLRs, args.n_iter)
+                parallel_throughput = args.batch / (time.perf_counter() - start)
+                for (pid, worker) in sorted(parallel.worker_statistics.items()):
+                    print(
+                        f"    worker {pid}: {worker['codewords']} codewords, {worker['throughput']:.0f} cw/s"
+                    )
+
+            print(
+                f"{codename:<12}{algorithm.__name__:<12}{reference_throughput:>18.0f}{batch_throughput:>14.0f}"
+                f"{batch_throughput / reference_throughput:>10.0f}{parallel_throughput:>15.0f}{np.mean(batch.iterations):>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""SNR sweep benchmark
+
+Brief: Evaluation time of a BER/BLER curve, one model.evaluate per Eb/N0 point vs a single evaluation of batches mixing all the points
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from autoencoders import AutoEncoder
+from dataset import random_messages_dataset, random_messages_snr_dataset
+from metrics import BitErrorRate, BlockErrorRate
+from tools import ebno_db_to_snr_db
+from benchmarks import load_reference_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="SNR sweep benchmark: per Eb/N0 point evaluations vs a single mixed evaluation"
+    )
+    parser.add_argument("--code", default="BCH_31_16")
+    parser.add_argument("--conf", default="BP")
+    parser.add_argument(
+        "--ebn0_db", nargs="+", type=float, default=[0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    )
+    parser.add_argument(
+        "--batch", type=int, default=200, help="samples per Eb/N0 point and step"
+    )
+    parser.add_argument("--steps", type=int, default=50)
+    args = parser.parse_args()
+
+    G, H, _ = load_reference_code(args.code)
+    (k, n) = G.shape
+    ebn0_dbs = np.array(args.ebn0_db, dtype=np.float32)
+    # mean(Es) assumed to be 1
+    noise_powers_db = -ebno_db_to_snr_db(ebn0_dbs, k / n).numpy()
+    model = AutoEncoder(
+        n,
+        k,
+        5,
+        args.conf,
+        0.0,
+        G=tf.constant(G, dtype=tf.float32),
+        H=tf.constant(H, dtype=tf.float32),
+        trainable_code=False,
+        trainable_decoder=False,
+        evaluation_noise_powers_db=noise_powers_db.tolist(),
+    )
+    model.compile(
+        loss="binary_crossentropy", metrics=[BitErrorRate(), BlockErrorRate()]
+    )
+
+    # One evaluation per point
+    dataset = random_messages_dataset(k, batch=args.batch, seed=0).take(args.steps)
+    model.evaluate(dataset.take(1), verbose=0)
+    start = time.perf_counter()
+    per_point = []
+    for noise_power_db in noise_powers_db:
+        model.channel.noise_power_db = noise_power_db
+        logs = model.evaluate(dataset, verbose=0, return_dict=True)
+        per_point.append((logs["BER"], logs["BLER"]))
+    loop_duration = time.perf_counter() - start
+
+    # Single evaluation, batches mixing all the points
+    dataset = random_messages_snr_dataset(
+        k, len(ebn0_dbs), batch=args.batch * len(ebn0_dbs), seed=0
+    ).take(args.steps)
+    model.evaluate(dataset.take(1), verbose=0)
+    start = time.perf_counter()
+    logs = model.evaluate(dataset, verbose=0, return_dict=True)
+    sweep_duration = time.perf_counter() - start
+
+    print(f"{'Eb/N0':>6}{'BER':>12}{'BLER':>12}{'sweep BER':>12}{'sweep BLER':>12}")
+    for i, ebn0_db in enumerate(ebn0_dbs):
+        print(
+            f"{ebn0_db:>6.1f}{per_point[i][0]:>12.2e}{per_point[i][1]:>12.2e}{logs['SNR_BER'][i]:>12.2e}{logs['SNR_BLER'][i]:>12.2e}"
+        )
+    print(
+        f"per point evaluations: {loop_duration:.2f} s, single evaluation: {sweep_duration:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Stopping rule benchmark
+
+Brief: Evaluation time to a target confidence interval, per batch Python termination callback vs in-graph stopping rule
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import tensorflow as tf
+
+from autoencoders import AutoEncoder
+from callbacks import BatchTerminationCallback, StoppingRule
+from dataset import random_messages_dataset
+from metrics import (
+    BitErrorRate,
+    BlockErrorRate,
+    BitErrorCount,
+    BlockErrorCount,
+    BinomialProportionConfidenceInterval,
+    ErrorStatistics,
+)
+from tools import ebno_db_to_snr_db
+from benchmarks import load_reference_code
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Stopping rule benchmark: termination callback vs in-graph stopping rule"
+    )
+    parser.add_argument("--code", default="BCH_31_16")
+    parser.add_argument("--conf", default="BP")
+    parser.add_argument("--ebn0_db", type=float, default=4.0)
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=25000)
+    parser.add_argument(
+        "--max_relative_span", type=float, default=0.1, help="target BER interval"
+    )
+    parser.add_argument("--steps_per_execution", type=int, default=100)
+    args = parser.parse_args()
+
+    G, H, _ = load_reference_code(args.code)
+    (k, n) = G.shape
+    # mean(Es) assumed to be 1
+    noise_power_db = -ebno_db_to_snr_db(args.ebn0_db, k / n).numpy()
+
+    def create_model(stopping_rule=None):
+        return AutoEncoder(
+            n,
+            k,
+            5,
+            args.conf,
+            noise_power_db,
+            G=tf.constant(G, dtype=tf.float32),
+            H=tf.constant(H, dtype=tf.float32),
+            trainable_code=False,
+            trainable_decoder=False,
+            stopping_rule=stopping_rule,
+        )
+
+    def evaluate(model, callbacks=None):
+        dataset = random_messages_dataset(k, batch=args.batch, seed=0)
+        model.evaluate(dataset.take(1), verbose=0)
+        start = time.perf_counter()
+        logs = model.evaluate(
+            dataset, steps=args.steps, verbose=0, return_dict=True, callbacks=callbacks
+        )
+        return (time.perf_counter() - start, logs)
+
+    # Separate metrics and Python condition on the logs of every batch
+    def condition(_, logs):
+        (span, _, ber, _) = logs["BPCI_BER"]
+        return span / (ber + 1e-7) < args.max_relative_span
+
+    model = create_model()
+    model.compile(
+        loss="binary_crossentropy",
+        metrics=[
+            BitErrorRate(name="BER"),
+            BlockErrorRate(name="BLER"),
+            BitErrorCount(name="BEC", mode="sum"),
+            BlockErrorCount(name="BLEC", mode="sum"),
+            BinomialProportionConfidenceInterval(
+                monitor_class=BitErrorRate,
+                monitor_params={"name": "bpci_ber"},
+                name="BPCI_BER",
+            ),
+            BinomialProportionConfidenceInterval(
+                monitor_class=BlockErrorRate,
+                monitor_params={"name": "bpci_bler"},
+                dimensions=[0],
+                name="BPCI_BLER",
+            ),
+        ],
+    )
+    results = [("callback", *evaluate(model, [BatchTerminationCallback(condition)]))]
+
+    # Fused metric and in-graph stopping rule
+    for steps_per_execution in sorted({1, args.steps_per_execution}):
+        model = create_model(
+            StoppingRule(max_relative_span=args.max_relative_span, interval="BPCI_BER")
+        )
+        model.compile(
+            loss="binary_crossentropy",
+            metrics=[ErrorStatistics()],
+            steps_per_execution=steps_per_execution,
+        )
+        results.append((f"stopping rule ({steps_per_execution})", *evaluate(model)))
+
+    print(f"{'evaluation':>20}{'time (s)':>10}{'BER':>12}{'BEC':>10}{'CI span':>12}")
+    for (name, duration, logs) in results:
+        print(
+            f"{name:>20}{duration:>10.2f}{logs['BER']:>12.2e}{int(logs['BEC']):>10}{logs['BPCI_BER'][0]:>12.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Syndrome decoder benchmark
+
+Brief: Table build time and decoding time of the syndrome lookup decoder compared to exhaustive hard-decision ML decoding
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import argparse
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from decoders import MinDistanceDecoder, SyndromeDecoder
+from decoders.syndrome_decoding import build_syndrome_table
+from benchmarks import load_reference_code, timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Syndrome decoder benchmark: coset leaders table lookup vs exhaustive hard-decision ML"
+    )
+    parser.add_argument(
+        "--codes", nargs="+", default=["BCH_15_7", "BCH_31_16", "BCH_31_11"]
+    )
+    parser.add_argument("--ebn0_db", type=float, default=4.0)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of processes building the syndrome tables",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'code':>12}{'table (s)':>12}{'syndrome (ms)':>16}{'ML (ms)':>10}{'BLER':>10}{'!= ML':>8}"
+    )
+    rng = np.random.default_rng(0)
+    for code in args.codes:
+        G, H, _ = load_reference_code(code)
+        (k, n) = G.shape
+
+        start = time.perf_counter()
+        build_syndrome_table(H, max_workers=args.workers)
+        build_duration = time.perf_counter() - start
+
+        (G, H) = (tf.constant(G), tf.constant(H))
+        syndrome = SyndromeDecoder(n, k, H=H, return_words=False)
+        ml = MinDistanceDecoder(n, k, G=G, return_words=False, metric="hamming")
+
+        sigma2 = 1.0 / (2 * (k / n) * 10 ** (args.ebn0_db / 10))
+        # BPSK symbols of the all-zero codeword
+        symbols = tf.constant(
+            -1.0 + np.sqrt(sigma2) * rng.normal(size=(args.batch, n)), dtype=tf.float32
+        )
+        decode_syndrome = tf.function(lambda: syndrome([symbols, H, sigma2]))
+        decode_ml = tf.function(lambda: ml([symbols, G, sigma2]))
+        syndrome_duration = timeit(decode_syndrome, repeats=args.repeats, warmup=1)
+        ml_duration = timeit(decode_ml, repeats=args.repeats, warmup=1)
+
+        codewords = decode_syndrome().numpy()
+        block_errors = np.any(codewords != 0, axis=-1)
+        # Ties between codewords at the same Hamming distance may be broken differently
+        disagreements = np.sum(np.any(codewords != decode_ml().numpy(), axis=-1))
+        print(
+            f"{code:>12}{build_duration:>12.3f}{1e3 * syndrome_duration:>16.2f}{1e3 * ml_duration:>10.1f}{np.mean(block_errors):>10.4f}{disagreements:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark utilities
+
+Brief: Reference codes loading and timing helpers shared by the benchmarks
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from encoders.linearblockencoders_reference.alist import generate_code
+
+REFERENCE_CODES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "encoders",
+    "linearblockencoders_reference",
+)
+
+
+def load_reference_code(codename):
+    """load the generator and parity-check matrices of a reference code
+
+    Args:
+        codename (str): name of the code, e.g. "BCH_31_16". The npz file is used when available,
+            otherwise the matrices are generated from the alist file.
+
+    Returns:
+        (np.array, np.array, np.array): G, H_systematic, H_non_systematic
+    """
+    npz_path = os.path.join(REFERENCE_CODES_PATH, f"{codename}.npz")
+    if os.path.isfile(npz_path):
+        code_file = np.load(npz_path)
+        return (
+            code_file["G"].astype(np.float32),
+            code_file["H_systematic"].astype(np.float32),
+            code_file["H_non_systematic"].astype(np.float32),
+        )
+    alist_path = os.path.join(REFERENCE_CODES_PATH, f"{codename}_alist.txt")
+    H_non_systematic, H_systematic, G, _, _ = generate_code(alist_path)
+    return (
+        G.astype(np.float32),
+        H_systematic.astype(np.float32),
+        H_non_systematic.astype(np.float32),
+    )
+
+
+def timeit(function, repeats=10, warmup=2):
+    """median execution time of `function()`
+
+    Args:
+        function (callable): function to time, called without arguments
+        repeats (int, optional): number of timed calls. Defaults to 10.
+        warmup (int, optional): number of untimed calls (tracing, caches). Defaults to 2.
+
+    Returns:
+        float: median execution time in seconds
+    """
+    for _ in range(warmup):
+        function()
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return float(np.median(durations))
+
+
+def random_llrs(batch, n, scale=4.0, seed=0):
+    """random LLRs of BPSK symbols of the all-zero codeword received over an AWGN channel"""
+    rng = np.random.default_rng(seed)
+    return tf.constant(
+        scale * (1.0 + rng.normal(size=(batch, n))), dtype=tf.float32
+    )
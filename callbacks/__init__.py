@@ -30,4 +30,4 @@ from .defaults import (
     default_configuration_model_checkpoint,
 )
 
-from .termination import BatchTerminationCallback
+from .termination import BatchTerminationCallback, StoppingRule
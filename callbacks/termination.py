@@ -5,7 +5,8 @@
 
 This callback monitors a binomial distributed loss or metric, evaluates the confidence interval
 and interrupt the evaluation when the confidence interval span to mean value is below a given 
-ratio.
+ratio. The StoppingRule evaluates such criteria in the graph of the evaluation loop instead (see
+AutoEncoder.set_stopping_rule).
 
 Brief: binomial proportion confidence interval based early stopping callback for evaluation
 
@@ -37,3 +38,73 @@ class BatchTerminationCallback(tf.keras.callbacks.Callback):
         if condition:
             print("stopping evaluation")
             raise StopIteration("termination.")
+
+
+class StoppingRule:
+    def __init__(
+        self,
+        min_errors=None,
+        errors="BEC",
+        max_relative_span=None,
+        interval="BPCI_BER",
+        max_frames=None,
+    ):
+        """Sequential stopping rule of an evaluation, evaluated in the graph of the evaluation loop after every batch
+        (see AutoEncoder.set_stopping_rule) instead of a Python condition on the logs of every batch. The evaluation
+        stops when all the precision criteria given are met (target number of errors, relative span of a confidence
+        interval) or when the maximum number of frames is reached.
+
+        Args:
+            min_errors (int, optional): target number of errors. Defaults to None.
+            errors (str, optional): logs key of the errors count (e.g. "BEC" or "BLEC"). Defaults to 'BEC'.
+            max_relative_span (float, optional): target span to value ratio of the confidence interval. Defaults to
+                None.
+            interval (str, optional): logs key of the confidence interval (span, lower, value, upper), e.g. "BPCI_BER"
+                or "BPCI_BLER". Defaults to 'BPCI_BER'.
+            max_frames (int, optional): maximum number of evaluated frames. Defaults to None.
+        """
+        if min_errors is None and max_relative_span is None and max_frames is None:
+            raise ValueError(
+                "The stopping rule requires min_errors, max_relative_span or max_frames"
+            )
+        self.min_errors = min_errors
+        self.errors = errors
+        self.max_relative_span = max_relative_span
+        self.interval = interval
+        self.max_frames = max_frames
+        # State of the evaluation (not tracked by the model)
+        with tf.init_scope():
+            self.stopped = tf.Variable(False, trainable=False, name="stopped")
+            self.frames = tf.Variable(0, dtype=tf.int64, trainable=False, name="frames")
+
+    def condition(self, logs):
+        """whether the evaluation of the logs (dict of tensors) and frames count is over"""
+        precision = []
+        if self.min_errors is not None:
+            precision.append(
+                tf.cast(logs[self.errors], tf.float64) >= float(self.min_errors)
+            )
+        if self.max_relative_span is not None:
+            epsilon = 1e-7
+            (span, _, value, _) = logs[self.interval]
+            precision.append(span / (value + epsilon) < self.max_relative_span)
+        stop = tf.reduce_all(precision) if precision else tf.constant(False)
+        if self.max_frames is not None:
+            stop = tf.logical_or(stop, self.frames >= self.max_frames)
+        return stop
+
+    def update_state(self, logs, frames):
+        """
+        Args:
+            logs (dict): metrics results after the batch
+            frames (int64 tensor): number of frames of the batch
+        """
+        self.frames.assign_add(frames)
+        self.stopped.assign(self.condition(logs))
+
+    def reset_state(self):
+        self.stopped.assign(False)
+        self.frames.assign(0)
+
+    def result(self):
+        return self.stopped
@@ -22,7 +22,7 @@ import pytest
 import tempfile
 
 import tensorflow as tf
-from .termination import BatchTerminationCallback
+from .termination import BatchTerminationCallback, StoppingRule
 
 
 def test_batch_terminatin_callback():
@@ -33,5 +33,27 @@ def test_batch_terminatin_callback():
     # TODO: run dumb model to execute callback
 
 
+def test_stopping_rule():
+    rule = StoppingRule(min_errors=10, errors="BLEC", max_relative_span=0.5)
+    # (span, lower, value, upper) interval
+    logs = {"BLEC": tf.constant(12), "BPCI_BER": (0.2, 0.0, 0.1, 0.2)}
+    assert not rule.condition(logs)
+    logs["BPCI_BER"] = (0.04, 0.08, 0.1, 0.12)
+    assert rule.condition(logs)
+    logs["BLEC"] = tf.constant(9)
+    assert not rule.condition(logs)
+
+    rule = StoppingRule(max_frames=100)
+    rule.update_state({}, tf.constant(60, tf.int64))
+    assert not rule.result()
+    rule.update_state({}, tf.constant(60, tf.int64))
+    assert rule.result() and rule.frames.numpy() == 120
+    rule.reset_state()
+    assert not rule.result() and rule.frames.numpy() == 0
+
+    with pytest.raises(ValueError):
+        StoppingRule()
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -17,4 +17,5 @@ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR C
 IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
 """
 
-from .awgn import AWGN
+from .awgn import AWGN, stateless_normal_streams
+from .importance_sampling import ImportanceSamplingAWGN
@@ -63,11 +63,74 @@ class AWGN(tf.keras.layers.Layer):
             tf.constant(decibeltolinear(new_noise_power_db), shape=(1,))
         )
 
-    def call(self, inputs, training=False):
-
-        noise_samples = tf.random.normal(
-            shape=tf.shape(inputs),
-            mean=0.0,
-            stddev=tf.sqrt(self._noise_power / 2.0),
-        )
+    def call(
+        self,
+        inputs,
+        training=False,
+        noise_power=None,
+        noise_seed=None,
+        snr_indices=None,
+        n_snr=1,
+    ):
+        """
+        Args:
+            inputs ([batch, n] tensor): symbols
+            noise_power ([batch, 1] tensor) [default=None]: per sample noise power (linear scale), the noise power of
+                the channel is used when None
+            noise_seed ([2] tensor) [default=None]: key of the stateless noise of the batch (see
+                dataset.random_messages_snr_dataset), the noise is drawn from the global (stateful) RNG when None
+            snr_indices ([batch] tensor) [default=None]: SNR index of each sample, each SNR index has its own noise
+                stream (see stateless_normal_streams)
+            n_snr (int) [default=1]: number of SNR indices
+        """
+        if noise_power is None:
+            noise_power = self._noise_power
+
+        if noise_seed is None:
+            noise_samples = tf.random.normal(
+                shape=tf.shape(inputs),
+                mean=0.0,
+                stddev=tf.sqrt(noise_power / 2.0),
+            )
+        else:
+            noise_samples = tf.sqrt(noise_power / 2.0) * stateless_normal_streams(
+                tf.shape(inputs), noise_seed, snr_indices, n_snr
+            )
         return inputs + noise_samples
+
+
+def stateless_normal_streams(shape, seed, stream_indices=None, n_streams=1):
+    """
+    Standard normal samples drawn from stateless (Philox) streams: the stream s is keyed by seed folded with s, and the
+    sample of rank r among the samples of stream s gets the row r of the stream. The samples of a stream then do not
+    depend on the samples of the other streams in the batch.
+
+    Args:
+        shape ([2] tensor): [batch, n]
+        seed ([2] tensor): key of the batch
+        stream_indices ([batch] tensor) [default=None]: stream of each sample, a single stream when None
+        n_streams (int) [default=1]: number of streams
+
+    Returns:
+        [batch, n] tensor
+    """
+    if stream_indices is None:
+        return tf.random.stateless_normal(shape, seed=seed, alg="philox")
+
+    one_hot = tf.one_hot(stream_indices, n_streams, dtype=tf.int32)
+    # Rank of each sample among the samples of its stream
+    ranks = tf.reduce_sum((tf.cumsum(one_hot, axis=0) - 1) * one_hot, axis=-1)
+    rows = tf.reduce_max(ranks) + 1
+    streams = tf.stack(
+        [
+            tf.random.stateless_normal(
+                [rows, shape[1]],
+                seed=tf.random.experimental.stateless_fold_in(seed, s),
+                alg="philox",
+            )
+            for s in range(n_streams)
+        ]
+    )
+    return tf.gather_nd(
+        streams, tf.stack([tf.cast(stream_indices, tf.int32), ranks], axis=-1)
+    )
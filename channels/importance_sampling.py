@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Additive White Gaussian Noise channel
+
+Brief: Add white gaussian noise to input signal
+
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import math
+
+import numpy as np
+import tensorflow as tf
+
+from .awgn import AWGN, stateless_normal_streams
+
+
+class ImportanceSamplingAWGN(AWGN):
+    """
+    AWGN channel with biased noise, for the estimation of low error rates (importance sampling): the noise is drawn
+    from a biased density q instead of the AWGN density p, and each sample is returned with the likelihood ratio
+    p(noise) / q(noise) of its noise, the weight of its errors in the error rates estimators (sample_weight of
+    metrics.BitErrorRate and metrics.BlockErrorRate). The noise is not biased in training (unit likelihood ratios).
+
+    Args:
+        noise_power (float) [default=None]: noise power (linear scale)
+        noise_power_db (float) [default=None]: noise power (dB)
+        method (str) [default="scaling"]: "scaling" (variance scaling, the noise variance is multiplied by
+            variance_scaling) or "translation" (mean translation, mixture of translations of the noise toward the
+            nearest codewords, see translation_codewords)
+        variance_scaling (float) [default=2.0]: noise variance factor of the "scaling" method
+        translation_codewords ([N x n] array) [default=None]: codewords c of the "translation" method, e.g. the minimum
+            weight codewords of the code (see decoders.codebook.minimum_weight_codewords). The noise of a sample is
+            translated toward the codeword x + c, x being the transmitted codeword and c uniformly drawn among the N
+            codewords
+        translation (float) [default=1.0]: translation of the symbols of the support of c toward 0, relative to the
+            decision boundary
+    """
+
+    def __init__(
+        self,
+        noise_power=None,
+        noise_power_db=None,
+        method="scaling",
+        variance_scaling=2.0,
+        translation_codewords=None,
+        translation=1.0,
+        **kwargs,
+    ):
+        super(ImportanceSamplingAWGN, self).__init__(
+            noise_power=noise_power, noise_power_db=noise_power_db, **kwargs
+        )
+        if method not in ["scaling", "translation"]:
+            raise ValueError(f"Unknown importance sampling method '{method}'")
+        if method == "translation" and translation_codewords is None:
+            raise ValueError(
+                "The translation importance sampling requires translation_codewords"
+            )
+        self.method = method
+        self.variance_scaling = variance_scaling
+        self.translation = translation
+        if translation_codewords is not None:
+            self.translation_codewords = tf.constant(
+                np.array(translation_codewords) % 2, dtype=tf.float32
+            )
+
+    def call(
+        self,
+        inputs,
+        training=False,
+        noise_power=None,
+        noise_seed=None,
+        snr_indices=None,
+        n_snr=1,
+    ):
+        """
+        Args:
+            inputs ([batch, n] tensor): BPSK symbols
+            noise_power, noise_seed, snr_indices, n_snr: see AWGN.call
+
+        Returns:
+            ([batch, n] tensor, [batch] tensor): noisy symbols and likelihood ratios of the noise samples
+        """
+        if training:
+            noisy_symbols = super(ImportanceSamplingAWGN, self).call(
+                inputs,
+                training=training,
+                noise_power=noise_power,
+                noise_seed=noise_seed,
+                snr_indices=snr_indices,
+                n_snr=n_snr,
+            )
+            return noisy_symbols, tf.ones([tf.shape(inputs)[0]])
+
+        if noise_power is None:
+            noise_power = self.noise_power
+        # Noise variance per symbol
+        variance = noise_power / 2.0
+
+        # Standard normal samples, the last one draws the translation of the sample
+        shape = tf.shape(inputs)
+        if noise_seed is None:
+            samples = tf.random.normal([shape[0], shape[1] + 1])
+        else:
+            samples = stateless_normal_streams(
+                [shape[0], shape[1] + 1], noise_seed, snr_indices, n_snr
+            )
+        (samples, choice) = (samples[:, :-1], samples[:, -1])
+
+        if self.method == "scaling":
+            scaling = self.variance_scaling
+            noise = tf.sqrt(scaling * variance) * samples
+            # log p/q = n/2 log(s) - (s - 1)/2 |samples|^2
+            log_ratios = 0.5 * tf.cast(shape[1], tf.float32) * math.log(
+                scaling
+            ) - 0.5 * (scaling - 1.0) * tf.reduce_sum(tf.square(samples), axis=-1)
+        else:
+            codewords = self.translation_codewords
+            n_codewords = tf.shape(codewords)[0]
+            # Uniform codeword index from the normal sample (normal CDF)
+            uniform = 0.5 * (1.0 + tf.math.erf(choice / math.sqrt(2.0)))
+            index = tf.minimum(
+                tf.cast(uniform * tf.cast(n_codewords, tf.float32), tf.int32),
+                n_codewords - 1,
+            )
+            # Translations m_c = -t x.c (the symbols of the support of c are moved toward 0)
+            translations = -self.translation * inputs * tf.gather(codewords, index)
+            noise = tf.sqrt(variance) * samples + translations
+            # q is the mixture of the translated densities:
+            # log p/q = log N - logsumexp_c (<noise, m_c> - |m_c|^2/2) / variance
+            exponents = (
+                -self.translation
+                * tf.matmul(noise * inputs, codewords, transpose_b=True)
+                - 0.5 * self.translation**2 * tf.reduce_sum(codewords, axis=-1)
+            ) / variance
+            log_ratios = tf.math.log(
+                tf.cast(n_codewords, tf.float32)
+            ) - tf.reduce_logsumexp(exponents, axis=-1)
+
+        return inputs + noise, tf.exp(log_ratios)
@@ -0,0 +1,103 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import pytest
+
+import tensorflow as tf
+
+from . import ImportanceSamplingAWGN
+from decoders.codebook import minimum_weight_codewords
+from tools import load_code
+
+
+def create_channel(method, noise_power_db=0.0, **kwargs):
+    if method == "translation":
+        kwargs["translation_codewords"] = minimum_weight_codewords(
+            load_code("BCH_15_7")
+        )
+    return ImportanceSamplingAWGN(
+        noise_power_db=noise_power_db, method=method, **kwargs
+    )
+
+
+@pytest.mark.parametrize("method", ["scaling", "translation"])
+def test_importance_sampling_unit_mean_likelihood_ratio(method):
+    # E_q[p/q] = 1
+    tf.random.set_seed(1)
+    channel = create_channel(method)
+    (_, likelihood_ratios) = channel(-tf.ones([200_000, 15]))
+    assert likelihood_ratios.shape == (200_000,)
+    tf.debugging.assert_near(tf.reduce_mean(likelihood_ratios), 1.0, atol=0.05)
+
+
+def test_importance_sampling_symbol_error_probability():
+    # Symbol error probability Q(sqrt(2 / noise_power)) at 10 dB SNR: 3.87e-6 (the variance of the likelihood ratios
+    # of the variance scaling grows with the number of symbols)
+    tf.random.set_seed(2)
+    channel = create_channel("scaling", noise_power_db=-10.0, variance_scaling=4.0)
+    (noisy_symbols, likelihood_ratios) = channel(-tf.ones([100_000, 2]))
+    errors = tf.cast(noisy_symbols[:, 0] > 0, tf.float32)
+    estimate = tf.reduce_mean(likelihood_ratios * errors)
+    tf.debugging.assert_near(estimate, 3.87e-6, rtol=0.2, atol=0.0)
+
+
+def test_importance_sampling_codeword_error_probability():
+    # Probability of a received word closer to a minimum weight codeword (weight 5) than to the all-zero codeword at
+    # 10 dB SNR, union bound 18 x Q(sqrt(2 x 5 / noise_power)) = 1.37e-22 (tight at high SNR)
+    tf.random.set_seed(2)
+    channel = create_channel("translation", noise_power_db=-10.0)
+    codewords = tf.constant(channel.translation_codewords)
+    (noisy_symbols, likelihood_ratios) = channel(-tf.ones([100_000, 15]))
+    errors = tf.cast(
+        tf.reduce_max(tf.matmul(noisy_symbols, codewords, transpose_b=True), axis=-1)
+        > 0,
+        tf.float32,
+    )
+    estimate = tf.reduce_mean(likelihood_ratios * errors)
+    tf.debugging.assert_near(estimate, 1.37e-22, rtol=0.2, atol=0.0)
+
+
+def test_importance_sampling_stateless_noise():
+    channel = create_channel("translation")
+    seed = tf.constant([3, 4], dtype=tf.int64)
+    (noisy_symbols, likelihood_ratios) = channel(-tf.ones([10, 15]), noise_seed=seed)
+    (expected_symbols, expected_ratios) = channel(-tf.ones([10, 15]), noise_seed=seed)
+    tf.debugging.assert_equal(noisy_symbols, expected_symbols)
+    tf.debugging.assert_equal(likelihood_ratios, expected_ratios)
+
+
+def test_importance_sampling_training():
+    # Unbiased noise, unit likelihood ratios
+    channel = create_channel("scaling", variance_scaling=100.0)
+    (noisy_symbols, likelihood_ratios) = channel(tf.zeros([100_000, 2]), training=True)
+    tf.debugging.assert_equal(likelihood_ratios, tf.ones([100_000]))
+    tf.debugging.assert_near(
+        tf.reduce_mean(tf.reduce_sum(tf.square(noisy_symbols), axis=-1)),
+        1.0,
+        atol=0.05,
+    )
+
+
+def test_importance_sampling_invalid_method():
+    with pytest.raises(ValueError):
+        ImportanceSamplingAWGN(noise_power_db=0.0, method="unknown")
+    with pytest.raises(ValueError):
+        ImportanceSamplingAWGN(noise_power_db=0.0, method="translation")
+
+
+if __name__ == "__main__":
+    pytest.main()
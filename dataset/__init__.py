@@ -28,4 +28,5 @@ from .messages import (
     random_messages_base_dataset,
     all_zero_dataset,
     random_messages_base_all_zero_all_one_dataset,
+    random_messages_snr_dataset,
 )
@@ -24,43 +24,105 @@ import tensorflow as tf
 import numpy as np
 
 
+# Stateless (counter-based) random streams: every batch is generated from a Philox key derived from (seed, batch index)
+# and folded with the stream index, a batch can then be regenerated independently of the previous ones (and of the
+# number of parallel calls of the tf.data pipeline)
+MESSAGES_STREAM = 0
+NOISE_STREAM = 1
+
+
+def batch_seed(seed, batch_index, stream=MESSAGES_STREAM):
+    """stateless RNG key of the batch `batch_index` of the random stream `stream`
+
+    Args:
+        seed (tf.int64): dataset seed
+        batch_index (tf.int64): index of the batch
+        stream (int, optional): MESSAGES_STREAM or NOISE_STREAM. Defaults to MESSAGES_STREAM.
+
+    Returns:
+        tf.Tensor(shape=(2,), dtype=tf.int32): key of the stateless random ops (e.g. tf.random.stateless_uniform)
+    """
+    return tf.random.experimental.stateless_fold_in(
+        tf.stack([tf.cast(seed, tf.int64), tf.cast(batch_index, tf.int64)]), stream
+    )
+
+
+def dataset_seed(seed=None):
+    """seed of the stateless datasets, drawn from the global generator if None"""
+    if seed is None:
+        return tf.random.get_global_generator().uniform_full_int(
+            shape=(), dtype=tf.int64
+        )
+    return tf.constant(seed, dtype=tf.int64)
+
+
+def batch_indices(start=0, step=1):
+    """infinite dataset of batch indices: start, start + step, start + 2 * step, ..."""
+    try:
+        return tf.data.Dataset.counter(start=start, step=step, dtype=tf.int64)
+    except AttributeError:
+        return tf.data.experimental.Counter(start=start, step=step, dtype=tf.int64)
+
+
 def random_messages(length, count, seed=None):
     """generate `count` random messages of length `length`.
 
     Args:
         length (int): length of the messages in bits
         count (int): number of messages to generate
-        seed (integer, optional): RNG seed. Defaults to None.
+        seed (integer, optional): RNG seed. Defaults to None. If None, retrieve global generator.
 
     Returns:
-        tf.Tensor(dtype=tf.float3): random messages
+        tf.Tensor(dtype=tf.float3): random messages (the first batch of the stateless messages stream of `seed`)
     """
     if seed is None:
         rng = tf.random.get_global_generator()
-    else:
-        rng = tf.random.Generator.from_seed(seed)
+        return tf.cast(
+            rng.uniform((count, length), maxval=2, dtype=tf.int32), dtype=tf.float32
+        )
     dataset = tf.cast(
-        rng.uniform((count, length), maxval=2, dtype=tf.int32), dtype=tf.float32
+        tf.random.stateless_uniform(
+            (count, length),
+            seed=batch_seed(seed, 0),
+            maxval=2,
+            dtype=tf.int32,
+            alg="philox",
+        ),
+        dtype=tf.float32,
     )
     return dataset
 
 
-def random_messages_dataset(length, batch=256, prefetch=1024 ** 2, seed=None):
+def uniform_batch(shape, seed, batch_index, maxval):
+    """batch `batch_index` of the stateless messages stream of `seed`: integers uniformly drawn in [0, maxval)"""
+    return tf.random.stateless_uniform(
+        shape,
+        seed=batch_seed(seed, batch_index),
+        minval=0,
+        maxval=maxval,
+        dtype=tf.int32,
+        alg="philox",
+    )
+
+
+def random_messages_dataset(
+    length, batch=256, prefetch=1024 ** 2, seed=None, start=0, step=1
+):
     """generate random sequences of bits of length `length` as dataset
 
     Args:
         length (tf.int32): length of bits sequences
         batch (tf.int32, optional): batch size. Defaults to 256.
         prefetch (tf.int32, optional): count of pre-generated sequences. Defaults to 1024**2.
-        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, retrieve global generator.
+        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, drawn from the global generator.
+        start (tf.int64, optional): index of the first batch (e.g. resumed generation). Defaults to 0.
+        step (tf.int64, optional): step between the batch indices (e.g. sharded generation, the shard index being
+            `start` and the number of shards `step`). Defaults to 1.
 
     Returns:
         tf.data.Dataset: dataset
     """
-    if seed is None:
-        rng = tf.random.get_global_generator()
-    else:
-        rng = tf.random.Generator.from_seed(seed)
+    seed = dataset_seed(seed)
 
     try:
         AUTOTUNE = tf.data.AUTOTUNE
@@ -68,14 +130,10 @@ def random_messages_dataset(length, batch=256, prefetch=1024 ** 2, seed=None):
         AUTOTUNE = tf.data.experimental.AUTOTUNE
 
     dataset = (
-        tf.data.Dataset.from_tensors(tf.zeros(shape=(length,), dtype=tf.float32))
-        .repeat(count=None)
-        .batch(batch)  # Apply batch before mapping for vectorizing the mapping
+        batch_indices(start, step)
         .map(
-            lambda x: x
-            + tf.cast(
-                rng.uniform(shape=tf.shape(x), minval=0, maxval=2, dtype=tf.int32),
-                dtype=tf.float32,
+            lambda batch_index: tf.cast(
+                uniform_batch((batch, length), seed, batch_index, 2), dtype=tf.float32
             ),
             num_parallel_calls=AUTOTUNE,
         )
@@ -85,22 +143,24 @@ def random_messages_dataset(length, batch=256, prefetch=1024 ** 2, seed=None):
     return dataset
 
 
-def random_messages_base_dataset(length, batch=256, prefetch=1024 ** 2, seed=None):
+def random_messages_base_dataset(
+    length, batch=256, prefetch=1024 ** 2, seed=None, start=0, step=1
+):
     """generate random bases of the sequences of bits of length `length`, e.g. [0,...,0,1,0,...,0] as dataset
 
     Args:
         length (tf.int32): length of bits sequences
         batch (tf.int32, optional): batch size. Defaults to 256.
         prefetch (tf.int32, optional): count of pre-generated sequences. Defaults to 1024**2.
-        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, retrieve global generator.
+        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, drawn from the global generator.
+        start (tf.int64, optional): index of the first batch (e.g. resumed generation). Defaults to 0.
+        step (tf.int64, optional): step between the batch indices (e.g. sharded generation, the shard index being
+            `start` and the number of shards `step`). Defaults to 1.
 
     Returns:
         [type]: [description]
     """
-    if seed is None:
-        rng = tf.random.get_global_generator()
-    else:
-        rng = tf.random.Generator.from_seed(seed)
+    seed = dataset_seed(seed)
     base = tf.eye(length, dtype=tf.float32)
 
     try:
@@ -109,17 +169,11 @@ def random_messages_base_dataset(length, batch=256, prefetch=1024 ** 2, seed=Non
         AUTOTUNE = tf.data.experimental.AUTOTUNE
 
     dataset = (
-        tf.data.Dataset.from_tensors(tf.zeros(shape=(length,), dtype=tf.float32))
-        .repeat(count=None)
-        .batch(batch)  # Apply batch before mapping for vectorizing the mapping
+        batch_indices(start, step)
         .map(
-            lambda x: x
-            + tf.gather(
-                base,
-                rng.uniform(
-                    shape=(1, tf.shape(x)[0]), minval=0, maxval=length, dtype=tf.int32
-                ),
-            )[0],
+            lambda batch_index: tf.gather(
+                base, uniform_batch((batch,), seed, batch_index, length)
+            ),
             num_parallel_calls=AUTOTUNE,
         )
         .map(lambda x: (x, x), num_parallel_calls=AUTOTUNE)
@@ -156,7 +210,7 @@ def all_zero_dataset(length, batch=256, prefetch=1024 ** 2):
 
 
 def random_messages_base_all_zero_all_one_dataset(
-    length, batch=256, prefetch=1024 ** 2, seed=None
+    length, batch=256, prefetch=1024 ** 2, seed=None, start=0, step=1
 ):
     """generate random bases of the sequences of bits of length `length`, e.g. [0,...,0,1,0,...,0]
     also including the all-zero and all-one sequences as dataset
@@ -165,15 +219,15 @@ def random_messages_base_all_zero_all_one_dataset(
         length (tf.int32): length of bits sequences
         batch (tf.int32, optional): batch size. Defaults to 256.
         prefetch (tf.int32, optional): count of pre-generated sequences. Defaults to 1024**2.
-        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, retrieve global generator.
+        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, drawn from the global generator.
+        start (tf.int64, optional): index of the first batch (e.g. resumed generation). Defaults to 0.
+        step (tf.int64, optional): step between the batch indices (e.g. sharded generation, the shard index being
+            `start` and the number of shards `step`). Defaults to 1.
 
     Returns:
         [type]: [description]
     """
-    if seed is None:
-        rng = tf.random.get_global_generator()
-    else:
-        rng = tf.random.Generator.from_seed(seed)
+    seed = dataset_seed(seed)
     words = tf.concat(
         [
             tf.zeros(shape=[1, length]),
@@ -189,23 +243,77 @@ def random_messages_base_all_zero_all_one_dataset(
         AUTOTUNE = tf.data.experimental.AUTOTUNE
 
     dataset = (
-        tf.data.Dataset.from_tensors(tf.zeros(shape=(length,), dtype=tf.float32))
-        .repeat(count=None)
-        .batch(batch)  # Apply batch before mapping for vectorizing the mapping
+        batch_indices(start, step)
         .map(
-            lambda x: x
-            + tf.gather(
-                words,
-                rng.uniform(
-                    shape=(1, tf.shape(x)[0]),
-                    minval=0,
-                    maxval=length + 2,
-                    dtype=tf.int32,
-                ),
-            )[0],
+            lambda batch_index: tf.gather(
+                words, uniform_batch((batch,), seed, batch_index, length + 2)
+            ),
             num_parallel_calls=AUTOTUNE,
         )
         .map(lambda x: (x, x), num_parallel_calls=AUTOTUNE)  # .cache()
         .prefetch(prefetch)
     )
     return dataset
+
+
+def random_messages_snr_dataset(
+    length,
+    n_snr,
+    batch=256,
+    prefetch=1024 ** 2,
+    seed=None,
+    all_zero=False,
+    start=0,
+    step=1,
+):
+    """generate random sequences of bits of length `length` tagged with an SNR index as dataset, the samples of each
+    batch being evenly spread over the `n_snr` SNR indices (sample i of a batch has the index i % n_snr). Each batch
+    also carries the stateless key of its channel noise (see channels.AWGN), the noise of a sample is then given by
+    (seed, SNR index, batch index) and any batch of an evaluation can be regenerated independently.
+
+    Args:
+        length (tf.int32): length of bits sequences
+        n_snr (tf.int32): number of SNR indices
+        batch (tf.int32, optional): batch size. Defaults to 256.
+        prefetch (tf.int32, optional): count of pre-generated sequences. Defaults to 1024**2.
+        seed (tf.int64|none, optional): generator's seed. Defaults to None. If None, drawn from the global generator.
+        all_zero (bool, optional): generate zero sequences (see all_zero_dataset). Defaults to False.
+        start (tf.int64, optional): index of the first batch (e.g. resumed generation). Defaults to 0.
+        step (tf.int64, optional): step between the batch indices (e.g. sharded generation, the shard index being
+            `start` and the number of shards `step`). Defaults to 1.
+
+    Returns:
+        tf.data.Dataset: dataset of ((messages, SNR indices, noise key), messages)
+    """
+    seed = dataset_seed(seed)
+
+    try:
+        AUTOTUNE = tf.data.AUTOTUNE
+    except:
+        AUTOTUNE = tf.data.experimental.AUTOTUNE
+
+    snr_indices = tf.range(batch, dtype=tf.int32) % n_snr
+
+    def messages(batch_index):
+        if all_zero:
+            return tf.zeros(shape=(batch, length), dtype=tf.float32)
+        return tf.cast(
+            uniform_batch((batch, length), seed, batch_index, 2), dtype=tf.float32
+        )
+
+    dataset = (
+        batch_indices(start, step)
+        .map(
+            lambda batch_index: (
+                messages(batch_index),
+                batch_seed(seed, batch_index, NOISE_STREAM),
+            ),
+            num_parallel_calls=AUTOTUNE,
+        )
+        .map(
+            lambda x, noise_seed: ((x, snr_indices, noise_seed), x),
+            num_parallel_calls=AUTOTUNE,
+        )
+        .prefetch(prefetch)
+    )
+    return dataset
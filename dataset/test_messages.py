@@ -17,7 +17,13 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTI
 import pytest
 
 import tensorflow as tf
-from . import random_messages, random_messages_dataset, random_messages_base_dataset
+from . import (
+    random_messages,
+    random_messages_dataset,
+    random_messages_base_dataset,
+    random_messages_base_all_zero_all_one_dataset,
+    random_messages_snr_dataset,
+)
 
 
 def test_messages_shape():
@@ -68,5 +74,63 @@ def test_random_messages_base_dataset():
     assert all(tf.reduce_max(ones_count, axis=-1) == 1)
 
 
+def test_random_messages_snr_dataset():
+    dataset = random_messages_snr_dataset(8, 3, batch=10, seed=1)
+    ((messages, snr_indices, noise_seed), labels) = next(dataset.as_numpy_iterator())
+    assert messages.shape == (10, 8)
+    assert noise_seed.shape == (2,)
+    tf.debugging.assert_equal(messages, labels)
+    tf.debugging.assert_equal(snr_indices, tf.range(10) % 3)
+
+    dataset = random_messages_snr_dataset(8, 3, batch=10, all_zero=True)
+    ((messages, _, _), _) = next(dataset.as_numpy_iterator())
+    tf.debugging.assert_equal(messages, tf.zeros([10, 8]))
+
+
+@pytest.mark.parametrize(
+    "dataset_fn",
+    [
+        random_messages_dataset,
+        random_messages_base_dataset,
+        random_messages_base_all_zero_all_one_dataset,
+        lambda length, **kwargs: random_messages_snr_dataset(length, 3, **kwargs),
+    ],
+)
+def test_dataset_stateless_batches(dataset_fn):
+    def batches(dataset, count):
+        return [tf.nest.flatten(x) for x in dataset.take(count)]
+
+    reference = batches(dataset_fn(8, batch=10, seed=7), 6)
+    # Seed repeatability
+    tf.nest.map_structure(
+        tf.debugging.assert_equal,
+        batches(dataset_fn(8, batch=10, seed=7), 6),
+        reference,
+    )
+    # Resumed generation
+    tf.nest.map_structure(
+        tf.debugging.assert_equal,
+        batches(dataset_fn(8, batch=10, seed=7, start=4), 2),
+        reference[4:],
+    )
+    # Sharded generation
+    tf.nest.map_structure(
+        tf.debugging.assert_equal,
+        batches(dataset_fn(8, batch=10, seed=7, start=1, step=2), 3),
+        reference[1::2],
+    )
+    # Different batches
+    assert not tf.reduce_all(reference[0][0] == reference[1][0])
+
+
+def test_random_messages_dataset_deterministic_parallel_maps():
+    dataset = random_messages_dataset(8, batch=10, seed=7)
+    options = tf.data.Options()
+    options.deterministic = False
+    unordered = dataset.with_options(options)
+    reference = sorted(x[0].numpy().tobytes() for x in dataset.take(20))
+    assert sorted(x[0].numpy().tobytes() for x in unordered.take(20)) == reference
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -18,7 +18,15 @@ FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR C
 IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
 """
 
+from .code_structure import CodeStructure, get_code_structure
 from .bp import GatedNeuralBeliefPropagationRNNCell
+from .sparse_bp import SparseGatedNeuralBeliefPropagationRNNCell
 from .min_distance_decoding import MinDistanceDecoder
-from .decoder import Decoder, DecoderA, DecoderStandardBP
+from .trellis_decoding import TrellisDecoder, get_ml_decoder, ml_decoder_algorithm
+from .osd_decoding import OrderedStatisticsDecoder
+from .syndrome_decoding import SyndromeDecoder
+from .chase_decoding import ChaseDecoder
+from .decoder import Decoder, DecoderA, DecoderStandardBP, HybridDecoder
 from .reference_decoder.sum_product_algorithm import SumProduct, MinSum, FactorGraph
+from .reference_decoder.batch_factor_graph import BatchFactorGraph
+from .reference_decoder.parallel_decoding import ParallelFactorGraphDecoder
@@ -24,6 +24,8 @@ from activations import (
     AtanhActivation,
 )
 from regularizers import L2WeightRegularizer
+from .check_node import CHECK_NODE_ALGORITHMS, extrinsic_product, extrinsic_min_sum
+from .code_structure import get_code_structure, factor_graph_gates
 
 
 class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
@@ -32,14 +34,47 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
         n_variable_nodes,
         n_check_nodes,
         trainable=True,
+        check_node_update="prefix",
+        algorithm="sum-product",
+        trainable_min_sum_factors=None,
+        normalization_factor=0.8,
+        offset_factor=0.3,
+        H=None,
         **kwargs,
     ):
 
         super(GatedNeuralBeliefPropagationRNNCell, self).__init__(**kwargs)
 
+        if check_node_update not in ["prefix", "repeat"]:
+            raise ValueError(f"Unknown check node update '{check_node_update}'")
+        if algorithm not in CHECK_NODE_ALGORITHMS:
+            raise ValueError(f"Unknown check node algorithm '{algorithm}'")
+
         self.n_variable_nodes = n_variable_nodes
         self.n_check_nodes = n_check_nodes
-        self.trainable = trainable
+        # Fixed code: the gates are precompiled once per distinct H and the constants (H) are
+        # ignored, otherwise they are derived from the constants (trainable code)
+        self.code_structure = None if H is None else get_code_structure(H)
+        # "sum-product": tanh/atanh check node update
+        # "min-sum", "normalized-min-sum", "offset-min-sum": sign/minimum check node update,
+        # scaled (resp. shifted) by per-edge factors for the normalized (resp. offset) variant
+        self.algorithm = algorithm
+        self.normalization_factor = normalization_factor
+        self.offset_factor = offset_factor
+        # The min-sum factors can be trained while the factor graph weights are frozen (standard BP)
+        self.factor_graph_trainable = trainable
+        self.min_sum_factors_trainable = (
+            trainable
+            if trainable_min_sum_factors is None
+            else trainable_min_sum_factors
+        )
+        self.trainable = trainable or (
+            self.min_sum_factors_trainable
+            and algorithm in ["normalized-min-sum", "offset-min-sum"]
+        )
+        # "prefix": extrinsic products from forward/backward cumulative products (linear in n)
+        # "repeat": legacy extrinsic products from a repeated [m*n, n-1] tensor (quadratic in n)
+        self.check_node_update = check_node_update
         self.state_size = tf.TensorShape([n_variable_nodes * n_check_nodes])
         self.output_size = tf.TensorShape([n_variable_nodes])
         self.atanh_activation_layer_eval = AtanhActivation()
@@ -52,7 +87,7 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
             initializer=tf.keras.initializers.Constant(1.0),
             regularizer=L2WeightRegularizer(alpha=5e-2, mean=1),
             name="factor_graph_weights_sum",
-            trainable=self.trainable,
+            trainable=self.factor_graph_trainable,
         )
 
         self.factor_graph_weights_prod = tf.ones(
@@ -65,9 +100,25 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
             initializer=tf.keras.initializers.Constant(1.0),
             regularizer=L2WeightRegularizer(alpha=5e-2, mean=1),
             name="factor_graph_weights_out",
-            trainable=self.trainable,
+            trainable=self.factor_graph_trainable,
         )
 
+        if self.algorithm == "normalized-min-sum":
+            self.factor_graph_weights_normalization = self.add_weight(
+                shape=(self.n_check_nodes * self.n_variable_nodes,),
+                initializer=tf.keras.initializers.Constant(self.normalization_factor),
+                name="factor_graph_weights_normalization",
+                trainable=self.min_sum_factors_trainable,
+            )
+
+        if self.algorithm == "offset-min-sum":
+            self.factor_graph_weights_offset = self.add_weight(
+                shape=(self.n_check_nodes * self.n_variable_nodes,),
+                initializer=tf.keras.initializers.Constant(self.offset_factor),
+                name="factor_graph_weights_offset",
+                trainable=self.min_sum_factors_trainable,
+            )
+
         self.input_weights = tf.ones(
             shape=(self.n_variable_nodes), name="SP_input_weights"
         )
@@ -79,29 +130,28 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
         ## constants
         llr = inputs
 
-        H = constants
-        # H = differentiable_step_function(H)
-
-        factor_graph_gate = tf.reshape(
-            H,
-            [
-                self.n_check_nodes * self.n_variable_nodes,
-            ],
-        )
+        if self.code_structure is not None:
+            # Fixed code: precompiled gates
+            factor_graph_gate = self.code_structure.factor_graph_gate
+            prod_gate_weights = self.code_structure.prod_gate_weights
+            prod_gate_bias = self.code_structure.prod_gate_bias
+        else:
+            constants = tf.nest.flatten(constants)
+            if len(constants) > 1:
+                # Gates computed once per decoding by the decoder (see cell_constants)
+                (factor_graph_gate, prod_gate_weights, prod_gate_bias) = constants[1:4]
+            else:
+                H = tf.reshape(
+                    constants[0], [self.n_check_nodes, self.n_variable_nodes]
+                )
+                # H = differentiable_step_function(H)
+                (factor_graph_gate, prod_gate_weights, prod_gate_bias) = (
+                    factor_graph_gates(H)
+                )
 
         sum_gate = factor_graph_gate
         sum_weights = self.factor_graph_weights_sum
 
-        reshaped_factor_graph_gate = factor_graph_gate
-        reshaped_factor_graph_gate = tf.reshape(
-            reshaped_factor_graph_gate, [self.n_check_nodes, self.n_variable_nodes]
-        )
-        reshaped_factor_graph_gate = tf.reverse(reshaped_factor_graph_gate, axis=[-2])
-        reshaped_factor_graph_gate = tf.reshape(
-            reshaped_factor_graph_gate, [self.n_check_nodes * self.n_variable_nodes]
-        )
-        prod_gate_weights = reshaped_factor_graph_gate
-        prod_gate_bias = 1 - reshaped_factor_graph_gate
         prod_weights = self.factor_graph_weights_prod
 
         out_gate = factor_graph_gate
@@ -141,6 +191,10 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
         # Weights
         x = tf.multiply(x, prod_weights)
 
+        if self.algorithm != "sum-product":
+            new_states = self._min_sum_check_node_update(x, factor_graph_gate)
+            return self._output(llr, new_states, out_weights, out_gate)
+
         # TANH[sum(x)/2]
         x = tf.tanh(x / 2)
 
@@ -150,24 +204,34 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
         # RESHAPE
         x = tf.reshape(x, [-1, self.n_check_nodes, self.n_variable_nodes])
 
-        # REPEAT
-        x = tf.repeat(x, (self.n_variable_nodes - 1), axis=-2)
+        if self.check_node_update == "prefix":
+            # EXTRINSIC PRODUCTS
+            x = extrinsic_product(x, axis=-1)
 
-        # RESHAPE
-        x = tf.reshape(
-            x,
-            [
-                -1,
-                self.n_check_nodes * self.n_variable_nodes,
-                (self.n_variable_nodes - 1),
-            ],
-        )
+            # REVERSE (check nodes)
+            x = tf.reverse(x, axis=[-2])
+
+            # RESHAPE
+            x = tf.reshape(x, [-1, self.n_check_nodes * self.n_variable_nodes])
+        else:
+            # REPEAT
+            x = tf.repeat(x, (self.n_variable_nodes - 1), axis=-2)
 
-        # REDUCE PROD
-        x = tf.reduce_prod(x, axis=-1)
+            # RESHAPE
+            x = tf.reshape(
+                x,
+                [
+                    -1,
+                    self.n_check_nodes * self.n_variable_nodes,
+                    (self.n_variable_nodes - 1),
+                ],
+            )
 
-        # REVERSE
-        x = tf.reverse(x, axis=[-1])
+            # REDUCE PROD
+            x = tf.reduce_prod(x, axis=-1)
+
+            # REVERSE
+            x = tf.reverse(x, axis=[-1])
 
         # 2*ARCTANH
         """
@@ -180,6 +244,37 @@ class GatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
 
         new_states = tf.reshape(x, [1, -1, self.n_check_nodes * self.n_variable_nodes])
 
+        return self._output(llr, new_states, out_weights, out_gate)
+
+    def _min_sum_check_node_update(self, x, factor_graph_gate):
+        # RESHAPE and REVERSE (check nodes) back to the H layout
+        x = tf.reshape(x, [-1, self.n_check_nodes, self.n_variable_nodes])
+        x = tf.reverse(x, axis=[-2])
+
+        normalization = None
+        offset = None
+        if self.algorithm == "normalized-min-sum":
+            normalization = tf.reshape(
+                self.factor_graph_weights_normalization,
+                [self.n_check_nodes, self.n_variable_nodes],
+            )
+        elif self.algorithm == "offset-min-sum":
+            offset = tf.reshape(
+                self.factor_graph_weights_offset,
+                [self.n_check_nodes, self.n_variable_nodes],
+            )
+
+        # SIGN x MIN
+        x = extrinsic_min_sum(
+            x,
+            tf.reshape(factor_graph_gate, [self.n_check_nodes, self.n_variable_nodes]),
+            normalization=normalization,
+            offset=offset,
+        )
+
+        return tf.reshape(x, [1, -1, self.n_check_nodes * self.n_variable_nodes])
+
+    def _output(self, llr, new_states, out_weights, out_gate):
         ############################ OUTPUT ##########################################
         # Weights
         weighted_new_states_out = tf.multiply(new_states, out_weights)
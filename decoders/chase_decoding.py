@@ -0,0 +1,113 @@
+"""
+Chase Decoder
+
+Brief: Batched Chase-II soft-decision decoder: hard decoding (syndrome lookup) of the test patterns flipping the least reliable positions
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from .syndrome_decoding import SyndromeDecoder
+
+
+def flip_patterns(n_flips):
+    """[2^n_flips, n_flips] flips of the test patterns (binary decomposition of the pattern index, LSB first)"""
+    indices = np.arange(2**n_flips)[:, None]
+    return ((indices >> np.arange(n_flips)) & 1).astype(np.float32)
+
+
+class ChaseDecoder(tf.keras.Model):
+    """
+    Chase-II decoder: the hard decisions are perturbed by the 2^n_flips patterns of flips of the n_flips least
+    reliable positions (lowest |LLR|), every test word is decoded by a hard-decision decoder (syndrome lookup, see
+    SyndromeDecoder) in one batch, and the candidate codeword of maximal correlation with the LLRs is selected.
+
+    The cost is tuned by n_flips: 0 is hard-decision decoding, n_flips = n is ML decoding.
+
+    Args:
+        n (int): codewords length
+        k (int): number of information bits
+        H ([n-k x n] array) [default=None]: parity-check matrix (the syndrome table is otherwise built at the first call)
+        n_flips (int) [default=3]: number of least reliable positions flipped by the test patterns
+        return_words (bool) [default=True]: return the decoded information words, i.e. the first k bits of the
+            codewords (systematic code), or the codewords (False)
+        cache_dir (str) [default=None]: directory of the syndrome table cache files
+    """
+
+    # Symmetric decoder (soft metrics of the codewords translated by any codeword are permuted, ties have probability 0)
+    symmetric = True
+
+    def __init__(
+        self,
+        n,
+        k,
+        H=None,
+        n_flips=3,
+        return_words=True,
+        cache_dir=None,
+        **kwargs,
+    ):
+        super(ChaseDecoder, self).__init__(**kwargs)
+        if not 0 <= n_flips <= n:
+            raise ValueError(f"n_flips must be between 0 and n={n}, got {n_flips}")
+        self.n = n
+        self.k = k
+        self.n_flips = n_flips
+        self.return_words = return_words
+        self.hard_decoder = SyndromeDecoder(
+            n, k, H=H, return_words=False, cache_dir=cache_dir
+        )
+        with tf.init_scope():
+            self.patterns = tf.constant(flip_patterns(n_flips))
+
+    def call(self, inputs, training=False):
+        noisy_symbols, G, H, sigma2 = inputs
+        if not self.hard_decoder.table_generated:
+            self.hard_decoder.init_table(H)
+
+        noisy_symbols = tf.cast(noisy_symbols, dtype=tf.float32)
+        llrs = (-1.0) * 4.0 * noisy_symbols / sigma2
+        codewords = self.decode(llrs)
+        if self.return_words:
+            return codewords[:, : self.k]
+        return codewords
+
+    def decode(self, llrs):
+        """
+        Args:
+            llrs ([batch, n] tensor): channel LLRs
+
+        Returns:
+            [batch, n] tensor: decoded codewords
+        """
+        batch_size = tf.shape(llrs)[0]
+        n_patterns = 2**self.n_flips
+        hard_decisions = tf.cast(llrs < 0, tf.float32)
+
+        # [batch, 2^n_flips, n] test words
+        _, positions = tf.math.top_k(-tf.abs(llrs), k=self.n_flips)
+        flips = tf.einsum("pj,bjn->bpn", self.patterns, tf.one_hot(positions, self.n))
+        test_words = tf.abs(tf.expand_dims(hard_decisions, axis=1) - flips)
+
+        # Hard decoding of all the test words in one batch
+        candidates = self.hard_decoder.decode(tf.reshape(test_words, [-1, self.n]))
+        candidates = tf.reshape(candidates, [batch_size, n_patterns, self.n])
+
+        # Maximal correlation between the LLRs and the BPSK candidates (on ties, the first pattern is kept)
+        correlations = tf.einsum("bn,bpn->bp", llrs, 1.0 - 2.0 * candidates)
+        best = tf.argmax(correlations, axis=-1, output_type=tf.int32)
+        return tf.gather(candidates, best, batch_dims=1)
@@ -0,0 +1,93 @@
+"""
+Check Node Updates
+
+Brief: Check node (leave-one-out) operations shared by the dense and sparse GNBP RNN Cells
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import tensorflow as tf
+
+# Check node update rules supported by the GNBP RNN cells
+CHECK_NODE_ALGORITHMS = [
+    "sum-product",
+    "min-sum",
+    "normalized-min-sum",
+    "offset-min-sum",
+]
+
+
+def extrinsic_product(x, axis=-1):
+    """
+    Leave-one-out products along `axis`: the i-th output is the product of all the inputs but the i-th one.
+
+    The products are obtained from the exclusive forward and backward cumulative products so that the
+    cost is linear in the size of `axis` (no [.., d, d-1] intermediate) and no division is needed, which
+    keeps the result exact when some inputs are 0. The operation is differentiable.
+
+    Args:
+        x (tf.Tensor): input values, e.g. tanh(x/2) messages of the edges of a check node
+        axis (int) [default=-1]: dimension over which the products are computed
+
+    Returns:
+        tf.Tensor: extrinsic products, same shape as `x`
+    """
+    forward = tf.math.cumprod(x, axis=axis, exclusive=True)
+    backward = tf.math.cumprod(x, axis=axis, exclusive=True, reverse=True)
+    return forward * backward
+
+
+def extrinsic_min_sum(x, mask, normalization=None, offset=None):
+    """
+    Leave-one-out min-sum check node update along the last axis: the i-th output is the product of the
+    signs times the minimum magnitude of all the inputs but the i-th one.
+
+    The minimum over the other inputs is obtained from the two smallest magnitudes of each check node
+    (linear cost). Checks with a single edge carry no extrinsic information and output 0.
+
+    Args:
+        x (tf.Tensor): variable to check messages, the check nodes edges being along the last axis
+        mask (tf.Tensor): 1 for the actual edges of the check nodes and 0 for the entries to be ignored (broadcastable to x)
+        normalization (tf.Tensor) [default=None]: multiplicative factor applied to the messages (normalized min-sum)
+        offset (tf.Tensor) [default=None]: offset subtracted from the messages magnitudes (offset min-sum)
+
+    Returns:
+        tf.Tensor: check to variable messages, same shape as `x`
+    """
+    mask = tf.cast(mask, dtype=tf.bool) & tf.ones_like(x, dtype=tf.bool)
+    infinity = tf.constant(float("inf"), dtype=x.dtype)
+
+    # Signs
+    signs = tf.where(mask & (x < 0), -tf.ones_like(x), tf.ones_like(x))
+    signs = tf.reduce_prod(signs, axis=-1, keepdims=True) * signs
+
+    # Two smallest magnitudes
+    magnitudes = tf.where(mask, tf.abs(x), infinity)
+    first_min = tf.reduce_min(magnitudes, axis=-1, keepdims=True)
+    is_first_min = tf.cast(
+        tf.one_hot(tf.argmin(magnitudes, axis=-1), tf.shape(x)[-1]), dtype=tf.bool
+    )
+    second_min = tf.reduce_min(
+        tf.where(is_first_min, infinity, magnitudes), axis=-1, keepdims=True
+    )
+    magnitudes = tf.where(is_first_min, second_min, first_min)
+    magnitudes = tf.where(tf.math.is_inf(magnitudes), tf.zeros_like(x), magnitudes)
+
+    if normalization is not None:
+        magnitudes = normalization * magnitudes
+    if offset is not None:
+        magnitudes = tf.nn.relu(magnitudes - offset)
+
+    return signs * magnitudes
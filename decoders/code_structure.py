@@ -0,0 +1,178 @@
+"""
+Code Structure
+
+Brief: Precompiled (and cached per parity-check matrix) structure of a code used by the GNBP RNN Cells
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import hashlib
+
+import numpy as np
+import tensorflow as tf
+
+# Code structures already computed, indexed by the hash of the parity-check matrix content
+_code_structures = {}
+
+
+def code_structure_key(H):
+    """content hash (shape and values) of a parity-check matrix"""
+    H = np.ascontiguousarray(H, dtype=np.float32)
+    return hashlib.sha1(str(H.shape).encode() + H.tobytes()).hexdigest()
+
+
+def get_code_structure(H):
+    """
+    Cached CodeStructure of a fixed parity-check matrix: it is computed once per distinct H
+    (content hash) and shared by all the cells and decoders using the same code.
+
+    Args:
+        H ([n-k x n] array or tensor): parity-check matrix
+
+    Returns:
+        CodeStructure: the precompiled structure of H
+    """
+    H = np.array(H, dtype=np.float32)
+    key = code_structure_key(H)
+    if key not in _code_structures:
+        _code_structures[key] = CodeStructure(H)
+    return _code_structures[key]
+
+
+def check_code_structure(code_structure, H):
+    """
+    Check that the parity-check matrix provided at call is the fixed H of the precompiled structure of a cell: the
+    content hash is compared when H has a value (eager tensor or array), the values are compared in the graph
+    otherwise.
+
+    Args:
+        code_structure (CodeStructure): precompiled structure of the fixed H
+        H ([n-k x n] tensor or array): parity-check matrix provided at call
+
+    Returns:
+        H, with a dependency on the in-graph comparison when it is symbolic
+
+    Raises:
+        ValueError: H differs from the fixed parity-check matrix
+    """
+    message = (
+        "The parity-check matrix provided at call differs from the fixed parity-check matrix of the decoder "
+        "(H given at construction)"
+    )
+    shape = H.shape if tf.is_tensor(H) else np.shape(H)
+    if not tf.TensorShape(shape).is_compatible_with(code_structure.H.shape):
+        raise ValueError(message)
+    value = tf.get_static_value(H)
+    if value is not None:
+        if code_structure_key(value) != code_structure.key:
+            raise ValueError(message)
+        return H
+    assertion = tf.debugging.assert_equal(
+        tf.cast(H, tf.float32), tf.constant(code_structure.H), message=message
+    )
+    with tf.control_dependencies([assertion]):
+        return tf.identity(H)
+
+
+def factor_graph_gates(H):
+    """
+    Gates of the dense GNBP RNN cell derived from H.
+
+    Args:
+        H ([n-k x n] tensor): parity-check matrix
+
+    Returns:
+        factor_graph_gate ([(n-k)*n] tensor): flattened H (sum and output gates)
+        prod_gate_weights ([(n-k)*n] tensor): flattened H with reversed check nodes (product gate)
+        prod_gate_bias ([(n-k)*n] tensor): 1 - prod_gate_weights
+    """
+    factor_graph_gate = tf.reshape(H, [-1])
+    prod_gate_weights = tf.reshape(tf.reverse(H, axis=[-2]), [-1])
+    prod_gate_bias = 1 - prod_gate_weights
+    return factor_graph_gate, prod_gate_weights, prod_gate_bias
+
+
+class CodeStructure:
+    """
+    Precompiled structure of a fixed parity-check matrix, used by the GNBP RNN cells instead of
+    deriving it from H at every iteration:
+    - the gates of the dense cell (see factor_graph_gates)
+    - the edge lists and check node layouts of the sparse (Tanner graph) cell
+
+    Use get_code_structure(H) to benefit from the cache.
+
+    Args:
+        H ([n-k x n] array): parity-check matrix
+    """
+
+    def __init__(self, H):
+        H = np.array(H, dtype=np.float32)
+        self.H = H
+        (self.n_check_nodes, self.n_variable_nodes) = H.shape
+        self.key = code_structure_key(H)
+
+        # Edges sorted by check node then by variable node
+        (check_indices, variable_indices) = np.nonzero(H)
+        self.n_edges = len(check_indices)
+        edge_indices = check_indices * self.n_variable_nodes + variable_indices
+
+        # For each edge, the other edges of its check node (padded with the index
+        # n_edges which points to a neutral element appended to the messages)
+        check_degrees = np.bincount(check_indices, minlength=self.n_check_nodes)
+        self.max_degree = max(int(np.max(check_degrees)), 2)
+        extrinsic_indices = np.full(
+            (self.n_edges, self.max_degree - 1), self.n_edges, dtype=np.int32
+        )
+        first_edge = np.concatenate([[0], np.cumsum(check_degrees)])
+        for c in range(self.n_check_nodes):
+            edges = np.arange(first_edge[c], first_edge[c + 1])
+            for e in edges:
+                others = edges[edges != e]
+                extrinsic_indices[e, : len(others)] = others
+
+        # Check node layout: [n_check_nodes, max_degree] edge indices (padded with n_edges)
+        # and position of each edge in the flattened layout
+        check_layout_indices = np.full(
+            (self.n_check_nodes, self.max_degree), self.n_edges, dtype=np.int32
+        )
+        positions = np.arange(self.n_edges) - first_edge[check_indices]
+        check_layout_indices[check_indices, positions] = np.arange(self.n_edges)
+        edge_layout_positions = check_indices * self.max_degree + positions
+
+        # Dense weight index of each entry of the check node layout (the padding entries,
+        # which are discarded, point to the first weight)
+        check_layout_weight_indices = np.append(edge_indices, 0)[check_layout_indices]
+
+        # Eager constants, usable from any (tf.function) graph
+        with tf.init_scope():
+            (
+                self.factor_graph_gate,
+                self.prod_gate_weights,
+                self.prod_gate_bias,
+            ) = factor_graph_gates(tf.constant(H))
+
+            self.check_indices = tf.constant(check_indices, dtype=tf.int32)
+            self.variable_indices = tf.constant(variable_indices, dtype=tf.int32)
+            self.edge_indices = tf.constant(edge_indices, dtype=tf.int32)
+            self.extrinsic_indices = tf.constant(extrinsic_indices, dtype=tf.int32)
+            self.check_layout_indices = tf.constant(
+                check_layout_indices, dtype=tf.int32
+            )
+            self.edge_layout_positions = tf.constant(
+                edge_layout_positions, dtype=tf.int32
+            )
+            self.check_layout_weight_indices = tf.constant(
+                check_layout_weight_indices, dtype=tf.int32
+            )
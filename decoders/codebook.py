@@ -0,0 +1,204 @@
+"""
+Packed codebook
+
+Brief: Codebooks of linear block codes generated with integer bit operations, stored as bit-packed 64 bits words,
+cached per generator matrix (in memory and optionally on disk) and popcount based Hamming distances
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import tensorflow as tf
+
+# Bits per packed word
+WORD_BITS = 64
+
+# Packed codebooks already computed, indexed by the hash of the generator matrix content
+_packed_codebooks = {}
+
+
+def generator_key(G):
+    """content hash (shape and binary values) of a generator matrix"""
+    G = np.ascontiguousarray(np.array(G) % 2, dtype=np.uint8)
+    return hashlib.sha1(str(G.shape).encode() + G.tobytes()).hexdigest()
+
+
+def pack_bits(bits):
+    """
+    Pack binary vectors: bit j is the bit j % 64 of the word j // 64.
+
+    Args:
+        bits ([N x n] array): binary vectors
+
+    Returns:
+        [N x ceil(n / 64)] uint64 array
+    """
+    bits = np.array(bits, dtype=np.uint64) % 2
+    (N, n) = bits.shape
+    n_words = -(-n // WORD_BITS)
+    padded = np.zeros((N, n_words * WORD_BITS), dtype=np.uint64)
+    padded[:, :n] = bits
+    shifts = np.arange(WORD_BITS, dtype=np.uint64)
+    return np.bitwise_or.reduce(
+        padded.reshape(N, n_words, WORD_BITS) << shifts, axis=-1
+    )
+
+
+def unpack_bits(packed, n):
+    """[N x n] uint8 binary vectors of the [N x ceil(n / 64)] packed vectors (see pack_bits)"""
+    positions = np.arange(n)
+    words = np.array(packed, dtype=np.uint64)[:, positions // WORD_BITS]
+    return ((words >> (positions % WORD_BITS).astype(np.uint64)) & 1).astype(np.uint8)
+
+
+def build_packed_codebook(G):
+    """
+    Codebook of the code generated by G, with integer bit operations only: the codeword of index u is the XOR
+    of the rows i of G such that the bit i of u is 1 (i.e. uG with u the binary decomposition of the index, LSB
+    first), built by doubling: C[2^i : 2^(i+1)] = C[: 2^i] ^ G[i].
+
+    Args:
+        G ([k x n] array): generator matrix
+
+    Returns:
+        [2^k x ceil(n / 64)] uint64 array: packed codewords
+    """
+    G = np.array(G) % 2
+    (k, n) = G.shape
+    rows = pack_bits(G)
+    codebook = np.zeros((2**k, rows.shape[1]), dtype=np.uint64)
+    for i in range(k):
+        codebook[2**i : 2 ** (i + 1)] = codebook[: 2**i] ^ rows[i]
+    return codebook
+
+
+def get_packed_codebook(G, cache_dir=None):
+    """
+    Cached packed codebook of G: it is computed once per distinct G (content hash) and process. With a cache
+    directory, it is also saved to (and memory-mapped from) the file codebook_<hash>.npy, reused by the next
+    processes.
+
+    Args:
+        G ([k x n] array): generator matrix
+        cache_dir (str) [default=None]: directory of the codebook files
+
+    Returns:
+        [2^k x ceil(n / 64)] uint64 array: packed codewords (see build_packed_codebook)
+    """
+    key = generator_key(G)
+    if key not in _packed_codebooks:
+        if cache_dir is None:
+            _packed_codebooks[key] = build_packed_codebook(G)
+        else:
+            path = os.path.join(cache_dir, f"codebook_{key}.npy")
+            if not os.path.isfile(path):
+                os.makedirs(cache_dir, exist_ok=True)
+                # Atomic write: concurrent studies never read a partial file
+                temporary_path = f"{path}.{os.getpid()}.tmp.npy"
+                np.save(temporary_path, build_packed_codebook(G))
+                os.replace(temporary_path, path)
+            _packed_codebooks[key] = np.load(path, mmap_mode="r")
+    return _packed_codebooks[key]
+
+
+def minimum_weight_codewords(G, cache_dir=None, chunk_size=2**16):
+    """
+    Non-zero codewords of minimal Hamming weight of the code generated by G (e.g. the mean translations of the
+    importance sampling channel, see channels.ImportanceSamplingAWGN), from the packed codebook.
+
+    Args:
+        G ([k x n] array): generator matrix
+        cache_dir (str) [default=None]: directory of the codebook files (see get_packed_codebook)
+        chunk_size (int) [default=2**16]: number of codewords weighted at once
+
+    Returns:
+        [N x n] uint8 array: minimum weight codewords
+    """
+    n = np.array(G).shape[1]
+    codebook = get_packed_codebook(G, cache_dir)
+    weights = np.concatenate(
+        [
+            np.unpackbits(
+                np.ascontiguousarray(codebook[start : start + chunk_size]).view(
+                    np.uint8
+                ),
+                axis=-1,
+            ).sum(axis=-1)
+            for start in range(0, len(codebook), chunk_size)
+        ]
+    )
+    # The all-zero codeword (index 0) is excluded
+    weights[0] = n + 1
+    return unpack_bits(codebook[weights == weights.min()], n)
+
+
+def unpack_codewords(packed, n):
+    """
+    TF version of unpack_bits.
+
+    Args:
+        packed ([N x ceil(n / 64)] int64 tensor): packed vectors (uint64 bits viewed as int64)
+        n (int): vectors length
+
+    Returns:
+        [N x n] int64 tensor: binary vectors
+    """
+    positions = np.arange(n)
+    words = tf.gather(packed, positions // WORD_BITS, axis=-1)
+    return tf.bitwise.bitwise_and(
+        tf.bitwise.right_shift(words, positions % WORD_BITS), tf.constant(1, tf.int64)
+    )
+
+
+def pack_codewords(bits):
+    """
+    TF version of pack_bits.
+
+    Args:
+        bits ([N x n] tensor): binary vectors
+
+    Returns:
+        [N x ceil(n / 64)] int64 tensor: packed vectors (uint64 bits viewed as int64)
+    """
+    n = bits.shape[-1]
+    n_words = -(-n // WORD_BITS)
+    bits = tf.pad(tf.cast(bits, tf.int64), [[0, 0], [0, n_words * WORD_BITS - n]])
+    bits = tf.reshape(bits, [-1, n_words, WORD_BITS])
+    # Disjoint bits: the sum is the bitwise OR
+    return tf.reduce_sum(
+        tf.bitwise.left_shift(bits, np.arange(WORD_BITS, dtype=np.int64)), axis=-1
+    )
+
+
+def hamming_distances(packed_words, packed_codewords):
+    """
+    Popcount based Hamming distances between packed vectors.
+
+    Args:
+        packed_words ([batch x W] int64 tensor): packed received words
+        packed_codewords ([N x W] int64 tensor): packed codewords
+
+    Returns:
+        [batch x N] int32 tensor
+    """
+    differences = tf.bitwise.bitwise_xor(
+        tf.expand_dims(packed_words, -2), tf.expand_dims(packed_codewords, -3)
+    )
+    return tf.reduce_sum(
+        tf.cast(tf.raw_ops.PopulationCount(x=differences), tf.int32), axis=-1
+    )
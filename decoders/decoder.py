@@ -20,7 +20,306 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTI
 
 import tensorflow as tf
 
-from decoders import GatedNeuralBeliefPropagationRNNCell, MinDistanceDecoder
+from decoders import (
+    GatedNeuralBeliefPropagationRNNCell,
+    SparseGatedNeuralBeliefPropagationRNNCell,
+    get_ml_decoder,
+    OrderedStatisticsDecoder,
+    SyndromeDecoder,
+    ChaseDecoder,
+)
+from .code_structure import check_code_structure, factor_graph_gates
+
+
+def gnbp_rnn_cell(
+    n_variable_nodes,
+    n_check_nodes,
+    trainable,
+    engine="dense",
+    H=None,
+    check_node_update="prefix",
+    algorithm="sum-product",
+    trainable_min_sum_factors=None,
+):
+    """
+    Instantiate the GNBP RNN cell of the requested message-passing engine.
+
+    Args:
+        n_variable_nodes (int): number of variable nodes (code length n)
+        n_check_nodes (int): number of check nodes (n-k)
+        trainable (bool): whether the factor graph weights are trainable
+        engine (str) [default="dense"]: "dense" (messages on the full [n-k x n] grid gated by H)
+            or "sparse" (messages on the edges of the Tanner graph of H only)
+        H ([n-k x n] array) [default=None]: fixed parity-check matrix (its structure is precompiled
+            once per distinct H and the H provided at call is ignored), required by the sparse engine
+        check_node_update (str) [default="prefix"]: "prefix" (linear time extrinsic products from
+            forward/backward cumulative products) or "repeat" (legacy quadratic time extrinsic products)
+        algorithm (str) [default="sum-product"]: check node update rule, "sum-product", "min-sum",
+            "normalized-min-sum" or "offset-min-sum"
+        trainable_min_sum_factors (bool) [default=None]: whether the per-edge normalization/offset
+            factors of the normalized/offset min-sum are trainable (defaults to `trainable`)
+
+    Returns:
+        tf.keras.layers.Layer: the RNN cell
+    """
+    if engine == "dense":
+        return GatedNeuralBeliefPropagationRNNCell(
+            n_variable_nodes=n_variable_nodes,
+            n_check_nodes=n_check_nodes,
+            trainable=trainable,
+            check_node_update=check_node_update,
+            algorithm=algorithm,
+            trainable_min_sum_factors=trainable_min_sum_factors,
+            H=H,
+        )
+    elif engine == "sparse":
+        if H is None:
+            raise ValueError(
+                "The sparse engine requires a fixed parity-check matrix H at construction"
+            )
+        return SparseGatedNeuralBeliefPropagationRNNCell(
+            n_variable_nodes=n_variable_nodes,
+            n_check_nodes=n_check_nodes,
+            H=H,
+            trainable=trainable,
+            check_node_update=check_node_update,
+            algorithm=algorithm,
+            trainable_min_sum_factors=trainable_min_sum_factors,
+        )
+    else:
+        raise ValueError(f"Unknown message-passing engine '{engine}'")
+
+
+def cell_constants(cell, H):
+    """
+    Constants of the GNBP RNN cell. When the code is not fixed (trainable code), the gates derived
+    from H are computed once per decoding and passed to the cell along with H, instead of being
+    recomputed at every iteration. When the code is fixed, H must be the parity-check matrix of the
+    precompiled structure of the cell (see check_code_structure).
+
+    Args:
+        cell (tf.keras.layers.Layer): GNBP RNN cell
+        H ([n-k x n] tensor): parity-check matrix
+
+    Returns:
+        tensor or list of tensors: the cell constants
+
+    Raises:
+        ValueError: H differs from the fixed parity-check matrix of the cell
+    """
+    if cell.code_structure is not None:
+        return check_code_structure(cell.code_structure, H)
+    return [H, *factor_graph_gates(H)]
+
+
+def unrolled_decoding(
+    cell,
+    llrs,
+    H,
+    n_iter,
+    input_ponderation=None,
+    return_sequences=False,
+    training=False,
+    constants=None,
+):
+    """
+    Decoding loop statically unrolled over the iterations, without the time axis (tiled inputs)
+    required by tf.keras.layers.RNN. The cell and its weights are the same as in the RNN path.
+
+    Args:
+        cell (tf.keras.layers.Layer): GNBP RNN cell
+        llrs ([batch, n] tensor): input LLRs of the cell
+        H ([n-k x n] tensor): parity-check matrix
+        n_iter (int): number of iterations
+        input_ponderation ([n_iter, 1] tensor) [default=None]: per iteration weights of the cell input
+        return_sequences (bool) [default=False]: whether to return the outputs of every iteration
+        training (bool) [default=False]: training mode of the cell
+        constants (tensor or list of tensors) [default=None]: cell constants (defaults to H)
+
+    Returns:
+        [batch, n] or [batch, n_iter, n] tensor: cell outputs of the last (or every) iteration
+    """
+    constants = H if constants is None else constants
+    messages = tf.zeros([tf.shape(llrs)[0], cell.state_size[0]], dtype=llrs.dtype)
+    sequences = []
+    for i in range(n_iter):
+        x = llrs if input_ponderation is None else llrs * input_ponderation[i]
+        outputs, messages = cell(x, [messages], constants=constants, training=training)
+        sequences.append(outputs)
+
+    if return_sequences:
+        return tf.concat(sequences, axis=-2)
+    return tf.reshape(outputs, [-1, tf.shape(llrs)[1]])
+
+
+def build_cell(cell, input_shape):
+    """
+    Build the RNN cell weights (as tf.keras.layers.RNN does) so that they are not created
+    inside the (compiled) decoding loops.
+    """
+    if not cell.built:
+        # Weights and constants (tf.ones) created eagerly, even when called from a tf.function
+        with tf.init_scope(), tf.name_scope(cell.name):
+            cell.build(input_shape)
+            cell.built = True
+
+
+# Same decoding loop compiled with XLA (one trace per cell, shapes and options)
+xla_unrolled_decoding = tf.function(unrolled_decoding, jit_compile=True)
+
+
+# Decoding cores: Keras RNN layer over tiled inputs, static unroll, static unroll compiled with XLA
+DECODER_CORES = {
+    "unrolled": unrolled_decoding,
+    "xla": xla_unrolled_decoding,
+}
+
+
+def syndrome_satisfied(llrs, H):
+    """
+    Per codeword parity check of the hard decisions (bit 1 for negative LLRs): c.H^T = 0.
+
+    Args:
+        llrs ([batch, n] tensor): LLRs
+        H ([n-k x n] tensor): parity-check matrix
+
+    Returns:
+        [batch] boolean tensor: True for the hard decisions that are codewords
+    """
+    hard_decisions = tf.cast(llrs < 0, dtype=llrs.dtype)
+    syndromes = tf.math.floormod(tf.matmul(hard_decisions, H, transpose_b=True), 2.0)
+    return tf.reduce_all(tf.equal(syndromes, 0.0), axis=-1)
+
+
+def early_stopping_decoding(
+    cell,
+    llrs,
+    H,
+    n_iter,
+    input_ponderation=None,
+    return_sequences=False,
+    constants=None,
+    stop_outputs=None,
+):
+    """
+    Inference decoding loop with per codeword syndrome-based early termination.
+
+    The codewords whose hard decisions satisfy the parity checks (before decoding or after any
+    iteration) are frozen: their outputs are kept for the remaining iterations and they are removed
+    from the batch processed by the cell. The loop exits as soon as the whole batch has converged.
+    The parity checks are applied to the cell outputs or, for decoders combining the outputs of all
+    the iterations (DecoderA), to the decoder outputs given by `stop_outputs`.
+
+    Args:
+        cell (tf.keras.layers.Layer): GNBP RNN cell
+        llrs ([batch, n] tensor): input LLRs of the cell
+        H ([n-k x n] tensor): parity-check matrix
+        n_iter (int): maximum number of iterations
+        input_ponderation ([n_iter, 1] tensor) [default=None]: per iteration weights of the cell input
+        return_sequences (bool) [default=False]: whether to return the outputs of every iteration
+        constants (tensor or list of tensors) [default=None]: cell constants (defaults to H)
+        stop_outputs (callable) [default=None]: decoder output LLRs [batch, n] of the cell outputs
+            [batch, n_iter, n] (the last output being repeated over the remaining iterations) and of the
+            input LLRs [batch, n], the parity checks are applied to the cell outputs when None
+
+    Returns:
+        outputs ([batch, n] or [batch, n_iter, n] tensor): cell outputs of the last (or every) iteration
+        iterations ([batch] tensor): number of iterations run for each codeword
+    """
+    H = tf.cast(H, dtype=llrs.dtype)
+    constants = H if constants is None else constants
+    batch_size = tf.shape(llrs)[0]
+    n = tf.shape(llrs)[1]
+
+    # The sequences of outputs are required by the stop test on the decoder outputs
+    keep_sequences = return_sequences or stop_outputs is not None
+
+    if stop_outputs is None:
+        decoder_outputs = llrs
+    else:
+        decoder_outputs = stop_outputs(
+            tf.tile(tf.expand_dims(llrs, axis=1), [1, n_iter, 1]), llrs
+        )
+    active = tf.cast(
+        tf.where(~syndrome_satisfied(decoder_outputs, H))[:, 0], dtype=tf.int32
+    )
+    messages = tf.zeros([tf.size(active), cell.state_size[0]], dtype=llrs.dtype)
+    outputs = llrs
+    sequences = tf.zeros([n_iter if keep_sequences else 0, batch_size, n])
+    iterations = tf.zeros([batch_size], dtype=tf.int32)
+
+    def condition(i, active, messages, outputs, sequences, iterations):
+        return (i < n_iter) & (tf.size(active) > 0)
+
+    def body(i, active, messages, outputs, sequences, iterations):
+        x = tf.gather(llrs, active)
+        if input_ponderation is not None:
+            x = x * input_ponderation[i]
+        active_outputs, messages = cell(
+            x, [messages], constants=constants, training=False
+        )
+        active_outputs = tf.reshape(active_outputs, [-1, n])
+
+        indices = tf.expand_dims(active, axis=-1)
+        outputs = tf.tensor_scatter_nd_update(outputs, indices, active_outputs)
+        iterations = tf.tensor_scatter_nd_add(iterations, indices, tf.ones_like(active))
+        if keep_sequences:
+            sequences = tf.tensor_scatter_nd_update(
+                sequences, [[i]], tf.expand_dims(outputs, axis=0)
+            )
+
+        if stop_outputs is None:
+            decoder_outputs = active_outputs
+        else:
+            # Outputs of the active codewords if they were frozen at this iteration
+            active_sequences = tf.where(
+                tf.reshape(tf.range(n_iter) <= i, [-1, 1, 1]),
+                tf.gather(sequences, active, axis=1),
+                tf.expand_dims(active_outputs, axis=0),
+            )
+            decoder_outputs = stop_outputs(
+                tf.transpose(active_sequences, [1, 0, 2]), tf.gather(llrs, active)
+            )
+
+        # Compact the batch to the codewords that have not converged
+        not_converged = ~syndrome_satisfied(decoder_outputs, H)
+        active = tf.boolean_mask(active, not_converged)
+        messages = tf.boolean_mask(messages, not_converged)
+        return i + 1, active, messages, outputs, sequences, iterations
+
+    (i, _, _, outputs, sequences, iterations) = tf.while_loop(
+        condition,
+        body,
+        (0, active, messages, outputs, sequences, iterations),
+        shape_invariants=(
+            tf.TensorShape([]),
+            tf.TensorShape([None]),
+            tf.TensorShape([None, messages.shape[-1]]),
+            outputs.shape,
+            sequences.shape,
+            iterations.shape,
+        ),
+    )
+
+    if not return_sequences:
+        return outputs, iterations
+
+    # Iterations skipped after the whole batch has converged
+    sequences = tf.where(
+        tf.reshape(tf.range(n_iter) < i, [-1, 1, 1]),
+        sequences,
+        tf.expand_dims(outputs, axis=0),
+    )
+    return tf.transpose(sequences, [1, 0, 2]), iterations
+
+
+# Decoder configurations of the min-sum family (standard BP structure with a min-sum check node update,
+# the normalization/offset factors are trained when the decoder is trainable)
+MIN_SUM_CONFS = {
+    "MS": "min-sum",
+    "NMS": "normalized-min-sum",
+    "OMS": "offset-min-sum",
+}
 
 
 class Decoder(tf.keras.Model):
@@ -32,6 +331,20 @@ class Decoder(tf.keras.Model):
         n_iter=5,
         trainable=True,
         conf="A",
+        engine="dense",
+        H=None,
+        check_node_update="prefix",
+        early_stopping=False,
+        core="rnn",
+        ml_chunk_size=None,
+        ml_metric="correlation",
+        ml_algorithm="auto",
+        ml_cache_dir=None,
+        osd_order=2,
+        osd_minimum_distance=None,
+        chase_n_flips=3,
+        fallback=None,
+        fallback_n_iter=20,
         **kwargs,
     ):
         super(Decoder, self).__init__(**kwargs)
@@ -41,43 +354,204 @@ class Decoder(tf.keras.Model):
         self.n_iter = n_iter
         self.trainable = trainable
         self.conf = conf
+        self.engine = engine
+        # Syndrome-based early termination (inference only)
+        self.early_stopping = early_stopping
+        # "rnn" (tf.keras.layers.RNN), "unrolled" or "xla" (see DECODER_CORES)
+        if core != "rnn" and core not in DECODER_CORES:
+            raise ValueError(f"Unknown decoder core '{core}'")
+        self.core = core
 
         print("CONF:", conf)
         if conf == "A":
             self.decoder = DecoderA(
-                n_variable_nodes, n_check_nodes, n_information_bits, n_iter, trainable
+                n_variable_nodes,
+                n_check_nodes,
+                n_information_bits,
+                n_iter,
+                trainable,
+                engine=engine,
+                H=H,
+                check_node_update=check_node_update,
+                early_stopping=early_stopping,
+                core=core,
             )
         elif conf == "ML":
-            self.decoder = MinDistanceDecoder(
-                n=n_variable_nodes, k=n_information_bits, G=None, return_words=True
+            # Codebook search or syndrome trellis (see ml_decoder_algorithm)
+            self.decoder = get_ml_decoder(
+                n=n_variable_nodes,
+                k=n_information_bits,
+                G=None,
+                return_words=True,
+                algorithm=ml_algorithm,
+                chunk_size=ml_chunk_size,
+                metric=ml_metric,
+                cache_dir=ml_cache_dir,
+            )
+
+        elif conf == "OSD":
+            self.decoder = OrderedStatisticsDecoder(
+                n=n_variable_nodes,
+                k=n_information_bits,
+                G=None,
+                order=osd_order,
+                return_words=True,
+                minimum_distance=osd_minimum_distance,
             )
 
         elif conf == "BP":
             self.decoder = DecoderStandardBP(
-                n_variable_nodes, n_check_nodes, n_information_bits, n_iter, trainable
+                n_variable_nodes,
+                n_check_nodes,
+                n_information_bits,
+                n_iter,
+                trainable,
+                engine=engine,
+                H=H,
+                check_node_update=check_node_update,
+                early_stopping=early_stopping,
+                core=core,
+            )
+
+        elif conf in MIN_SUM_CONFS:
+            self.decoder = DecoderStandardBP(
+                n_variable_nodes,
+                n_check_nodes,
+                n_information_bits,
+                n_iter,
+                trainable,
+                engine=engine,
+                H=H,
+                check_node_update=check_node_update,
+                algorithm=MIN_SUM_CONFS[conf],
+                early_stopping=early_stopping,
+                core=core,
             )
 
         elif conf == "GNBP":
             self.decoder = self.decoder = DecoderA(
-                n_variable_nodes, n_check_nodes, n_information_bits, n_iter, trainable
+                n_variable_nodes,
+                n_check_nodes,
+                n_information_bits,
+                n_iter,
+                trainable,
+                engine=engine,
+                H=H,
+                check_node_update=check_node_update,
+                early_stopping=early_stopping,
+                core=core,
+            )
+
+        elif conf == "syndrome":
+            # Hard-decision ML decoding by syndrome lookup (table of coset leaders, small n-k)
+            self.decoder = SyndromeDecoder(
+                n=n_variable_nodes,
+                k=n_information_bits,
+                H=H,
+                return_words=True,
+                cache_dir=ml_cache_dir,
+            )
+
+        elif conf == "Chase":
+            # Chase-II: syndrome lookup decoding of the 2^chase_n_flips test patterns
+            self.decoder = ChaseDecoder(
+                n=n_variable_nodes,
+                k=n_information_bits,
+                H=H,
+                n_flips=chase_n_flips,
+                return_words=True,
+                cache_dir=ml_cache_dir,
             )
 
         else:
             print("default configuration")
             self.decoder = DecoderA(
-                n_variable_nodes, n_check_nodes, n_information_bits, n_iter, trainable
+                n_variable_nodes,
+                n_check_nodes,
+                n_information_bits,
+                n_iter,
+                trainable,
+                engine=engine,
+                H=H,
+                check_node_update=check_node_update,
+                early_stopping=early_stopping,
+                core=core,
+            )
+
+        # Codewords failing the parity checks after the BP/GNBP decoder are decoded again by a slower decoder
+        self.fallback = fallback
+        if fallback is not None:
+            if conf in ["ML", "OSD", "syndrome", "Chase"]:
+                raise ValueError(f"The {conf} decoder cannot have a fallback decoder")
+            if fallback == "ML":
+                (fallback_stage, fallback_inputs) = (
+                    get_ml_decoder(
+                        n=n_variable_nodes,
+                        k=n_information_bits,
+                        algorithm=ml_algorithm,
+                        chunk_size=ml_chunk_size,
+                        metric=ml_metric,
+                        cache_dir=ml_cache_dir,
+                    ),
+                    "G",
+                )
+            elif fallback == "OSD":
+                (fallback_stage, fallback_inputs) = (
+                    OrderedStatisticsDecoder(
+                        n=n_variable_nodes,
+                        k=n_information_bits,
+                        order=osd_order,
+                        minimum_distance=osd_minimum_distance,
+                    ),
+                    "G",
+                )
+            elif fallback == "BP":
+                (fallback_stage, fallback_inputs) = (
+                    DecoderStandardBP(
+                        n_variable_nodes,
+                        n_check_nodes,
+                        n_information_bits,
+                        fallback_n_iter,
+                        False,
+                        engine=engine,
+                        H=H,
+                        check_node_update=check_node_update,
+                        early_stopping=True,
+                        core=core,
+                        iterations_metric="fallback_average_iterations",
+                    ),
+                    "H",
+                )
+            else:
+                raise ValueError(f"Unknown fallback decoder '{fallback}'")
+            self.decoder = HybridDecoder(
+                self.decoder, fallback_stage, fallback_inputs=fallback_inputs
             )
 
+    @property
+    def symmetric(self):
+        """
+        whether the error rate of the decoder does not depend on the transmitted codeword (the decoding of a received
+        word translated by a codeword is the translated decoded word), which allows the all-zero codeword evaluation
+        """
+        return getattr(self.decoder, "symmetric", False)
+
     def call(self, inputs, training=False):
         (noisy_symbols, G, H, sigma2) = inputs
 
-        if self.conf == "ML":
+        if self.fallback is not None or self.conf == "Chase":
+            return self.decoder([noisy_symbols, G, H, sigma2], training=training)
+        if self.conf in ["ML", "OSD"]:
             return self.decoder([noisy_symbols, G, sigma2], training=training)
         else:
             return self.decoder([noisy_symbols, H, sigma2], training=training)
 
 
 class DecoderA(tf.keras.Model):
+    # Symmetric decoder (sign-symmetric message updates and codeword-wise normalizations): the error rate does not
+    # depend on the transmitted codeword (see AutoEncoder all-zero codeword evaluation)
+    symmetric = True
+
     def __init__(
         self,
         n_variable_nodes,
@@ -85,6 +559,13 @@ class DecoderA(tf.keras.Model):
         n_information_bits,
         n_iter=5,
         trainable=True,
+        engine="dense",
+        H=None,
+        check_node_update="prefix",
+        algorithm="sum-product",
+        early_stopping=False,
+        core="rnn",
+        iterations_metric="average_iterations",
         **kwargs,
     ):
         super(DecoderA, self).__init__(**kwargs)
@@ -94,10 +575,25 @@ class DecoderA(tf.keras.Model):
         self.n_iter = n_iter
         self.trainable = trainable
 
-        self.RNN_cell = GatedNeuralBeliefPropagationRNNCell(  #! Atanh taylor during training and true Atanh during eval
+        self.engine = engine
+        # Syndrome-based early termination (inference only)
+        self.early_stopping = early_stopping
+        if early_stopping:
+            # Average number of iterations per codeword (metric named after the decoding stage, see HybridDecoder)
+            self.average_iterations = tf.keras.metrics.Mean(name=iterations_metric)
+        # "rnn" (tf.keras.layers.RNN), "unrolled" or "xla" (see DECODER_CORES)
+        if core != "rnn" and core not in DECODER_CORES:
+            raise ValueError(f"Unknown decoder core '{core}'")
+        self.core = core
+
+        self.RNN_cell = gnbp_rnn_cell(  #! Atanh taylor during training and true Atanh during eval
             n_variable_nodes=self.n_variable_nodes,
             n_check_nodes=self.n_check_nodes,
             trainable=self.trainable,
+            engine=engine,
+            H=H,
+            check_node_update=check_node_update,
+            algorithm=algorithm,
         )
         self.SP_RNN = tf.keras.layers.RNN(
             self.RNN_cell,
@@ -139,7 +635,15 @@ class DecoderA(tf.keras.Model):
         _ = self.call(inputs)
     """
 
-    def call(self, inputs, training=False):
+    def call(self, inputs, training=False, return_llrs=False):
+        outputs = self.output_llrs(inputs, training=training)
+        if return_llrs:
+            # [batch, n] output LLRs (e.g. for a parity check of the decisions)
+            return outputs
+        return tf.math.sigmoid((-1.0) * outputs[:, 0 : self.n_information_bits])
+
+    def output_llrs(self, inputs, training=False):
+        """[batch, n] output LLRs of the decoder, before the sigmoid and the selection of the information bits"""
         (inputs, H, sigma2) = inputs
         # LLRs
         llrs = (-1.0) * 4.0 * inputs / sigma2
@@ -153,16 +657,49 @@ class DecoderA(tf.keras.Model):
         else:
             normalized_llrs = llrs
 
-        # Input broadcasting:
-        x = tf.expand_dims(normalized_llrs, axis=1)
-        x = tf.tile(x, [1, self.n_iter, 1])
+        build_cell(self.RNN_cell, normalized_llrs.shape)
+        constants = cell_constants(self.RNN_cell, H)
+        if self.early_stopping and not training:
+            # Decoding (the input ponderation is applied at each iteration), the parity checks are applied to the
+            # combination of the iterations
+            decoded_bits, iterations = early_stopping_decoding(
+                self.RNN_cell,
+                normalized_llrs,
+                H,
+                self.n_iter,
+                input_ponderation=self.input_ponderation,
+                return_sequences=True,
+                constants=constants,
+                stop_outputs=self.combine_iterations,
+            )
+            self.average_iterations.update_state(tf.cast(iterations, dtype=tf.float32))
+        elif self.core != "rnn":
+            # Decoding (the input ponderation is applied at each iteration)
+            decoded_bits = DECODER_CORES[self.core](
+                self.RNN_cell,
+                normalized_llrs,
+                H,
+                self.n_iter,
+                input_ponderation=self.input_ponderation,
+                return_sequences=True,
+                training=training,
+                constants=constants,
+            )
+        else:
+            # Input broadcasting:
+            x = tf.expand_dims(normalized_llrs, axis=1)
+            x = tf.tile(x, [1, self.n_iter, 1])
+
+            # Input ponderation
+            x = tf.multiply(x, self.input_ponderation)
 
-        # Input ponderation
-        x = tf.multiply(x, self.input_ponderation)
+            # Decoding
+            decoded_bits = self.SP_RNN(inputs=x, constants=constants, training=training)
 
-        # Decoding
-        decoded_bits = self.SP_RNN(inputs=x, constants=H, training=training)
+        return self.combine_iterations(decoded_bits, normalized_llrs)
 
+    def combine_iterations(self, decoded_bits, normalized_llrs):
+        """[batch, n] output LLRs of the [batch, n_iter, n] cell outputs and of the normalized input LLRs"""
         outputs = tf.reshape(decoded_bits, (-1, self.n_iter, self.n_variable_nodes))
         # Remove added broadcast dimension
         # Normalization (because skip/residual connections?)
@@ -181,14 +718,13 @@ class DecoderA(tf.keras.Model):
 
         # Skip connection
         skip_connection = tf.multiply(self.skip_connection_ponderation, normalized_llrs)
-        outputs = tf.add(outputs, skip_connection)
-
-        outputs = tf.math.sigmoid((-1.0) * outputs[:, 0 : self.n_information_bits])
-
-        return outputs
+        return tf.add(outputs, skip_connection)
 
 
 class DecoderStandardBP(tf.keras.Model):
+    # Symmetric decoder (sign-symmetric message updates)
+    symmetric = True
+
     def __init__(
         self,
         n_variable_nodes,
@@ -196,6 +732,13 @@ class DecoderStandardBP(tf.keras.Model):
         n_information_bits,
         n_iter=5,
         trainable=False,
+        engine="dense",
+        H=None,
+        check_node_update="prefix",
+        algorithm="sum-product",
+        early_stopping=False,
+        core="rnn",
+        iterations_metric="average_iterations",
         **kwargs,
     ):
         super(DecoderStandardBP, self).__init__(**kwargs)
@@ -205,15 +748,32 @@ class DecoderStandardBP(tf.keras.Model):
         self.n_iter = n_iter
         self.trainable = trainable
 
-        self.RNN_cell = GatedNeuralBeliefPropagationRNNCell(  #! Atanh taylor during training and true Atanh during eval
+        self.engine = engine
+        # Syndrome-based early termination (inference only)
+        self.early_stopping = early_stopping
+        if early_stopping:
+            # Average number of iterations per codeword (metric named after the decoding stage, see HybridDecoder)
+            self.average_iterations = tf.keras.metrics.Mean(name=iterations_metric)
+        # "rnn" (tf.keras.layers.RNN), "unrolled" or "xla" (see DECODER_CORES)
+        if core != "rnn" and core not in DECODER_CORES:
+            raise ValueError(f"Unknown decoder core '{core}'")
+        self.core = core
+
+        self.RNN_cell = gnbp_rnn_cell(  #! Atanh taylor during training and true Atanh during eval
             n_variable_nodes=self.n_variable_nodes,
             n_check_nodes=self.n_check_nodes,
             trainable=False,
+            engine=engine,
+            H=H,
+            check_node_update=check_node_update,
+            algorithm=algorithm,
+            trainable_min_sum_factors=self.trainable,
         )
+        # Only the normalization/offset factors of the normalized/offset min-sum can be trained
         self.SP_RNN = tf.keras.layers.RNN(
             self.RNN_cell,
             return_sequences=False,
-            trainable=False,
+            trainable=self.RNN_cell.trainable,
         )
 
         ## Build model
@@ -221,21 +781,104 @@ class DecoderStandardBP(tf.keras.Model):
 
     # def build(self, input_shape):
 
-    def call(self, inputs, training=False):
+    def call(self, inputs, training=False, return_llrs=False):
+        outputs = self.output_llrs(inputs, training=training)
+        if return_llrs:
+            # [batch, n] output LLRs (e.g. for a parity check of the decisions)
+            return outputs
+        return tf.math.sigmoid((-1.0) * outputs[:, 0 : self.n_information_bits])
+
+    def output_llrs(self, inputs, training=False):
+        """[batch, n] output LLRs of the decoder, before the sigmoid and the selection of the information bits"""
         (inputs, H, sigma2) = inputs
 
         # LLRs
         llrs = (-1.0) * 4 * inputs / sigma2
 
-        # Input broadcasting:
-        x = tf.expand_dims(llrs, axis=1)
-        x = tf.tile(x, [1, self.n_iter, 1])
+        build_cell(self.RNN_cell, llrs.shape)
+        constants = cell_constants(self.RNN_cell, H)
+        if self.early_stopping and not training:
+            # Decoding
+            decoded_bits, iterations = early_stopping_decoding(
+                self.RNN_cell, llrs, H, self.n_iter, constants=constants
+            )
+            self.average_iterations.update_state(tf.cast(iterations, dtype=tf.float32))
+        elif self.core != "rnn":
+            # Decoding
+            decoded_bits = DECODER_CORES[self.core](
+                self.RNN_cell,
+                llrs,
+                H,
+                self.n_iter,
+                training=training,
+                constants=constants,
+            )
+        else:
+            # Input broadcasting:
+            x = tf.expand_dims(llrs, axis=1)
+            x = tf.tile(x, [1, self.n_iter, 1])
+
+            # Decoding
+            decoded_bits = self.SP_RNN(inputs=x, constants=constants, training=training)
 
-        # Decoding
-        decoded_bits = self.SP_RNN(inputs=x, constants=H, training=training)
+        return tf.reshape(decoded_bits, (-1, self.n_variable_nodes))
 
-        outputs = tf.reshape(decoded_bits, (-1, self.n_variable_nodes))
 
-        outputs = tf.math.sigmoid((-1.0) * outputs[:, 0 : self.n_information_bits])
+class HybridDecoder(tf.keras.Model):
+    """
+    Cascaded decoder: the whole batch is decoded by the first stage (DecoderA or DecoderStandardBP) and only the
+    codewords whose decisions violate the parity checks are decoded again by the (slower) fallback stage, e.g. an
+    OSD, ML or longer BP decoder. The outputs keep the order of the batch.
+
+    The fraction of the batch sent to the fallback stage is reported by the "escalation_fraction" metric. During
+    training, only the first stage is used.
+
+    Args:
+        first_stage (DecoderA or DecoderStandardBP): first decoder
+        fallback_stage (tf.keras.Model): decoder of the failed codewords, taking [noisy_symbols, G, sigma2]
+            (MinDistanceDecoder, TrellisDecoder, OrderedStatisticsDecoder) or [noisy_symbols, H, sigma2]
+            (DecoderA, DecoderStandardBP) depending on `fallback_inputs`
+        fallback_inputs (str) [default="G"]: matrix provided to the fallback stage, "G" or "H"
+    """
 
-        return outputs
+    def __init__(self, first_stage, fallback_stage, fallback_inputs="G", **kwargs):
+        super(HybridDecoder, self).__init__(**kwargs)
+        if fallback_inputs not in ["G", "H"]:
+            raise ValueError(f"Unknown fallback inputs '{fallback_inputs}'")
+        self.first_stage = first_stage
+        self.fallback_stage = fallback_stage
+        self.fallback_inputs = fallback_inputs
+        self.escalation_fraction = tf.keras.metrics.Mean(name="escalation_fraction")
+
+    @property
+    def symmetric(self):
+        """whether the error rate does not depend on the transmitted codeword (both stages are symmetric)"""
+        return getattr(self.first_stage, "symmetric", False) and getattr(
+            self.fallback_stage, "symmetric", False
+        )
+
+    def call(self, inputs, training=False):
+        (noisy_symbols, G, H, sigma2) = inputs
+
+        llrs = self.first_stage(
+            [noisy_symbols, H, sigma2], training=training, return_llrs=True
+        )
+        outputs = tf.math.sigmoid(
+            (-1.0) * llrs[:, 0 : self.first_stage.n_information_bits]
+        )
+        if training:
+            return outputs
+
+        # Codewords escalated to the fallback stage
+        not_satisfied = ~syndrome_satisfied(llrs, H)
+        failed = tf.where(not_satisfied)
+        self.escalation_fraction.update_state(tf.cast(not_satisfied, tf.float32))
+        matrix = G if self.fallback_inputs == "G" else H
+        # Noise power of the escalated codewords (shared or per sample [batch, 1])
+        sigma2 = tf.gather_nd(tf.broadcast_to(sigma2, [tf.shape(llrs)[0], 1]), failed)
+        fallback_outputs = self.fallback_stage(
+            [tf.gather_nd(noisy_symbols, failed), matrix, sigma2], training=False
+        )
+        return tf.tensor_scatter_nd_update(
+            outputs, failed, tf.cast(fallback_outputs, outputs.dtype)
+        )
@@ -0,0 +1,109 @@
+"""
+GF(2) linear algebra
+
+Brief: NumPy helpers on binary matrices (row reduction, null space, inverse) used to build the decoders of a code from its generator matrix
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+
+
+def gf2_row_reduce(M):
+    """
+    Reduced row echelon form over GF(2).
+
+    Args:
+        M ([m x n] array): binary matrix
+
+    Returns:
+        ([m x n] uint8 array, list): reduced matrix and indices of its pivot columns (the rank is the number of pivots)
+    """
+    R = np.array(M, dtype=np.uint8) % 2
+    (m, n) = R.shape
+    pivots = []
+    i = 0
+    for j in range(n):
+        if i == m:
+            break
+        rows = np.flatnonzero(R[i:, j])
+        if rows.size == 0:
+            continue
+        pivot = rows[0] + i
+        R[[i, pivot]] = R[[pivot, i]]
+        # Clear the column in every other row
+        others = np.flatnonzero(R[:, j])
+        others = others[others != i]
+        R[others] ^= R[i]
+        pivots.append(j)
+        i += 1
+    return R, pivots
+
+
+def gf2_null_space(M):
+    """
+    Basis of the null space of M over GF(2) (e.g. a parity-check matrix of the code generated by M).
+
+    Args:
+        M ([m x n] array): binary matrix
+
+    Returns:
+        [n - rank x n] uint8 array: rows x such that M x^T = 0
+    """
+    (R, pivots) = gf2_row_reduce(M)
+    n = R.shape[1]
+    free = [j for j in range(n) if j not in pivots]
+    N = np.zeros((len(free), n), dtype=np.uint8)
+    for (row, j) in enumerate(free):
+        N[row, j] = 1
+        N[row, pivots] = R[: len(pivots), j]
+    return N
+
+
+def gf2_inverse(M):
+    """
+    Inverse of a square matrix over GF(2).
+
+    Args:
+        M ([k x k] array): invertible binary matrix
+
+    Returns:
+        [k x k] uint8 array
+    """
+    k = M.shape[0]
+    (R, pivots) = gf2_row_reduce(
+        np.concatenate([np.array(M) % 2, np.eye(k)], axis=1)
+    )
+    if pivots[:k] != list(range(k)):
+        raise ValueError("The matrix is not invertible over GF(2)")
+    return R[:, k:]
+
+
+def gf2_information_set(G):
+    """
+    Information set of the code generated by G: positions of the codewords from which the information words
+    are recovered as u = c[pivots] G[:, pivots]^-1.
+
+    Args:
+        G ([k x n] array): full rank generator matrix
+
+    Returns:
+        (list, [k x k] uint8 array): pivots and G[:, pivots]^-1
+    """
+    G = np.array(G) % 2
+    (_, pivots) = gf2_row_reduce(G)
+    if len(pivots) < G.shape[0]:
+        raise ValueError("The generator matrix is not full rank")
+    return pivots, gf2_inverse(G[:, pivots])
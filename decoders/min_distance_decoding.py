@@ -19,69 +19,120 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTI
 """
 
 
+import numpy as np
 import tensorflow as tf
-from tensorflow.python.ops.gen_array_ops import expand_dims
 
-#!!!! WARNING: CODE BOOK CREATION METHODS TO BE THOROUGHLY CHECKED: POTENTIAL ROUNDING/TYPE/OVERFLOW ERRORS
+from .codebook import (
+    get_packed_codebook,
+    unpack_codewords,
+    pack_codewords,
+    hamming_distances,
+)
+
+
 class MinDistanceDecoder(tf.keras.Model):
-    def __init__(self, n, k, G=None, return_words=True, **kwargs):
+    """
+    Exhaustive (ML) decoder: the received word is compared to every codeword of the codebook.
+
+    The codebook is generated with integer bit operations and stored bit-packed ([2^k, ceil(n/64)] 64 bits words),
+    it is shared by the decoders of the same G and optionally cached on disk (see get_packed_codebook).
+
+    Args:
+        n (int): codewords length
+        k (int): number of information bits
+        G ([k x n] array) [default=None]: generator matrix (the codebook is otherwise built at the first call)
+        return_words (bool) [default=True]: return the decoded information words (True) or codewords (False)
+        chunk_size (int) [default=None]: number of codewords compared at once. The whole codebook is
+            compared at once when None, otherwise the codebook is streamed by tiles of chunk_size codewords
+            (unpacked on the fly) and the peak memory is bounded by batch x chunk_size x n (same decoded words)
+        metric (str) [default="correlation"]: "correlation" (ML decoding of BPSK over AWGN, the codeword
+            maximizing the correlation with the LLRs, computed as a matmul), "distance" (legacy metric,
+            mean absolute difference with the codewords LLRs scaled by the maximum |LLR| of the batch) or
+            "hamming" (hard-decision decoding, popcount of the packed differences with the hard decisions)
+        cache_dir (str) [default=None]: directory of the codebook cache files
+    """
+
+    def __init__(
+        self,
+        n,
+        k,
+        G=None,
+        return_words=True,
+        chunk_size=None,
+        metric="correlation",
+        cache_dir=None,
+        **kwargs,
+    ):
         super(MinDistanceDecoder, self).__init__(**kwargs)
         self.n = n
         self.k = k
-        self.number_of_words = int(tf.pow(2, self.k))
+        self.number_of_words = 2**self.k
         self.G = G
         self.return_words = return_words
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}")
+        self.chunk_size = chunk_size
+        if metric not in ["correlation", "distance", "hamming"]:
+            raise ValueError(f"Unknown metric '{metric}'")
+        self.metric = metric
+        self.cache_dir = cache_dir
         self.code_book_generated = False
 
-        if G != None:
+        if G is not None:
             self.init_codebook(G)
 
     def init_codebook(self, G):
-        n = tf.shape(G)[1]
-        k = tf.shape(G)[0]
-        assert (
-            k == self.k and n == self.n
-        ), (
-            -f"The provided generator matrix shape ({k},{n}) doesn't match expected shape ({self.k},{self.n})"
-        )
-
-        self.G = tf.cast(G, dtype=tf.float32)
-
-        # Compute all possible input words
-        coefs = tf.math.round(
-            tf.pow(2.0 * tf.ones(self.k), tf.linspace(1.0, float(self.k), self.k))
-        )
-        self.possible_words = (
-            tf.floor(
-                tf.linspace(
-                    tf.zeros(self.k),
-                    float(self.number_of_words) - 1,
-                    self.number_of_words,
-                    axis=0,
-                )
+        G = np.array(G)
+        assert G.shape == (
+            self.k,
+            self.n,
+        ), f"The provided generator matrix shape {G.shape} doesn't match expected shape ({self.k},{self.n})"
+
+        with tf.init_scope():
+            self.G = tf.constant(G, dtype=tf.float32)
+            # Packed codewords (uint64 bits viewed as int64)
+            self.packed_codebook = tf.constant(
+                np.asarray(get_packed_codebook(G, self.cache_dir)).view(np.int64)
             )
-            % (coefs)
-        )
-        substraction_slice = tf.concat(
-            [tf.zeros([self.number_of_words, 1]), self.possible_words[:, :-1]],
-            axis=-1,
-        )
-        self.possible_words = tf.cast(
-            (self.possible_words - substraction_slice) / (coefs / 2), dtype=tf.float32
-        )
-
-        # tf.print(self.possible_words, summarize=-1)
-        # Compute all possible code words
-        self.possible_codewords = tf.matmul(self.possible_words, self.G) % 2
-
-        # optimal LLR - Theoretically should be -infinity and +infinity
-        self.possible_codewords_llrs = (-1) * (
-            self.possible_codewords * 2 - 1
-        )  # * (-100000)
+            # LLRs (+/-1) of the codewords, only materialized for the whole codebook comparison
+            if not self.chunked and self.metric != "hamming":
+                self.possible_codewords_llrs = 1.0 - 2.0 * self.possible_codewords
 
         self.code_book_generated = True
         return self.code_book_generated
 
+    @property
+    def symmetric(self):
+        """
+        whether the error rate does not depend on the transmitted codeword: the ties of the integer hamming metric are
+        broken by the lowest codeword index, in favor of the all-zero codeword
+        """
+        return self.metric != "hamming"
+
+    @property
+    def chunked(self):
+        """whether the codebook is compared by tiles of chunk_size codewords"""
+        return self.chunk_size is not None and self.chunk_size < self.number_of_words
+
+    @property
+    def possible_words(self):
+        """[2^k, k] information words (the word of index u is the binary decomposition of u, LSB first)"""
+        return self.index_to_words(tf.range(self.number_of_words, dtype=tf.int64))
+
+    @property
+    def possible_codewords(self):
+        """[2^k, n] codewords (uG)"""
+        return tf.cast(unpack_codewords(self.packed_codebook, self.n), tf.float32)
+
+    def index_to_words(self, indices):
+        """information words of the codewords of the codebook indices"""
+        bits = tf.bitwise.right_shift(
+            tf.expand_dims(tf.cast(indices, tf.int64), -1),
+            np.arange(self.k, dtype=np.int64),
+        )
+        bits = tf.bitwise.bitwise_and(bits, tf.constant(1, tf.int64))
+        return tf.cast(bits, tf.float32)
+
     def call(self, inputs, training=False):
         noisy_symbols, G, sigma2 = inputs
         noisy_symbols = tf.cast(noisy_symbols, dtype=tf.float32)
@@ -90,34 +141,102 @@ class MinDistanceDecoder(tf.keras.Model):
         if not self.code_book_generated:
             self.init_codebook(G)
 
+        if self.chunked:
+            x = self.chunked_min_distance(llrs)
+        else:
+            x = self.min_distance(llrs)
+
+        if self.return_words:
+            # Decoded words
+            return self.index_to_words(x)
+        # Decoded codewords
+        return tf.cast(
+            unpack_codewords(tf.gather(self.packed_codebook, x), self.n), tf.float32
+        )
+
+    def distance(self, llrs, max_abs_x, start=0, size=None):
+        """
+        Distances between the received words and the codewords [start, start + size) of the codebook (the closest
+        codeword has the lowest distance).
+
+        Args:
+            llrs ([batch, n] tensor): channel LLRs
+            max_abs_x (scalar tensor): maximum |LLR| of the batch (scaling of the "distance" metric)
+            start (int or scalar tensor) [default=0]: index of the first compared codeword
+            size (int or scalar tensor) [default=None]: number of compared codewords (the whole codebook when None)
+
+        Returns:
+            [batch, words] tensor
+        """
+        if size is None:
+            size = self.number_of_words
+        packed_codewords = self.packed_codebook[start : start + size]
+        if self.metric == "hamming":
+            hard_decisions = pack_codewords(tf.cast(llrs < 0, tf.int64))
+            return tf.cast(
+                hamming_distances(hard_decisions, packed_codewords), tf.float32
+            )
+
+        if self.chunked:
+            codewords_llrs = 1.0 - 2.0 * tf.cast(
+                unpack_codewords(packed_codewords, self.n), tf.float32
+            )
+        else:
+            codewords_llrs = self.possible_codewords_llrs
+
+        if self.metric == "correlation":
+            # ML: maximal correlation between the LLRs and the BPSK codewords
+            return -tf.matmul(llrs, codewords_llrs, transpose_b=True)
+
         # Expand
         x = tf.expand_dims(llrs, axis=-2)
 
         # Broadcast
         batch_size = tf.shape(x)[0]
-        x = tf.broadcast_to(x, shape=[batch_size, self.number_of_words, self.n])
-        # tf.print(x, summarize=-1)
-        # tf.print(self.possible_codewords, summarize=-1)
+        x = tf.broadcast_to(
+            x, shape=[batch_size, tf.shape(codewords_llrs)[0], self.n]
+        )
 
         # Sum abs difference
-        max_abs_x = tf.reduce_max(tf.abs(x))
-        # tf.print(max_abs_x)
-        x = tf.reduce_mean(
-            tf.abs(x - max_abs_x * self.possible_codewords_llrs), axis=-1
-        )
-        # tf.print(x, summarize=-1)
-        # Argmin
-        x = tf.argmin(x, axis=-1)
-        # tf.print(x, summarize=-1)
+        return tf.reduce_mean(tf.abs(x - max_abs_x * codewords_llrs), axis=-1)
 
-        if self.return_words:
-            # Decoded words
-            output = tf.gather(self.possible_words, x)
-        else:
-            # Decoded codewords
-            output = tf.gather(self.possible_codewords, x)
-        # tf.print(output, summarize=-1)
-        return output
+    def min_distance(self, llrs):
+        """index of the closest codeword, the whole codebook is compared at once"""
+        max_abs_x = tf.reduce_max(tf.abs(llrs))
+        x = self.distance(llrs, max_abs_x)
+        # Argmin
+        return tf.argmin(x, axis=-1)
+
+    def chunked_min_distance(self, llrs):
+        """index of the closest codeword, the codebook is compared by tiles of chunk_size codewords"""
+        batch_size = tf.shape(llrs)[0]
+        # Same scaling as the whole codebook comparison (maximum over the batch)
+        max_abs_x = tf.reduce_max(tf.abs(llrs))
+
+        def condition(start, best_distance, best_index):
+            return start < self.number_of_words
+
+        def body(start, best_distance, best_index):
+            distance = self.distance(llrs, max_abs_x, start, self.chunk_size)
+            tile_distance = tf.reduce_min(distance, axis=-1)
+            tile_index = tf.argmin(distance, axis=-1) + tf.cast(start, tf.int64)
+
+            # Strict comparison: on ties the first codeword is kept, as with the argmin over the whole codebook
+            improved = tile_distance < best_distance
+            best_distance = tf.where(improved, tile_distance, best_distance)
+            best_index = tf.where(improved, tile_index, best_index)
+            return start + self.chunk_size, best_distance, best_index
+
+        (_, _, best_index) = tf.while_loop(
+            condition,
+            body,
+            (
+                tf.constant(0),
+                tf.fill([batch_size], float("inf")),
+                tf.zeros([batch_size], dtype=tf.int64),
+            ),
+        )
+        return best_index
 
     """
     def decode(
@@ -0,0 +1,305 @@
+"""
+OSD Decoder
+
+Brief: Batched Ordered Statistics Decoding (OSD) of order 0 to 3, near-ML decoding of codes with a large number of information bits
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+from itertools import combinations
+
+import numpy as np
+import tensorflow as tf
+
+from .gf2 import gf2_information_set
+
+MAX_OSD_ORDER = 3
+
+
+def error_patterns(k, order):
+    """[patterns x k] array of the error patterns of weight 1 to `order` on k positions"""
+    patterns = [
+        np.isin(np.arange(k), positions)
+        for weight in range(1, order + 1)
+        for positions in combinations(range(k), weight)
+    ]
+    return np.array(patterns, dtype=np.float32).reshape(-1, k)
+
+
+class OrderedStatisticsDecoder(tf.keras.Model):
+    """
+    Ordered Statistics Decoder [Fossorier and Lin, 1995]: the code bits are sorted by reliability, the generator
+    matrix is put in systematic form on the k most reliable independent positions (MRB) by a Gaussian
+    elimination, and the codewords obtained by re-encoding the hard decisions of the MRB with every error pattern
+    of weight at most `order` are compared to the received word (correlation, ML metric). OSD of order k-1 is ML.
+
+    The sorting, the elimination and the reprocessing are batched (one generator matrix per codeword).
+
+    Args:
+        n (int): codewords length
+        k (int): number of information bits
+        G ([k x n] array) [default=None]: full rank generator matrix (otherwise provided at the first call)
+        order (int) [default=2]: maximum weight of the test error patterns (0 to 3)
+        return_words (bool) [default=True]: return the decoded information words (True) or codewords (False)
+        early_stopping (bool) [default=True]: skip the reprocessing of the codewords whose order 0 decision
+            satisfies the optimality test (see optimal), which is the case of most codewords at high SNR
+        minimum_distance (int) [default=None]: minimum distance of the code used by the optimality test. When
+            None, only the order 0 decisions equal to the hard decisions are considered optimal
+        pattern_chunk_size (int) [default=1024]: number of test patterns reprocessed at once (the peak memory
+            of the reprocessing is batch x pattern_chunk_size x n)
+    """
+
+    # Symmetric decoder (soft metrics of the codewords translated by any codeword are permuted, ties have probability 0)
+    symmetric = True
+
+    def __init__(
+        self,
+        n,
+        k,
+        G=None,
+        order=2,
+        return_words=True,
+        early_stopping=True,
+        minimum_distance=None,
+        pattern_chunk_size=1024,
+        **kwargs,
+    ):
+        super(OrderedStatisticsDecoder, self).__init__(**kwargs)
+        if not 0 <= order <= MAX_OSD_ORDER:
+            raise ValueError(
+                f"The OSD order must be in [0, {MAX_OSD_ORDER}], got {order}"
+            )
+        self.n = n
+        self.k = k
+        self.order = order
+        self.return_words = return_words
+        self.early_stopping = early_stopping
+        self.minimum_distance = minimum_distance or 1
+        self.pattern_chunk_size = pattern_chunk_size
+        self.patterns = tf.constant(error_patterns(k, order))
+        self.code_book_generated = False
+
+        if G is not None:
+            self.init_codebook(G)
+
+    def init_codebook(self, G):
+        """store the generator matrix (same entry point as MinDistanceDecoder)"""
+        G = np.array(G) % 2
+        assert G.shape == (
+            self.k,
+            self.n,
+        ), f"The provided generator matrix shape {G.shape} doesn't match expected shape ({self.k},{self.n})"
+
+        (pivots, information_matrix) = gf2_information_set(G)
+        self.G = tf.constant(G, dtype=tf.bool)
+        # Information words from the codewords: u = c[pivots] G[:, pivots]^-1
+        self.pivots = tf.constant(pivots, dtype=tf.int32)
+        self.information_matrix = tf.constant(information_matrix, dtype=tf.float32)
+
+        self.code_book_generated = True
+        return self.code_book_generated
+
+    def call(self, inputs, training=False):
+        noisy_symbols, G, sigma2 = inputs
+        noisy_symbols = tf.cast(noisy_symbols, dtype=tf.float32)
+        llrs = (-1.0) * 4.0 * noisy_symbols / sigma2
+
+        if not self.code_book_generated:
+            self.init_codebook(G)
+
+        codewords = self.decode(llrs)
+        if self.return_words:
+            information_bits = tf.gather(codewords, self.pivots, axis=-1)
+            return tf.matmul(information_bits, self.information_matrix) % 2
+        return codewords
+
+    def decode(self, llrs):
+        """
+        OSD of the [batch, n] channel LLRs (positive for a 0 bit).
+
+        Returns:
+            [batch, n] tensor: decoded codewords
+        """
+        # Positions sorted by decreasing reliability
+        reliability_order = tf.argsort(
+            tf.abs(llrs), axis=-1, direction="DESCENDING", stable=True
+        )
+        sorted_llrs = tf.gather(llrs, reliability_order, batch_dims=1)
+        (systematic_G, mrb) = self.most_reliable_basis(reliability_order)
+
+        # Order 0: re-encoding of the hard decisions of the MRB
+        hard_decisions = tf.cast(sorted_llrs < 0, tf.float32)
+        codewords = (
+            tf.einsum(
+                "bk,bkn->bn",
+                tf.gather(hard_decisions, mrb, batch_dims=1),
+                tf.cast(systematic_G, tf.float32),
+            )
+            % 2
+        )
+
+        if self.order > 0:
+            if self.early_stopping:
+                reprocessed = tf.where(
+                    ~self.optimal(codewords, hard_decisions, sorted_llrs)
+                )
+                reprocessed_codewords = self.reprocess(
+                    tf.gather_nd(codewords, reprocessed),
+                    tf.gather_nd(hard_decisions, reprocessed),
+                    tf.gather_nd(sorted_llrs, reprocessed),
+                    tf.gather_nd(systematic_G, reprocessed),
+                )
+                codewords = tf.tensor_scatter_nd_update(
+                    codewords, reprocessed, reprocessed_codewords
+                )
+            else:
+                codewords = self.reprocess(
+                    codewords, hard_decisions, sorted_llrs, systematic_G
+                )
+
+        # Back to the positions of the received words
+        return tf.gather(codewords, tf.argsort(reliability_order), batch_dims=1)
+
+    def most_reliable_basis(self, reliability_order):
+        """
+        Batched Gaussian elimination over GF(2) of the generator matrix with its columns sorted by reliability.
+
+        Args:
+            reliability_order ([batch, n] tensor): positions sorted by decreasing reliability
+
+        Returns:
+            systematic_G ([batch, k, n] bool tensor): generator matrices in reduced row echelon form, the i-th row
+                has the only 1 of the i-th pivot column
+            mrb ([batch, k] tensor): pivot columns (most reliable basis), in increasing order
+        """
+        M = tf.transpose(tf.gather(self.G, reliability_order, axis=1), [1, 0, 2])
+        rows = tf.range(self.k)
+        rank = tf.zeros([tf.shape(M)[0]], dtype=tf.int32)
+        is_pivot = []
+        for j in range(self.n):
+            # First row (below the already reduced rows) with a 1 in the column
+            candidates = M[:, :, j] & (rows >= tf.expand_dims(rank, -1))
+            has_pivot = tf.reduce_any(candidates, axis=-1)
+            pivot = tf.where(
+                has_pivot,
+                tf.argmax(
+                    tf.cast(candidates, tf.int32), axis=-1, output_type=tf.int32
+                ),
+                rank,
+            )
+
+            # Swap the pivot row with the row `rank`
+            swap = tf.where(
+                rows == tf.expand_dims(rank, -1),
+                tf.expand_dims(pivot, -1),
+                tf.where(
+                    rows == tf.expand_dims(pivot, -1), tf.expand_dims(rank, -1), rows
+                ),
+            )
+            M = tf.gather(M, swap, batch_dims=1)
+
+            # Clear the column in every other row
+            pivot_row = tf.gather(M, tf.minimum(rank, self.k - 1), batch_dims=1)
+            flip = (
+                M[:, :, j]
+                & (rows != tf.expand_dims(rank, -1))
+                & tf.expand_dims(has_pivot, -1)
+            )
+            M = tf.math.logical_xor(
+                M, tf.expand_dims(flip, -1) & tf.expand_dims(pivot_row, -2)
+            )
+
+            is_pivot.append(has_pivot)
+            rank = rank + tf.cast(has_pivot, tf.int32)
+
+        is_pivot = tf.stack(is_pivot, axis=-1)
+        mrb = tf.argsort(tf.cast(~is_pivot, tf.int32), axis=-1, stable=True)
+        return M, mrb[:, : self.k]
+
+    def optimal(self, codewords, hard_decisions, llrs):
+        """
+        Sufficient ML condition [Taipale and Pursley, 1991]: a codeword c is ML when its discrepancy with the hard
+        decisions sum_{c_j != h_j} |llr_j| is at most the sum of the d_min - |{j: c_j != h_j}| smallest |llr_j|
+        over the positions where c_j = h_j.
+
+        Returns:
+            [batch] bool tensor
+        """
+        differences = tf.not_equal(codewords, hard_decisions)
+        reliabilities = tf.abs(llrs)
+        discrepancy = tf.reduce_sum(
+            tf.where(differences, reliabilities, 0.0), axis=-1
+        )
+        agreeing = tf.sort(
+            tf.where(differences, float("inf"), reliabilities), axis=-1
+        )
+        remaining = self.minimum_distance - tf.reduce_sum(
+            tf.cast(differences, tf.int32), axis=-1
+        )
+        bound = tf.reduce_sum(
+            tf.where(
+                tf.range(self.n) < tf.expand_dims(remaining, -1), agreeing, 0.0
+            ),
+            axis=-1,
+        )
+        return discrepancy <= bound
+
+    def reprocess(self, codewords, hard_decisions, llrs, systematic_G):
+        """
+        Reprocessing of order 1 to `order`: the codeword of the test pattern e is c ^ e.G (G in systematic form
+        on the MRB), its discrepancy with the hard decisions is linear in f = e.G:
+        D(c ^ f) = D(c) + sum_j f_j |llr_j| (1 - 2 (c_j ^ h_j)).
+
+        Returns:
+            [batch, n] tensor: codewords of minimal discrepancy
+        """
+        differences = tf.cast(tf.not_equal(codewords, hard_decisions), tf.float32)
+        reliabilities = tf.abs(llrs)
+        weights = reliabilities * (1.0 - 2.0 * differences)
+        systematic_G = tf.cast(systematic_G, tf.float32)
+        number_of_patterns = self.patterns.shape[0]
+
+        def condition(start, best_discrepancy, best_flips):
+            return start < number_of_patterns
+
+        def body(start, best_discrepancy, best_flips):
+            patterns = self.patterns[start : start + self.pattern_chunk_size]
+            flips = tf.einsum("pk,bkn->bpn", patterns, systematic_G) % 2
+            discrepancy = tf.reduce_sum(flips * tf.expand_dims(weights, -2), axis=-1)
+            index = tf.argmin(discrepancy, axis=-1, output_type=tf.int32)
+            chunk_discrepancy = tf.reduce_min(discrepancy, axis=-1)
+
+            improved = chunk_discrepancy < best_discrepancy
+            best_discrepancy = tf.where(
+                improved, chunk_discrepancy, best_discrepancy
+            )
+            best_flips = tf.where(
+                tf.expand_dims(improved, -1),
+                tf.gather(flips, index, batch_dims=1),
+                best_flips,
+            )
+            return start + self.pattern_chunk_size, best_discrepancy, best_flips
+
+        # Relative discrepancies: 0 for the order 0 codeword
+        (_, _, best_flips) = tf.while_loop(
+            condition,
+            body,
+            (
+                tf.constant(0),
+                tf.zeros_like(reliabilities[:, 0]),
+                tf.zeros_like(codewords),
+            ),
+        )
+        return tf.math.abs(codewords - best_flips)
@@ -0,0 +1,183 @@
+"""
+Batch Conventional BP decoder
+
+Brief: Vectorized (NumPy) batch version of the conventional BP decoder (sum-product and min-sum)
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+
+from .sum_product_algorithm import SumProduct, MinSum
+
+# Same clipping as SumProduct.check_to_variable_message
+CLIP_VALUE = 18.71497388
+
+
+class BatchFactorGraph:
+    """
+    Array-backed (TF-free) batch version of FactorGraph: the messages of a batch of codewords are
+    stored in [batch, n_edges] matrices indexed by the edges of H, and all the codewords are updated
+    at once with the same message semantics as SumProduct / MinSum and the same early stopping.
+
+    Args:
+        name (str): name of the graph
+        H ([n-k x n] array): parity-check matrix
+        systematic_bits ([n] boolean array): positions of the information bits in the codewords
+        algorithm (SumProduct or MinSum) [default=SumProduct()]: message-passing algorithm
+    """
+
+    def __init__(self, name, H, systematic_bits, algorithm=SumProduct()):
+        if not isinstance(algorithm, (SumProduct, MinSum)):
+            raise ValueError(f"Unsupported algorithm {type(algorithm).__name__}")
+        self.name = name
+        self.H = np.array(H, dtype=np.float64)
+        self.systematic_bits = np.array(systematic_bits)
+        self.algorithm = algorithm
+        self.number_check_nodes = self.H.shape[0]
+        self.number_variable_nodes = self.H.shape[1]
+        self.iterations = None
+
+        # Edges sorted by check node then by variable node
+        (check_indices, variable_indices) = np.nonzero(self.H)
+        self.n_edges = len(check_indices)
+        self.check_indices = check_indices
+        self.variable_indices = variable_indices
+
+        # [n_edges, n] incidence of the edges on the variable nodes
+        self.variable_incidence = np.zeros((self.n_edges, self.number_variable_nodes))
+        self.variable_incidence[np.arange(self.n_edges), variable_indices] = 1.0
+
+        # Check node layout: [m, max_degree] edge indices padded with n_edges (neutral element)
+        # and position of each edge in the flattened layout
+        check_degrees = np.bincount(check_indices, minlength=self.number_check_nodes)
+        max_degree = max(int(np.max(check_degrees)), 1)
+        first_edge = np.concatenate([[0], np.cumsum(check_degrees)])
+        positions = np.arange(self.n_edges) - first_edge[check_indices]
+        self.check_layout_indices = np.full(
+            (self.number_check_nodes, max_degree), self.n_edges
+        )
+        self.check_layout_indices[check_indices, positions] = np.arange(self.n_edges)
+        self.edge_layout_positions = check_indices * max_degree + positions
+
+    def __repr__(self):
+        return "{classname}({name}, {m} check nodes, {n} variable nodes, {e} edges)".format(
+            classname=type(self).__name__,
+            name=self.name,
+            m=self.number_check_nodes,
+            n=self.number_variable_nodes,
+            e=self.n_edges,
+        )
+
+    def _check_layout(self, edge_values, neutral_value):
+        # [batch, n_edges] -> [batch, m, max_degree]
+        padded = np.concatenate(
+            [edge_values, np.full((edge_values.shape[0], 1), neutral_value)], axis=1
+        )
+        return padded[:, self.check_layout_indices]
+
+    def _edge_layout(self, layout_values):
+        # [batch, m, max_degree] -> [batch, n_edges]
+        return layout_values.reshape(layout_values.shape[0], -1)[
+            :, self.edge_layout_positions
+        ]
+
+    @staticmethod
+    def _extrinsic_product(x):
+        # Leave-one-out products along the last axis (exclusive forward/backward products)
+        ones = np.ones(x.shape[:-1] + (1,))
+        forward = np.cumprod(np.concatenate([ones, x[..., :-1]], axis=-1), axis=-1)
+        backward = np.cumprod(np.concatenate([ones, x[..., :0:-1]], axis=-1), axis=-1)
+        backward = backward[..., ::-1]
+        return forward * backward
+
+    def _variables_to_checks_iteration(self, channel_values, check_to_variable):
+        # Channel value plus the messages of the other check nodes
+        variable_sums = channel_values + check_to_variable @ self.variable_incidence
+        return variable_sums[:, self.variable_indices] - check_to_variable
+
+    def _checks_to_variables_iteration(self, variable_to_check):
+        if isinstance(self.algorithm, SumProduct):
+            x = self._check_layout(np.tanh(variable_to_check / 2), 1.0)
+            product = self._edge_layout(self._extrinsic_product(x))
+            with np.errstate(divide="ignore"):
+                return 2 * np.clip(np.arctanh(product), -CLIP_VALUE, +CLIP_VALUE)
+
+        # MinSum: sign product and minimum magnitude of the other messages
+        signs = self._edge_layout(
+            self._extrinsic_product(self._check_layout(np.sign(variable_to_check), 1.0))
+        )
+        magnitudes = self._check_layout(np.abs(variable_to_check), np.inf)
+        first_index = np.argmin(magnitudes, axis=-1)[..., np.newaxis]
+        first_min = np.take_along_axis(magnitudes, first_index, axis=-1)
+        is_first_min = np.zeros(magnitudes.shape, dtype=bool)
+        np.put_along_axis(is_first_min, first_index, True, axis=-1)
+        second_min = np.min(
+            np.where(is_first_min, np.inf, magnitudes), axis=-1, keepdims=True
+        )
+        minimums = self._edge_layout(np.where(is_first_min, second_min, first_min))
+        return signs * minimums
+
+    def _decode_bit(self, LLRs):
+        return (-np.sign(LLRs) + 1) / 2
+
+    def _is_codeword(self, coded_words):
+        return np.sum(np.matmul(coded_words, np.transpose(self.H)) % 2, axis=-1) == 0
+
+    def decode(self, LLRs, max_iteration, min_iteration=0):
+        """
+        Decode a batch of codewords, each codeword stops as soon as its hard decisions satisfy the
+        parity checks (and at least min_iteration iterations have been run).
+
+        Args:
+            LLRs ([batch, n] array): channel LLRs
+            max_iteration (int): maximum number of iterations
+            min_iteration (int) [default=0]: minimum number of iterations
+
+        Returns:
+            [batch, k] array: decoded information bits (the number of iterations run for each
+            codeword is stored in the `iterations` attribute)
+        """
+        LLRs = np.array(LLRs, dtype=np.float64).reshape(-1, self.number_variable_nodes)
+        batch_size = LLRs.shape[0]
+        coded_words = self._decode_bit(LLRs)
+        self.iterations = np.zeros(batch_size, dtype=np.int64)
+
+        # Exit chart: If received coded word exists, i.e. C.H^T = 0
+        if min_iteration == 0:
+            active = np.nonzero(~self._is_codeword(coded_words))[0]
+        else:
+            active = np.arange(batch_size)
+
+        check_to_variable = np.zeros((len(active), self.n_edges))
+        for iteration in range(max_iteration):
+            if len(active) == 0:
+                break
+            channel_values = LLRs[active]
+            variable_to_check = self._variables_to_checks_iteration(
+                channel_values, check_to_variable
+            )
+            check_to_variable = self._checks_to_variables_iteration(variable_to_check)
+            values = channel_values + check_to_variable @ self.variable_incidence
+            coded_words[active] = self._decode_bit(values)
+            self.iterations[active] += 1
+
+            # Exit chart: freeze the codewords that satisfy C.H^T = 0
+            if (iteration + 1) >= min_iteration:
+                running = ~self._is_codeword(coded_words[active])
+                active = active[running]
+                check_to_variable = check_to_variable[running]
+
+        return coded_words[:, self.systematic_bits]
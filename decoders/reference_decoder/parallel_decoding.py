@@ -0,0 +1,217 @@
+"""
+Parallel Conventional BP decoder
+
+Brief: Process pool (shared memory) parallel decoding with the reference conventional BP decoders
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .sum_product_algorithm import SumProduct, FactorGraph
+from .batch_factor_graph import BatchFactorGraph
+
+ENGINES = {
+    "batch": BatchFactorGraph,
+    "reference": FactorGraph,
+}
+
+# Graph of the worker process, built once by the pool initializer
+_worker_graph = None
+
+
+def _init_worker(engine, name, H, systematic_bits, algorithm_class):
+    global _worker_graph
+    _worker_graph = ENGINES[engine](
+        name, H, systematic_bits, algorithm=algorithm_class()
+    )
+
+
+def _decode_shard(
+    llrs_name, words_name, shape, k, start, stop, max_iteration, min_iteration
+):
+    # Attach the shared LLRs / decoded words buffers (no copy of the batch through pickling)
+    llrs_memory = shared_memory.SharedMemory(name=llrs_name)
+    words_memory = shared_memory.SharedMemory(name=words_name)
+    try:
+        LLRs = np.ndarray(shape, dtype=np.float64, buffer=llrs_memory.buf)
+        words = np.ndarray((shape[0], k), dtype=np.float64, buffer=words_memory.buf)
+
+        begin = time.perf_counter()
+        words[start:stop] = np.array(
+            _worker_graph.decode(LLRs[start:stop], max_iteration, min_iteration)
+        )
+        duration = time.perf_counter() - begin
+        del LLRs, words
+    finally:
+        llrs_memory.close()
+        words_memory.close()
+    return os.getpid(), stop - start, duration
+
+
+class ParallelFactorGraphDecoder:
+    """
+    Parallel version of the reference decoders: the batch of LLRs is split into shards decoded
+    by a pool of processes. Each worker builds the graph once (pool initializer), the LLRs and the
+    decoded words are exchanged through shared memory and the decoded words keep the input order.
+
+    The pool is created at the first decode and kept until close() (or the end of a `with` block).
+
+    Args:
+        name (str): name of the graph
+        H ([n-k x n] array): parity-check matrix
+        systematic_bits ([n] boolean array): positions of the information bits in the codewords
+        algorithm (SumProduct or MinSum) [default=SumProduct()]: message-passing algorithm
+        engine (str) [default="batch"]: "batch" (BatchFactorGraph) or "reference" (FactorGraph)
+        max_workers (int) [default=None]: number of processes (defaults to the number of CPUs)
+        shard_size (int) [default=None]: number of codewords per task (defaults to 4 shards per worker)
+        mp_context (multiprocessing context) [default=None]: context used to start the workers, "spawn" when None
+            (forking a process with TensorFlow loaded can deadlock the workers)
+    """
+
+    def __init__(
+        self,
+        name,
+        H,
+        systematic_bits,
+        algorithm=SumProduct(),
+        engine="batch",
+        max_workers=None,
+        shard_size=None,
+        mp_context=None,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown reference decoder engine '{engine}'")
+        self.name = name
+        self.H = np.array(H)
+        self.systematic_bits = np.array(systematic_bits)
+        self.algorithm_class = type(algorithm)
+        self.engine = engine
+        self.max_workers = max_workers or os.cpu_count()
+        self.shard_size = shard_size
+        self.mp_context = (
+            multiprocessing.get_context("spawn") if mp_context is None else mp_context
+        )
+        self.n_information_bits = int(np.sum(self.systematic_bits))
+        self.worker_statistics = {}
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """shutdown the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(
+                    self.engine,
+                    self.name,
+                    self.H,
+                    self.systematic_bits,
+                    self.algorithm_class,
+                ),
+            )
+        return self._executor
+
+    def decode(self, LLRs, max_iteration, min_iteration=0):
+        """
+        Decode a batch of codewords in parallel.
+
+        Args:
+            LLRs ([batch, n] array): channel LLRs
+            max_iteration (int): maximum number of iterations
+            min_iteration (int) [default=0]: minimum number of iterations
+
+        Returns:
+            [batch, k] array: decoded information bits, in the order of the LLRs (the per worker
+            statistics of the decoding are stored in the `worker_statistics` attribute)
+        """
+        LLRs = np.asarray(LLRs, dtype=np.float64)
+        LLRs = LLRs.reshape(-1, self.H.shape[1])
+        batch_size = LLRs.shape[0]
+        shard_size = self.shard_size or max(
+            1, -(-batch_size // (4 * self.max_workers))
+        )
+
+        llrs_memory = shared_memory.SharedMemory(
+            create=True, size=max(LLRs.nbytes, 1)
+        )
+        words_memory = shared_memory.SharedMemory(
+            create=True, size=max(batch_size * self.n_information_bits * 8, 1)
+        )
+        try:
+            shared_llrs = np.ndarray(
+                LLRs.shape, dtype=np.float64, buffer=llrs_memory.buf
+            )
+            shared_llrs[:] = LLRs
+            executor = self._get_executor()
+            futures = [
+                executor.submit(
+                    _decode_shard,
+                    llrs_memory.name,
+                    words_memory.name,
+                    LLRs.shape,
+                    self.n_information_bits,
+                    start,
+                    min(start + shard_size, batch_size),
+                    max_iteration,
+                    min_iteration,
+                )
+                for start in range(0, batch_size, shard_size)
+            ]
+
+            statistics = {}
+            for future in futures:
+                (pid, n_codewords, duration) = future.result()
+                worker = statistics.setdefault(pid, {"codewords": 0, "seconds": 0.0})
+                worker["codewords"] += n_codewords
+                worker["seconds"] += duration
+            for worker in statistics.values():
+                worker["throughput"] = worker["codewords"] / max(
+                    worker["seconds"], 1e-12
+                )
+            self.worker_statistics = statistics
+
+            words = np.array(
+                np.ndarray(
+                    (batch_size, self.n_information_bits),
+                    dtype=np.float64,
+                    buffer=words_memory.buf,
+                )
+            )
+            del shared_llrs
+        finally:
+            llrs_memory.close()
+            llrs_memory.unlink()
+            words_memory.close()
+            words_memory.unlink()
+        return words
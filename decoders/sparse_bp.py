@@ -0,0 +1,232 @@
+"""
+Sparse GNBP RNN Cell
+
+Brief: Edge-list (Tanner graph) implementation of the GNBP RNN Cell, only the nonzero entries of H are processed
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+import tensorflow as tf
+from activations import (
+    AtanhTaylorApproxActivation,
+    AtanhActivation,
+)
+from regularizers import L2WeightRegularizer
+from .check_node import CHECK_NODE_ALGORITHMS, extrinsic_product, extrinsic_min_sum
+from .code_structure import get_code_structure
+
+
+class SparseGatedNeuralBeliefPropagationRNNCell(tf.keras.layers.Layer):
+    """
+    Edge-list implementation of the GNBP RNN cell.
+
+    The messages are only stored and computed on the edges of the Tanner graph of H, i.e. on the
+    nonzero entries of the parity-check matrix, using gather/segment operations instead of gating
+    dense [n_check_nodes * n_variable_nodes] vectors. The trainable weights keep the dense layout
+    (and names) of GatedNeuralBeliefPropagationRNNCell so that both cells share checkpoints, only
+    the entries corresponding to edges are used.
+
+    Args:
+        n_variable_nodes (int): number of variable nodes (code length n)
+        n_check_nodes (int): number of check nodes (n-k)
+        H ([n_check_nodes, n_variable_nodes] array): the (fixed) parity-check matrix defining the graph
+        trainable (bool) [default=True]: whether the factor graph weights are trainable
+        check_node_update (str) [default="prefix"]: "prefix" to compute the extrinsic products of each check node
+            from forward/backward cumulative products (linear in the check degree) or "repeat" to gather,
+            for each edge, the other edges of its check node (quadratic in the check degree)
+        algorithm (str) [default="sum-product"]: check node update rule, "sum-product", "min-sum",
+            "normalized-min-sum" or "offset-min-sum"
+        trainable_min_sum_factors (bool) [default=None]: whether the per-edge normalization/offset factors
+            are trainable (defaults to `trainable`)
+        normalization_factor (float) [default=0.8]: initial normalization factor (normalized min-sum)
+        offset_factor (float) [default=0.3]: initial offset factor (offset min-sum)
+    """
+
+    def __init__(
+        self,
+        n_variable_nodes,
+        n_check_nodes,
+        H,
+        trainable=True,
+        check_node_update="prefix",
+        algorithm="sum-product",
+        trainable_min_sum_factors=None,
+        normalization_factor=0.8,
+        offset_factor=0.3,
+        **kwargs,
+    ):
+
+        super(SparseGatedNeuralBeliefPropagationRNNCell, self).__init__(**kwargs)
+
+        if check_node_update not in ["prefix", "repeat"]:
+            raise ValueError(f"Unknown check node update '{check_node_update}'")
+        if algorithm not in CHECK_NODE_ALGORITHMS:
+            raise ValueError(f"Unknown check node algorithm '{algorithm}'")
+
+        self.n_variable_nodes = int(n_variable_nodes)
+        self.n_check_nodes = int(n_check_nodes)
+        self.check_node_update = check_node_update
+        self.algorithm = algorithm
+        self.normalization_factor = normalization_factor
+        self.offset_factor = offset_factor
+        self.factor_graph_trainable = trainable
+        self.min_sum_factors_trainable = (
+            trainable
+            if trainable_min_sum_factors is None
+            else trainable_min_sum_factors
+        )
+        self.trainable = trainable or (
+            self.min_sum_factors_trainable
+            and algorithm in ["normalized-min-sum", "offset-min-sum"]
+        )
+
+        H = np.array(H)
+        assert H.shape == (
+            self.n_check_nodes,
+            self.n_variable_nodes,
+        ), f"The provided parity-check matrix shape is {H.shape}. Expected ({self.n_check_nodes},{self.n_variable_nodes})"
+
+        # Edge lists and check node layouts (computed once per distinct H)
+        self.code_structure = get_code_structure(H)
+        self.n_edges = self.code_structure.n_edges
+        self.check_indices = self.code_structure.check_indices
+        self.variable_indices = self.code_structure.variable_indices
+        self.edge_indices = self.code_structure.edge_indices
+        self.extrinsic_indices = self.code_structure.extrinsic_indices
+        self.check_layout_indices = self.code_structure.check_layout_indices
+        self.edge_layout_positions = self.code_structure.edge_layout_positions
+        self.check_layout_weight_indices = (
+            self.code_structure.check_layout_weight_indices
+        )
+
+        self.state_size = tf.TensorShape([self.n_edges])
+        self.output_size = tf.TensorShape([self.n_variable_nodes])
+        self.atanh_activation_layer_eval = AtanhActivation()
+        self.atanh_activation_layer_training = AtanhTaylorApproxActivation(order=21)
+
+    def build(self, input_shape):
+
+        self.factor_graph_weights_sum = self.add_weight(
+            shape=(self.n_check_nodes * self.n_variable_nodes,),
+            initializer=tf.keras.initializers.Constant(1.0),
+            regularizer=L2WeightRegularizer(alpha=5e-2, mean=1),
+            name="factor_graph_weights_sum",
+            trainable=self.factor_graph_trainable,
+        )
+
+        self.factor_graph_weights_out = self.add_weight(
+            shape=(self.n_check_nodes * self.n_variable_nodes,),
+            initializer=tf.keras.initializers.Constant(1.0),
+            regularizer=L2WeightRegularizer(alpha=5e-2, mean=1),
+            name="factor_graph_weights_out",
+            trainable=self.factor_graph_trainable,
+        )
+
+        if self.algorithm == "normalized-min-sum":
+            self.factor_graph_weights_normalization = self.add_weight(
+                shape=(self.n_check_nodes * self.n_variable_nodes,),
+                initializer=tf.keras.initializers.Constant(self.normalization_factor),
+                name="factor_graph_weights_normalization",
+                trainable=self.min_sum_factors_trainable,
+            )
+
+        if self.algorithm == "offset-min-sum":
+            self.factor_graph_weights_offset = self.add_weight(
+                shape=(self.n_check_nodes * self.n_variable_nodes,),
+                initializer=tf.keras.initializers.Constant(self.offset_factor),
+                name="factor_graph_weights_offset",
+                trainable=self.min_sum_factors_trainable,
+            )
+
+    def _sum_over_variables(self, x):
+        # [batch, n_edges] -> [batch, n_variable_nodes]
+        x = tf.math.unsorted_segment_sum(
+            tf.transpose(x), self.variable_indices, self.n_variable_nodes
+        )
+        return tf.transpose(x)
+
+    def call(self, inputs, states, constants=None, training=False):
+        # The graph is fixed at construction, the constants (H) are ignored
+        llr = inputs
+        messages = tf.nest.flatten(states)[0]
+
+        sum_weights = tf.gather(self.factor_graph_weights_sum, self.edge_indices)
+        out_weights = tf.gather(self.factor_graph_weights_out, self.edge_indices)
+
+        ############################ SUM ITERATION ############################
+        weighted_messages = tf.multiply(messages, sum_weights)
+        variable_sums = llr + self._sum_over_variables(weighted_messages)
+        x = tf.gather(variable_sums, self.variable_indices, axis=-1) - weighted_messages
+
+        ############################ PRODUCT ITERATION ############################
+        if self.algorithm != "sum-product":
+            new_messages = self._min_sum_check_node_update(x)
+            return self._output(llr, new_messages, out_weights)
+
+        # TANH[x/2]
+        x = tf.tanh(x / 2)
+
+        # Extrinsic products
+        x = tf.concat([x, tf.ones_like(x[:, :1])], axis=-1)
+        if self.check_node_update == "prefix":
+            x = tf.gather(x, self.check_layout_indices, axis=-1)
+            x = extrinsic_product(x, axis=-1)
+            x = tf.reshape(x, [tf.shape(x)[0], -1])
+            x = tf.gather(x, self.edge_layout_positions, axis=-1)
+        else:
+            x = tf.gather(x, self.extrinsic_indices, axis=-1)
+            x = tf.reduce_prod(x, axis=-1)
+
+        # 2*ARCTANH
+        if training:
+            new_messages = 2 * self.atanh_activation_layer_training(x)
+        else:
+            new_messages = 2 * self.atanh_activation_layer_eval(x)
+
+        return self._output(llr, new_messages, out_weights)
+
+    def _min_sum_check_node_update(self, x):
+        normalization = None
+        offset = None
+        if self.algorithm == "normalized-min-sum":
+            normalization = tf.gather(
+                self.factor_graph_weights_normalization,
+                self.check_layout_weight_indices,
+            )
+        elif self.algorithm == "offset-min-sum":
+            offset = tf.gather(
+                self.factor_graph_weights_offset, self.check_layout_weight_indices
+            )
+
+        # Check node layout, the padding entries are masked out
+        x = tf.concat([x, tf.zeros_like(x[:, :1])], axis=-1)
+        x = tf.gather(x, self.check_layout_indices, axis=-1)
+        x = extrinsic_min_sum(
+            x,
+            self.check_layout_indices < self.n_edges,
+            normalization=normalization,
+            offset=offset,
+        )
+        x = tf.reshape(x, [tf.shape(x)[0], -1])
+        return tf.gather(x, self.edge_layout_positions, axis=-1)
+
+    def _output(self, llr, new_messages, out_weights):
+        ############################ OUTPUT ##########################################
+        outputs = llr + self._sum_over_variables(tf.multiply(new_messages, out_weights))
+
+        ############################ RETURN ############################
+
+        return tf.reshape(outputs, [-1, 1, self.n_variable_nodes]), new_messages
@@ -0,0 +1,236 @@
+"""
+Syndrome Decoder
+
+Brief: Hard-decision ML decoding by syndrome lookup in a table of coset leaders (codes with small n-k)
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+import numpy as np
+import tensorflow as tf
+
+from .code_structure import code_structure_key
+from .codebook import pack_bits, unpack_codewords
+
+# Largest number of syndromes (2^(n-k)) of a syndrome table
+MAX_SYNDROME_BITS = 24
+
+# Syndrome tables already computed, indexed by the hash of the parity-check matrix content
+_syndrome_tables = {}
+
+
+def syndrome_columns(H):
+    """syndrome contribution of each code bit, as an integer (bit i: check node i)"""
+    H = np.array(H, dtype=np.int64) % 2
+    return (2 ** np.arange(H.shape[0], dtype=np.int64)) @ H
+
+
+def _first_patterns(columns, weight, first):
+    """
+    Syndromes of the error patterns of `weight` bits whose first bit is `first`, and the first (lexicographic)
+    pattern of each syndrome.
+
+    Returns:
+        (syndromes [N] array, patterns [N x weight] array)
+    """
+    n = len(columns)
+    others = list(combinations(range(first + 1, n), weight - 1))
+    others = np.array(others, dtype=np.int64).reshape(len(others), weight - 1)
+    patterns = np.concatenate(
+        [np.full((len(others), 1), first, dtype=np.int64), others], axis=-1
+    )
+    syndromes = np.bitwise_xor.reduce(columns[patterns], axis=-1)
+    (syndromes, indices) = np.unique(syndromes, return_index=True)
+    return syndromes, patterns[indices]
+
+
+def build_syndrome_table(H, max_workers=None):
+    """
+    Table of coset leaders: for each syndrome, an error pattern of minimal weight with this syndrome. The error
+    patterns are enumerated by increasing weight (and in lexicographic order for a given weight) until all the
+    2^(n-k) syndromes are covered.
+
+    Args:
+        H ([n-k x n] array): full rank parity-check matrix
+        max_workers (int) [default=None]: number of processes enumerating the patterns of each weight (split by
+            first bit of the patterns). The enumeration runs in the calling process when None or 1
+
+    Returns:
+        [2^(n-k) x ceil(n / 64)] uint64 array: packed coset leaders (see pack_bits), indexed by the syndrome
+        integer (bit i: check node i)
+    """
+    (m, n) = np.shape(H)
+    if m > MAX_SYNDROME_BITS:
+        raise ValueError(
+            f"A syndrome table of {m} check nodes has 2^{m} entries (at most 2^{MAX_SYNDROME_BITS} supported)"
+        )
+    columns = syndrome_columns(H)
+    leaders = np.zeros((2**m, n), dtype=np.uint8)
+    covered = np.zeros(2**m, dtype=bool)
+    covered[0] = True
+
+    executor = ProcessPoolExecutor(max_workers) if (max_workers or 1) > 1 else None
+    try:
+        for weight in range(1, n + 1):
+            if np.all(covered):
+                break
+            firsts = range(n - weight + 1)
+            if executor is None:
+                results = [_first_patterns(columns, weight, first) for first in firsts]
+            else:
+                results = executor.map(
+                    _first_patterns,
+                    [columns] * len(firsts),
+                    [weight] * len(firsts),
+                    firsts,
+                )
+            # In order of the first bit: the lexicographic first pattern of each new syndrome is kept
+            for (syndromes, patterns) in results:
+                new = ~covered[syndromes]
+                (syndromes, patterns) = (syndromes[new], patterns[new])
+                leaders[np.repeat(syndromes, weight), patterns.reshape(-1)] = 1
+                covered[syndromes] = True
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if not np.all(covered):
+        raise ValueError("The parity-check matrix is not full rank")
+    return pack_bits(leaders)
+
+
+def get_syndrome_table(H, cache_dir=None, max_workers=None):
+    """
+    Cached syndrome table of H: it is computed once per distinct H (content hash) and process. With a cache
+    directory, it is also saved to (and memory-mapped from) the file syndrome_table_<hash>.npy, reused by the
+    next processes.
+
+    Args:
+        H ([n-k x n] array): parity-check matrix
+        cache_dir (str) [default=None]: directory of the syndrome table files
+        max_workers (int) [default=None]: number of processes building the table (see build_syndrome_table)
+
+    Returns:
+        [2^(n-k) x ceil(n / 64)] uint64 array: packed coset leaders
+    """
+    key = code_structure_key(H)
+    if key not in _syndrome_tables:
+        if cache_dir is None:
+            _syndrome_tables[key] = build_syndrome_table(H, max_workers)
+        else:
+            path = os.path.join(cache_dir, f"syndrome_table_{key}.npy")
+            if not os.path.isfile(path):
+                os.makedirs(cache_dir, exist_ok=True)
+                # Atomic write: concurrent studies never read a partial file
+                temporary_path = f"{path}.{os.getpid()}.tmp.npy"
+                np.save(temporary_path, build_syndrome_table(H, max_workers))
+                os.replace(temporary_path, path)
+            _syndrome_tables[key] = np.load(path, mmap_mode="r")
+    return _syndrome_tables[key]
+
+
+class SyndromeDecoder(tf.keras.Model):
+    """
+    Hard-decision ML decoder: the coset leader of the syndrome of the hard decisions (error pattern of minimal
+    weight) is looked up in a table of 2^(n-k) entries and removed from the hard decisions.
+
+    Args:
+        n (int): codewords length
+        k (int): number of information bits
+        H ([n-k x n] array) [default=None]: parity-check matrix (the table is otherwise built at the first call)
+        return_words (bool) [default=True]: return the decoded information words, i.e. the first k bits of the
+            codewords (systematic code, as the BP decoders), or the codewords (False)
+        cache_dir (str) [default=None]: directory of the syndrome table cache files
+        max_workers (int) [default=None]: number of processes building the table
+    """
+
+    # Symmetric decoder: the decoded error pattern only depends on the syndrome of the received word
+    symmetric = True
+
+    def __init__(
+        self,
+        n,
+        k,
+        H=None,
+        return_words=True,
+        cache_dir=None,
+        max_workers=None,
+        **kwargs,
+    ):
+        super(SyndromeDecoder, self).__init__(**kwargs)
+        if n - k > MAX_SYNDROME_BITS:
+            raise ValueError(
+                f"The syndrome table of a ({n},{k}) code has 2^{n - k} entries (at most 2^{MAX_SYNDROME_BITS} supported)"
+            )
+        self.n = n
+        self.k = k
+        self.return_words = return_words
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.table_generated = False
+
+        if H is not None:
+            self.init_table(H)
+
+    def init_table(self, H):
+        """build (or load) the syndrome table of H, which must be a concrete (eager) matrix"""
+        H = np.array(H, dtype=np.float32)
+        assert H.shape == (
+            self.n - self.k,
+            self.n,
+        ), f"The provided parity-check matrix shape {H.shape} doesn't match expected shape ({self.n - self.k},{self.n})"
+
+        table = get_syndrome_table(H, self.cache_dir, self.max_workers)
+        with tf.init_scope():
+            self.H = tf.constant(H)
+            # Packed coset leaders (uint64 bits viewed as int64)
+            self.table = tf.constant(np.asarray(table).view(np.int64))
+            self.syndrome_weights = tf.constant(
+                2 ** np.arange(self.n - self.k), dtype=tf.int32
+            )
+
+        self.table_generated = True
+        return self.table_generated
+
+    def call(self, inputs, training=False):
+        noisy_symbols, H, sigma2 = inputs
+        if not self.table_generated:
+            self.init_table(H)
+
+        # Hard decisions (bit 1 for negative LLRs, i.e. positive symbols)
+        hard_decisions = tf.cast(tf.cast(noisy_symbols, tf.float32) > 0, tf.float32)
+        codewords = self.decode(hard_decisions)
+        if self.return_words:
+            return codewords[:, : self.k]
+        return codewords
+
+    def decode(self, hard_decisions):
+        """
+        Args:
+            hard_decisions ([batch, n] tensor): received binary words
+
+        Returns:
+            [batch, n] tensor: decoded codewords
+        """
+        syndromes = tf.cast(
+            tf.matmul(hard_decisions, self.H, transpose_b=True) % 2, tf.int32
+        )
+        indices = tf.reduce_sum(syndromes * self.syndrome_weights, axis=-1)
+        leaders = unpack_codewords(tf.gather(self.table, indices), self.n)
+        return tf.abs(hard_decisions - tf.cast(leaders, hard_decisions.dtype))
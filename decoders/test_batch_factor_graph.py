@@ -0,0 +1,85 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import numpy as np
+
+from . import SumProduct, MinSum, FactorGraph, BatchFactorGraph
+from tools import load_code
+
+
+@pytest.mark.parametrize("codename", ["BCH_15_7", "BCH_31_16", "BCH_63_45"])
+@pytest.mark.parametrize("algorithm", [SumProduct, MinSum])
+@pytest.mark.parametrize("min_iteration", [0, 3])
+@pytest.mark.parametrize("noise_std", [0.5, 1.0])
+def test_batch_factor_graph_eq_factor_graph(
+    codename, algorithm, min_iteration, noise_std
+):
+    H = load_code(codename, "H_systematic")
+    (m, n) = H.shape
+    k = n - m
+    systematic_bits = [True] * k + [False] * (n - k)
+
+    rng = np.random.default_rng(14)
+    LLRs = 4.0 * (1.0 + noise_std * rng.normal(size=(50, n)))
+
+    reference = FactorGraph("F1", H, systematic_bits, algorithm=algorithm())
+    batch = BatchFactorGraph("F1", H, systematic_bits, algorithm=algorithm())
+
+    with np.errstate(divide="ignore"):
+        a = np.array(
+            reference.decode(LLRs, max_iteration=5, min_iteration=min_iteration)
+        )
+    b = batch.decode(LLRs, max_iteration=5, min_iteration=min_iteration)
+    np.testing.assert_array_equal(a, b)
+
+
+def test_batch_factor_graph_iterations():
+    H = load_code("BCH_31_16", "H_systematic")
+    (m, n) = H.shape
+    k = n - m
+    systematic_bits = [True] * k + [False] * (n - k)
+    batch = BatchFactorGraph("F1", H, systematic_bits, algorithm=MinSum())
+
+    # Noiseless all-zero codewords: no iteration is needed
+    decoded = batch.decode(np.full((10, n), 4.0), max_iteration=5)
+    np.testing.assert_array_equal(decoded, np.zeros((10, k)))
+    np.testing.assert_array_equal(batch.iterations, np.zeros(10))
+
+    # Minimum number of iterations
+    batch.decode(np.full((10, n), 4.0), max_iteration=5, min_iteration=2)
+    np.testing.assert_array_equal(batch.iterations, np.full(10, 2))
+
+    rng = np.random.default_rng(15)
+    batch.decode(4.0 * (1.0 + rng.normal(size=(200, n))), max_iteration=5)
+    assert np.all((batch.iterations >= 0) & (batch.iterations <= 5))
+    assert 0 < np.mean(batch.iterations) < 5
+
+
+def test_batch_factor_graph_single_codeword():
+    H = load_code("BCH_15_7", "H_systematic")
+    (m, n) = H.shape
+    k = n - m
+    systematic_bits = [True] * k + [False] * (n - k)
+    LLRs = 4.0 * (1.0 + np.random.default_rng(16).normal(size=n))
+
+    reference = FactorGraph("F1", H, systematic_bits)
+    batch = BatchFactorGraph("F1", H, systematic_bits)
+    np.testing.assert_array_equal(
+        np.array(reference.decode([LLRs], max_iteration=5)),
+        batch.decode(LLRs, max_iteration=5),
+    )
@@ -0,0 +1,110 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from . import MinDistanceDecoder, SyndromeDecoder, ChaseDecoder, Decoder
+from .chase_decoding import flip_patterns
+from tools import load_code
+
+
+def random_inputs(codename, batch=300, seed=1):
+    G = tf.constant(load_code(codename), dtype=tf.float32)
+    H = tf.constant(load_code(codename, "H_systematic"), dtype=tf.float32)
+    n = G.shape[1]
+    noisy_symbols = -1.0 + 0.75 * tf.random.stateless_normal([batch, n], seed=[7, seed])
+    sigma2 = tf.constant(0.5625, dtype=tf.float32)
+    return noisy_symbols, G, H, sigma2
+
+
+def correlation(noisy_symbols, codewords):
+    return tf.reduce_sum(-noisy_symbols * (1.0 - 2.0 * codewords), axis=-1)
+
+
+def test_flip_patterns():
+    assert flip_patterns(0).shape == (1, 0)
+    np.testing.assert_array_equal(flip_patterns(2), [[0, 0], [1, 0], [0, 1], [1, 1]])
+
+
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_15_7"])
+def test_chase_no_flip_eq_syndrome(codename):
+    noisy_symbols, G, H, sigma2 = random_inputs(codename)
+    k, n = G.shape
+    chase = ChaseDecoder(n=n, k=k, H=H, n_flips=0)
+    syndrome = SyndromeDecoder(n=n, k=k, H=H)
+    tf.debugging.assert_equal(
+        chase([noisy_symbols, G, H, sigma2]), syndrome([noisy_symbols, H, sigma2])
+    )
+
+
+@pytest.mark.parametrize("return_words", [True, False])
+def test_chase_all_flips_eq_ml(return_words):
+    # Every word is a test word: every codeword is a candidate
+    noisy_symbols, G, H, sigma2 = random_inputs("BCH_7_4")
+    chase = ChaseDecoder(n=7, k=4, H=H, n_flips=7, return_words=return_words)
+    ml = MinDistanceDecoder(n=7, k=4, G=G, return_words=return_words)
+    tf.debugging.assert_equal(
+        chase([noisy_symbols, G, H, sigma2]), ml([noisy_symbols, G, sigma2])
+    )
+
+
+@pytest.mark.parametrize("codename", ["BCH_15_7", "BCH_31_16"])
+def test_chase_improves_with_flips(codename):
+    noisy_symbols, G, H, sigma2 = random_inputs(codename)
+    k, n = G.shape
+    ml = MinDistanceDecoder(n=n, k=k, G=G, return_words=False)
+    best = correlation(noisy_symbols, ml([noisy_symbols, G, sigma2]))
+
+    previous = None
+    for n_flips in range(5):
+        chase = ChaseDecoder(n=n, k=k, H=H, n_flips=n_flips, return_words=False)
+        codewords = chase([noisy_symbols, G, H, sigma2])
+        tf.debugging.assert_equal(
+            tf.reduce_sum(tf.matmul(codewords, H, transpose_b=True) % 2), 0.0
+        )
+        metric = correlation(noisy_symbols, codewords)
+        # The test patterns of fewer flips are a subset of the test patterns
+        if previous is not None:
+            tf.debugging.assert_greater_equal(metric, previous - 1e-4)
+        tf.debugging.assert_less_equal(metric, best + 1e-4)
+        previous = metric
+
+
+def test_chase_graph_mode():
+    noisy_symbols, G, H, sigma2 = random_inputs("BCH_15_7", batch=64)
+    chase = ChaseDecoder(n=15, k=7, H=H, n_flips=3)
+    tf.debugging.assert_equal(
+        tf.function(chase)([noisy_symbols, G, H, sigma2]),
+        chase([noisy_symbols, G, H, sigma2]),
+    )
+
+
+def test_chase_invalid_flips():
+    with pytest.raises(ValueError):
+        ChaseDecoder(n=7, k=4, n_flips=8)
+
+
+def test_decoder_chase_conf():
+    noisy_symbols, G, H, sigma2 = random_inputs("BCH_15_7", batch=64)
+    decoder = Decoder(15, 8, 7, conf="Chase", H=H, chase_n_flips=2)
+    expected = ChaseDecoder(n=15, k=7, H=H, n_flips=2)([noisy_symbols, G, H, sigma2])
+    tf.debugging.assert_equal(decoder([noisy_symbols, G, H, sigma2]), expected)
+
+    with pytest.raises(ValueError):
+        Decoder(15, 8, 7, conf="Chase", H=H, fallback="OSD")
@@ -0,0 +1,87 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+import numpy as np
+
+from . import DecoderA, DecoderStandardBP
+from .check_node import extrinsic_product
+from tools import load_code
+
+
+def test_extrinsic_product():
+    x = tf.constant(
+        [[0.5, -0.2, 0.9, 1.0], [0.0, 0.3, -0.7, 0.1], [0.0, 0.0, 0.4, -0.6]],
+        dtype=tf.float32,
+    )
+    expected = np.array(
+        [[np.prod(np.delete(row, i)) for i in range(len(row))] for row in x.numpy()]
+    )
+    tf.debugging.assert_near(extrinsic_product(x), expected, atol=1e-7)
+
+
+def test_extrinsic_product_gradient_with_zeros():
+    x = tf.constant([[0.0, 0.3, -0.7, 0.1]], dtype=tf.float32)
+    with tf.GradientTape() as tape:
+        tape.watch(x)
+        y = tf.reduce_sum(extrinsic_product(x))
+    gradient = tape.gradient(y, x)
+    tf.debugging.assert_all_finite(gradient, "extrinsic product gradient")
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+@pytest.mark.parametrize("decoder_class", [DecoderStandardBP, DecoderA])
+@pytest.mark.parametrize("training", [False, True])
+def test_prefix_eq_repeat_check_node_update(engine, decoder_class, training):
+    H = tf.constant(load_code("BCH_31_16", "H_non_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    trainable = decoder_class is DecoderA
+
+    tf.random.set_seed(2)
+    llrs = tf.random.uniform(shape=[100, n], minval=-2.0, maxval=+2.0)
+
+    models = [
+        decoder_class(
+            n, m, k, 5, trainable, engine=engine, H=H, check_node_update=update
+        )
+        for update in ["repeat", "prefix"]
+    ]
+    a, b = [model([llrs, H, 1.0], training=training) for model in models]
+    # Same products up to float rounding
+    tf.debugging.assert_near(a, b, atol=1e-3)
+    tf.debugging.assert_equal(tf.math.round(a), tf.math.round(b))
+
+
+def test_prefix_check_node_update_is_trainable():
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    model = DecoderA(n, m, n - m, 5, True, check_node_update="prefix")
+    llrs = tf.random.uniform(shape=[10, n], minval=-2.0, maxval=+2.0)
+    llrs = llrs * tf.cast(tf.range(n) % 3 != 0, tf.float32)  # includes zero messages
+    with tf.GradientTape() as tape:
+        outputs = model([llrs, H, 1.0], training=True)
+        loss = tf.reduce_mean(outputs)
+    gradients = tape.gradient(loss, model.trainable_variables)
+    assert all(g is not None for g in gradients)
+    for g in gradients:
+        tf.debugging.assert_all_finite(g, "GNBP gradient")
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,131 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+import numpy as np
+
+from . import DecoderA, DecoderStandardBP, GatedNeuralBeliefPropagationRNNCell
+from . import get_code_structure
+from .code_structure import factor_graph_gates
+from tools import load_code
+
+
+def test_code_structure_cache():
+    H_systematic = load_code("BCH_15_7", "H_systematic")
+    H_non_systematic = load_code("BCH_15_7", "H_non_systematic")
+
+    structure = get_code_structure(H_systematic)
+    # Same content (other object / dtype): cached structure
+    assert get_code_structure(np.copy(H_systematic)) is structure
+    assert get_code_structure(tf.constant(H_systematic, dtype=tf.float32)) is structure
+    assert get_code_structure(H_non_systematic) is not structure
+
+    # Cells of the same code share the structure
+    cell_a = GatedNeuralBeliefPropagationRNNCell(15, 8, H=H_systematic)
+    cell_b = GatedNeuralBeliefPropagationRNNCell(15, 8, H=np.copy(H_systematic))
+    assert cell_a.code_structure is cell_b.code_structure is structure
+
+
+def test_factor_graph_gates():
+    H_systematic = load_code("BCH_15_7", "H_systematic")
+    structure = get_code_structure(H_systematic)
+
+    np.testing.assert_array_equal(
+        structure.factor_graph_gate.numpy(), H_systematic.reshape(-1)
+    )
+    np.testing.assert_array_equal(
+        structure.prod_gate_weights.numpy(), H_systematic[::-1].reshape(-1)
+    )
+    np.testing.assert_array_equal(
+        structure.prod_gate_bias.numpy(), 1 - H_systematic[::-1].reshape(-1)
+    )
+    for (a, b) in zip(
+        factor_graph_gates(tf.constant(H_systematic, dtype=tf.float32)),
+        (
+            structure.factor_graph_gate,
+            structure.prod_gate_weights,
+            structure.prod_gate_bias,
+        ),
+    ):
+        tf.debugging.assert_equal(a, b)
+
+
+@pytest.mark.parametrize("decoder_class", [DecoderStandardBP, DecoderA])
+@pytest.mark.parametrize("training", [False, True])
+def test_fixed_code_eq_trainable_code_path(decoder_class, training):
+    H = load_code("BCH_31_16", "H_non_systematic")
+    H = tf.convert_to_tensor(H, dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    trainable = decoder_class is DecoderA
+
+    tf.random.set_seed(12)
+    symbols = tf.random.uniform(shape=[100, n], minval=-2.0, maxval=+2.0)
+
+    # Fixed code (precompiled structure) vs code provided at call (gates computed per decoding)
+    model_a = decoder_class(n, m, k, 5, trainable, H=H)
+    model_b = decoder_class(n, m, k, 5, trainable)
+    model_a([symbols, H, 1.0])
+    model_b([symbols, H, 1.0])
+    model_b.set_weights(model_a.get_weights())
+    assert model_a.RNN_cell.code_structure is not None
+    assert model_b.RNN_cell.code_structure is None
+
+    a = model_a([symbols, H, 1.0], training=training)
+    b = model_b([symbols, H, 1.0], training=training)
+    tf.debugging.assert_near(a, b, atol=1e-5)
+
+
+def test_trainable_code_gradient():
+    H = load_code("BCH_15_7", "H_non_systematic")
+    (m, n) = H.shape
+    k = n - m
+    H = tf.Variable(tf.convert_to_tensor(H, dtype=tf.float32))
+
+    tf.random.set_seed(13)
+    symbols = tf.random.uniform(shape=[20, n], minval=-2.0, maxval=+2.0)
+    model = DecoderA(n, m, k, 3)
+    with tf.GradientTape() as tape:
+        loss = tf.reduce_sum(model([symbols, H, 1.0], training=True))
+
+    # The code is not fixed: the gradient flows to H through the gates
+    gradient = tape.gradient(loss, H)
+    assert gradient is not None
+    assert np.any(tf.convert_to_tensor(gradient).numpy() != 0.0)
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+def test_fixed_code_rejects_other_H(engine):
+    H_systematic = load_code("BCH_15_7", "H_systematic")
+    H_non_systematic = load_code("BCH_15_7", "H_non_systematic")
+    (m, n) = H_systematic.shape
+    H = tf.constant(H_systematic, dtype=tf.float32)
+    model = DecoderStandardBP(n, m, n - m, 5, engine=engine, H=H_systematic)
+    symbols = tf.random.uniform(shape=[10, n], minval=-2.0, maxval=+2.0)
+    model([symbols, H, 1.0])
+
+    # Other code (same shape or not)
+    for other_H in [H_non_systematic, H_systematic[:-1]]:
+        with pytest.raises(ValueError):
+            model([symbols, tf.constant(other_H, dtype=tf.float32), 1.0])
+
+    # Symbolic H: compared in the graph
+    decode = tf.function(lambda H: model([symbols, H, 1.0]))
+    decode(tf.Variable(H))
+    with pytest.raises(tf.errors.InvalidArgumentError):
+        decode(tf.Variable(tf.constant(H_non_systematic, dtype=tf.float32)))
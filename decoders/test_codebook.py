@@ -0,0 +1,115 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from . import MinDistanceDecoder
+from .codebook import (
+    pack_bits,
+    unpack_bits,
+    build_packed_codebook,
+    get_packed_codebook,
+    minimum_weight_codewords,
+    generator_key,
+    pack_codewords,
+    unpack_codewords,
+    hamming_distances,
+)
+from tools import load_code
+
+
+@pytest.mark.parametrize("n", [1, 15, 64, 65, 130])
+def test_pack_bits(n):
+    bits = np.random.default_rng(n).integers(0, 2, size=(20, n))
+    packed = pack_bits(bits)
+    assert packed.shape == (20, -(-n // 64))
+    np.testing.assert_array_equal(unpack_bits(packed, n), bits)
+
+    packed_tensor = pack_codewords(tf.constant(bits))
+    np.testing.assert_array_equal(packed_tensor.numpy().view(np.uint64), packed)
+    np.testing.assert_array_equal(unpack_codewords(packed_tensor, n), bits)
+
+
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_15_7", "BCH_63_36"])
+def test_packed_codebook(codename):
+    G = load_code(codename)[:10]
+    (k, n) = G.shape
+    codebook = unpack_bits(build_packed_codebook(G), n)
+    words = (np.arange(2**k)[:, None] >> np.arange(k)) & 1
+    np.testing.assert_array_equal(codebook, (words @ G) % 2)
+
+
+@pytest.mark.parametrize(
+    "codename,weight,count",
+    [("BCH_7_4", 3, 7), ("BCH_15_7", 5, 18), ("hamming_8_4", 4, 14)],
+)
+def test_minimum_weight_codewords(codename, weight, count):
+    G = load_code(codename)
+    codewords = minimum_weight_codewords(G, chunk_size=5)
+    assert codewords.shape == (count, G.shape[1])
+    np.testing.assert_array_equal(codewords.sum(axis=-1), weight)
+    # Distinct codewords of the code
+    assert len(np.unique(codewords, axis=0)) == count
+    codebook = unpack_bits(build_packed_codebook(G), G.shape[1])
+    assert all((codebook == c).all(axis=-1).any() for c in codewords)
+
+
+def test_codebook_disk_cache(tmp_path):
+    G = load_code("BCH_15_7")
+    # Not in the in-memory cache yet: a different G with the same code
+    G = np.concatenate([G[1:], G[:1]])
+    codebook = get_packed_codebook(G, cache_dir=str(tmp_path))
+    path = tmp_path / f"codebook_{generator_key(G)}.npy"
+    assert path.is_file()
+    assert isinstance(codebook, np.memmap)
+    np.testing.assert_array_equal(np.load(path), build_packed_codebook(G))
+    assert get_packed_codebook(G, cache_dir=str(tmp_path)) is codebook
+
+
+def test_hamming_distances():
+    rng = np.random.default_rng(1)
+    words = rng.integers(0, 2, size=(7, 70))
+    codewords = rng.integers(0, 2, size=(9, 70))
+    distances = hamming_distances(
+        pack_codewords(tf.constant(words)), pack_codewords(tf.constant(codewords))
+    )
+    np.testing.assert_array_equal(
+        distances, np.sum(words[:, None, :] != codewords[None, :, :], axis=-1)
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [None, 10])
+def test_hard_decision_decoding(chunk_size):
+    G = tf.constant(load_code("BCH_15_7"), dtype=tf.float32)
+    (k, n) = G.shape
+    noisy_symbols = -1.0 + 0.8 * tf.random.stateless_normal([200, n], seed=[9, 1])
+    sigma2 = tf.constant(0.64, dtype=tf.float32)
+
+    decoder = MinDistanceDecoder(
+        n, k, G=G, return_words=False, metric="hamming", chunk_size=chunk_size
+    )
+    decoded = decoder([noisy_symbols, G, sigma2])
+
+    # First codeword at minimal Hamming distance of the hard decisions
+    hard_decisions = tf.cast(noisy_symbols > 0, tf.float32)
+    differences = tf.expand_dims(hard_decisions, -2) - decoder.possible_codewords
+    distances = tf.reduce_sum(tf.abs(differences), axis=-1)
+    expected = tf.gather(decoder.possible_codewords, tf.argmin(distances, axis=-1))
+    tf.debugging.assert_equal(decoded, expected)
@@ -0,0 +1,94 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+import numpy as np
+import os
+
+from autoencoders import AutoEncoder
+from . import DecoderA, DecoderStandardBP
+from tools import load_code
+
+
+@pytest.mark.parametrize("core,atol", [("unrolled", 0.0), ("xla", 2e-3)])
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+@pytest.mark.parametrize("decoder_class", [DecoderStandardBP, DecoderA])
+@pytest.mark.parametrize("training", [False, True])
+def test_core_eq_rnn(core, atol, engine, decoder_class, training):
+    H = tf.constant(load_code("BCH_31_16", "H_non_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    trainable = decoder_class is DecoderA
+
+    tf.random.set_seed(10)
+    symbols = tf.random.uniform(shape=[100, n], minval=-2.0, maxval=+2.0)
+
+    model_a = decoder_class(n, m, k, 5, trainable, engine=engine, H=H)
+    model_b = decoder_class(n, m, k, 5, trainable, engine=engine, H=H, core=core)
+    model_a([symbols, H, 1.0])
+    model_b([symbols, H, 1.0])
+    model_b.set_weights(model_a.get_weights())
+
+    a = model_a([symbols, H, 1.0], training=training)
+    b = model_b([symbols, H, 1.0], training=training)
+    # Same ops for the unrolled core, XLA fuses the tanh/atanh activations (float rounding differences, up to 1.4e-3)
+    if atol == 0.0:
+        tf.debugging.assert_equal(a, b)
+    else:
+        tf.debugging.assert_near(a, b, atol=atol)
+    tf.debugging.assert_equal(tf.math.round(a), tf.math.round(b))
+
+
+def test_unknown_core():
+    with pytest.raises(ValueError):
+        DecoderStandardBP(7, 3, 4, core="while")
+
+
+@pytest.mark.parametrize("core,atol", [("unrolled", 0.0), ("xla", 1e-2)])
+def test_core_loads_study_checkpoint(core, atol):
+    models_path = os.path.join("./", "study-ae-31-16/models/")
+    G = tf.constant(
+        np.loadtxt(os.path.join(models_path, "AE_GNBP_0/matrices/G.csv")),
+        dtype=tf.float32,
+    )
+    H = tf.constant(
+        np.loadtxt(os.path.join(models_path, "AE_GNBP_0/matrices/H.csv")),
+        dtype=tf.float32,
+    )
+    ckpt_path = os.path.join(models_path, "checkpoint", "checkpoint.tf")
+
+    tf.random.set_seed(11)
+    noisy_symbols = tf.random.normal(shape=[200, 31])
+
+    outputs = []
+    for decoder_core in ["rnn", core]:
+        model = AutoEncoder(31, 16, 5, "A", 0.0, G=G, H=H, decoder_core=decoder_core)
+        model(tf.zeros([1, 16]))
+        model.load_weights(ckpt_path).expect_partial()
+        (G_model, H_model) = model.code_generator(tf.constant([1]))
+        outputs.append(model.decoder([noisy_symbols, G_model, H_model, 0.5]))
+
+    # The checkpoint weights are restored (input ponderation trained away from 1)
+    assert not np.allclose(model.decoder.decoder.input_ponderation.numpy(), 1.0)
+    # Same ops for the unrolled core, XLA fuses the activations (float rounding differences amplified by the trained
+    # weights, up to 6.5e-3)
+    if atol == 0.0:
+        tf.debugging.assert_equal(outputs[0], outputs[1])
+    else:
+        tf.debugging.assert_near(outputs[0], outputs[1], atol=atol)
+    tf.debugging.assert_equal(tf.math.round(outputs[0]), tf.math.round(outputs[1]))
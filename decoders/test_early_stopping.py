@@ -0,0 +1,192 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+import numpy as np
+import os
+
+from . import DecoderA, DecoderStandardBP
+from . import MinSum, FactorGraph
+from .decoder import early_stopping_decoding, syndrome_satisfied
+from autoencoders import AutoEncoder
+from tools import load_code
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+@pytest.mark.parametrize("n_iter", [1, 5])
+def test_early_stopping_eq_reference_min_sum(engine, n_iter):
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    systematic_bits = [True] * k + [False] * (n - k)
+
+    tf.random.set_seed(6)
+    symbols = -1.0 + tf.random.normal(shape=[100, n], stddev=0.6)
+
+    model_a = DecoderStandardBP(
+        n_variable_nodes=n,
+        n_check_nodes=m,
+        n_information_bits=k,
+        n_iter=n_iter,
+        engine=engine,
+        H=H,
+        algorithm="min-sum",
+        early_stopping=True,
+    )
+    # The reference decoder stops as soon as the syndrome is satisfied
+    model_b = FactorGraph("F1", H.numpy(), systematic_bits, algorithm=MinSum())
+
+    sigma2 = 1.0
+    a = tf.math.round(model_a([symbols, H, sigma2]))
+    b = model_b.decode(
+        (-1.0) * 4 * symbols.numpy() / sigma2, max_iteration=n_iter, min_iteration=0
+    )
+    b = tf.constant(np.array(b), dtype=tf.float32)
+    tf.debugging.assert_equal(a, b, summarize=-1)
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+@pytest.mark.parametrize("decoder_class", [DecoderStandardBP, DecoderA])
+def test_early_stopping_iterations(engine, decoder_class):
+    H = tf.constant(load_code("BCH_31_16", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    n_iter = 5
+
+    model = decoder_class(
+        n_variable_nodes=n,
+        n_check_nodes=m,
+        n_information_bits=k,
+        n_iter=n_iter,
+        engine=engine,
+        H=H,
+        early_stopping=True,
+    )
+
+    # Noiseless all-zero codewords: no iteration is needed
+    symbols = -tf.ones([10, n])
+    outputs = tf.function(model)([symbols, H, 1.0])
+    tf.debugging.assert_equal(tf.math.round(outputs), tf.zeros([10, k]))
+    assert model.metrics[0].result().numpy() == 0.0
+
+    tf.random.set_seed(7)
+    symbols = -1.0 + tf.random.normal(shape=[200, n], stddev=0.5)
+    _, iterations = early_stopping_decoding(
+        model.RNN_cell, -4.0 * symbols, H, n_iter
+    )
+    assert np.all(iterations.numpy() >= 0) and np.all(iterations.numpy() <= n_iter)
+    assert 0 < np.mean(iterations.numpy()) < n_iter
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+def test_early_stopping_sequences(engine):
+    H = tf.constant(load_code("BCH_31_16", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    n_iter = 5
+
+    model = DecoderStandardBP(
+        n_variable_nodes=n,
+        n_check_nodes=m,
+        n_information_bits=n - m,
+        n_iter=n_iter,
+        engine=engine,
+        H=H,
+    )
+    tf.random.set_seed(8)
+    llrs = -4.0 * (-1.0 + tf.random.normal(shape=[200, n], stddev=0.5))
+    model([llrs, H, 1.0])
+
+    outputs, iterations = early_stopping_decoding(
+        model.RNN_cell, llrs, H, n_iter, return_sequences=True
+    )
+    last_outputs, _ = early_stopping_decoding(model.RNN_cell, llrs, H, n_iter)
+    assert outputs.shape == (200, n_iter, n)
+    tf.debugging.assert_equal(outputs[:, -1], last_outputs)
+
+    # The outputs of the converged codewords are frozen
+    for i in range(n_iter - 1):
+        converged = iterations.numpy() <= i + 1
+        tf.debugging.assert_equal(
+            tf.boolean_mask(outputs[:, i + 1], converged),
+            tf.boolean_mask(last_outputs, converged),
+        )
+
+
+def test_early_stopping_training_path():
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+
+    tf.random.set_seed(9)
+    symbols = tf.random.uniform(shape=[20, n], minval=-2.0, maxval=+2.0)
+
+    model = DecoderA(n, m, k, n_iter=3, early_stopping=True)
+    reference = DecoderA(n, m, k, n_iter=3)
+    model([symbols, H, 1.0])
+    reference([symbols, H, 1.0])
+    for (weight, reference_weight) in zip(
+        model.trainable_weights, reference.trainable_weights
+    ):
+        reference_weight.assign(weight)
+
+    # Early termination only applies at inference
+    tf.debugging.assert_equal(
+        model([symbols, H, 1.0], training=True),
+        reference([symbols, H, 1.0], training=True),
+    )
+
+
+def test_early_stopping_trained_ponderations():
+    models_path = os.path.join("./", "study-ae-31-16/models/")
+    ckpt_path = os.path.join(models_path, "checkpoint", "checkpoint.tf")
+    G = tf.constant(
+        np.loadtxt(os.path.join(models_path, "AE_GNBP_0/matrices/G.csv")),
+        dtype=tf.float32,
+    )
+    H = tf.constant(
+        np.loadtxt(os.path.join(models_path, "AE_GNBP_0/matrices/H.csv")),
+        dtype=tf.float32,
+    )
+
+    tf.random.set_seed(10)
+    symbols = -1.0 + tf.random.normal(shape=[500, 31], stddev=0.6)
+
+    decoders = []
+    for early_stopping in [False, True]:
+        model = AutoEncoder(
+            31, 16, 5, "A", 0.0, G=G, H=H, decoder_early_stopping=early_stopping
+        )
+        model(tf.zeros([1, 16]))
+        model.load_weights(ckpt_path).expect_partial()
+        decoders.append(model.decoder.decoder)
+    (reference, decoder) = decoders
+    # Trained ponderations (combination of the iterations away from the plain average)
+    assert not np.allclose(decoder.out_ponderation.numpy(), 1.0)
+    assert not np.allclose(decoder.skip_connection_ponderation.numpy(), 1.0)
+
+    (H_model, sigma2) = (model.code_generator(tf.constant([1]))[1], 0.36)
+    llrs = decoder([symbols, H_model, sigma2], return_llrs=True)
+    reference_llrs = reference([symbols, H_model, sigma2], return_llrs=True)
+    iterations = decoder.metrics[0].result().numpy()
+    assert 0 < iterations < 5
+
+    # Same decisions, the decisions of the frozen codewords satisfy the parity checks
+    tf.debugging.assert_equal(llrs < 0, reference_llrs < 0)
+    tf.debugging.assert_equal(
+        syndrome_satisfied(llrs, H_model), syndrome_satisfied(reference_llrs, H_model)
+    )
@@ -0,0 +1,137 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from . import Decoder, DecoderStandardBP, HybridDecoder, MinDistanceDecoder
+from .decoder import syndrome_satisfied
+from autoencoders import AutoEncoder
+from dataset import random_messages_dataset
+from tools import load_code
+
+
+def test_hybrid_decoder():
+    G = tf.constant(load_code("BCH_31_16"), dtype=tf.float32)
+    H = tf.constant(load_code("BCH_31_16", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    noisy_symbols = -1.0 + 0.7 * tf.random.stateless_normal([300, n], seed=[8, 1])
+    sigma2 = tf.constant(0.49, dtype=tf.float32)
+
+    bp = DecoderStandardBP(n, m, k, n_iter=5, H=H)
+    ml = MinDistanceDecoder(n, k, G=G)
+    hybrid = HybridDecoder(bp, ml)
+    decoded = hybrid([noisy_symbols, G, H, sigma2])
+
+    # BP decisions for the codewords satisfying the parity checks, ML decisions otherwise
+    llrs = bp([noisy_symbols, H, sigma2], return_llrs=True)
+    valid = syndrome_satisfied(llrs, H)
+    expected = tf.where(
+        tf.expand_dims(valid, -1),
+        bp([noisy_symbols, H, sigma2]),
+        ml([noisy_symbols, G, sigma2]),
+    )
+    tf.debugging.assert_equal(decoded, expected)
+    assert 0 < tf.reduce_sum(tf.cast(~valid, tf.int32)) < 300
+
+    escalation_fraction = {metric.name: metric for metric in hybrid.metrics}[
+        "escalation_fraction"
+    ]
+    np.testing.assert_allclose(
+        escalation_fraction.result(), np.mean(~valid.numpy()), rtol=1e-6
+    )
+
+
+def test_hybrid_decoder_per_sample_noise_power():
+    G = tf.constant(load_code("BCH_31_16"), dtype=tf.float32)
+    H = tf.constant(load_code("BCH_31_16", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    noisy_symbols = -1.0 + 0.7 * tf.random.stateless_normal([300, n], seed=[8, 2])
+    # Per sample noise power [batch, 1]
+    sigma2 = tf.random.stateless_uniform([300, 1], seed=[8, 3], minval=0.3, maxval=0.7)
+
+    hybrid = HybridDecoder(
+        DecoderStandardBP(n, m, k, n_iter=5, H=H), MinDistanceDecoder(n, k, G=G)
+    )
+    decoded = hybrid([noisy_symbols, G, H, sigma2])
+    for i in [0, 17, 299]:
+        tf.debugging.assert_equal(
+            tf.round(decoded[i : i + 1]),
+            tf.round(hybrid([noisy_symbols[i : i + 1], G, H, sigma2[i]])),
+        )
+
+
+@pytest.mark.parametrize("fallback", ["ML", "OSD", "BP"])
+def test_decoder_fallback(fallback):
+    G = tf.constant(load_code("BCH_15_7"), dtype=tf.float32)
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    noisy_symbols = -1.0 + 0.7 * tf.random.stateless_normal([100, n], seed=[8, 2])
+    sigma2 = tf.constant(0.49, dtype=tf.float32)
+
+    decoder = Decoder(n, m, k, n_iter=2, conf="BP", H=H, fallback=fallback)
+    decoded = tf.math.round(decoder([noisy_symbols, G, H, sigma2]))
+    errors = tf.reduce_sum(tf.cast(tf.reduce_any(decoded != 0, axis=-1), tf.int32))
+
+    bp = Decoder(n, m, k, n_iter=2, conf="BP", H=H)
+    bp_decoded = tf.math.round(bp([noisy_symbols, G, H, sigma2]))
+    bp_errors = tf.reduce_sum(
+        tf.cast(tf.reduce_any(bp_decoded != 0, axis=-1), tf.int32)
+    )
+    assert errors <= bp_errors
+
+
+def test_decoder_fallback_average_iterations():
+    G = tf.constant(load_code("BCH_15_7"), dtype=tf.float32)
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    model = AutoEncoder(
+        n,
+        k,
+        2,
+        "BP",
+        0.0,
+        G=G,
+        H=H,
+        trainable_code=False,
+        trainable_decoder=False,
+        decoder_early_stopping=True,
+        decoder_fallback="BP",
+    )
+    model.compile(loss="binary_crossentropy")
+    logs = model.evaluate(
+        random_messages_dataset(k, batch=100, seed=3).take(2),
+        verbose=0,
+        return_dict=True,
+    )
+    # Average iterations of both stages
+    assert logs["average_iterations"] <= 2
+    assert logs["fallback_average_iterations"] <= 20
+    assert logs["escalation_fraction"] > 0
+
+
+def test_decoder_fallback_errors():
+    with pytest.raises(ValueError):
+        Decoder(15, 8, 7, conf="ML", fallback="OSD")
+    with pytest.raises(ValueError):
+        Decoder(15, 8, 7, conf="BP", fallback="Chase")
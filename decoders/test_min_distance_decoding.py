@@ -56,3 +56,96 @@ def test_min_distance_decoding():
     tf.debugging.assert_equal(
         model([noisy_symbols, G, sigma2]), true_ML_decoding_outputs
     )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 32, 128, 1000])
+@pytest.mark.parametrize("return_words", [True, False])
+@pytest.mark.parametrize("metric", ["correlation", "distance"])
+def test_chunked_eq_min_distance_decoding(chunk_size, return_words, metric):
+    (n, k) = (15, 7)
+    G = tf.concat(
+        [
+            tf.eye(k),
+            tf.cast(
+                tf.random.stateless_uniform(
+                    [k, n - k], seed=[4, 2], maxval=2, dtype=tf.int32
+                ),
+                tf.float32,
+            ),
+        ],
+        axis=-1,
+    )
+    noisy_symbols = tf.random.stateless_normal([100, n], seed=[1, 3])
+    sigma2 = tf.constant(0.5, dtype=tf.float32)
+
+    model = MinDistanceDecoder(
+        n=n, k=k, G=G, return_words=return_words, metric=metric
+    )
+    chunked_model = MinDistanceDecoder(
+        n=n,
+        k=k,
+        G=G,
+        return_words=return_words,
+        chunk_size=chunk_size,
+        metric=metric,
+    )
+    tf.debugging.assert_equal(
+        chunked_model([noisy_symbols, G, sigma2]), model([noisy_symbols, G, sigma2])
+    )
+
+    # Ties (the all-zero noisy symbols are at the same distance of every codeword): the first codeword is kept
+    zeros = tf.zeros([3, n])
+    tf.debugging.assert_equal(
+        chunked_model([zeros, G, sigma2]), model([zeros, G, sigma2])
+    )
+
+
+def test_chunked_min_distance_decoding_graph():
+    G = tf.constant([[1, 0, 1], [0, 1, 1]], dtype=tf.float32)
+    model = MinDistanceDecoder(n=3, k=2, G=G, return_words=True, chunk_size=3)
+    noisy_symbols = tf.constant([[-1, -1, +0.5], [+1, -0.5, -1]], dtype=tf.float32)
+    sigma2 = tf.constant(1.0, dtype=tf.float32)
+    decode = tf.function(lambda x: model([x, G, sigma2]))
+    tf.debugging.assert_equal(
+        decode(noisy_symbols), tf.constant([[0, 0], [1, 1]], dtype=tf.float32)
+    )
+
+
+def test_chunk_size_must_be_positive():
+    with pytest.raises(ValueError):
+        MinDistanceDecoder(n=3, k=2, chunk_size=0)
+
+
+def test_correlation_is_ml():
+    (n, k) = (15, 7)
+    G = tf.concat(
+        [
+            tf.eye(k),
+            tf.cast(
+                tf.random.stateless_uniform(
+                    [k, n - k], seed=[5, 2], maxval=2, dtype=tf.int32
+                ),
+                tf.float32,
+            ),
+        ],
+        axis=-1,
+    )
+    noisy_symbols = tf.random.stateless_normal([200, n], seed=[7, 3])
+    sigma2 = tf.constant(0.5, dtype=tf.float32)
+    model = MinDistanceDecoder(n=n, k=k, G=G, return_words=False)
+    codewords = model([noisy_symbols, G, sigma2])
+
+    # ML for BPSK (bit 0 -> -1) over AWGN: minimal euclidean distance to the modulated codewords
+    symbols = 2.0 * model.possible_codewords - 1.0
+    squared_distances = tf.reduce_sum(
+        tf.square(tf.expand_dims(noisy_symbols, axis=-2) - symbols), axis=-1
+    )
+    ml_codewords = tf.gather(
+        model.possible_codewords, tf.argmin(squared_distances, axis=-1)
+    )
+    tf.debugging.assert_equal(codewords, ml_codewords)
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        MinDistanceDecoder(n=3, k=2, metric="euclidean")
@@ -0,0 +1,161 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+import numpy as np
+
+from . import Decoder, DecoderStandardBP
+from . import MinSum, FactorGraph
+from .check_node import extrinsic_min_sum
+from tools import load_code
+
+
+def test_extrinsic_min_sum():
+    x = np.array(
+        [[0.5, -0.2, 0.9, 1.0], [-3.0, 0.3, -0.7, 0.1], [2.0, 0.0, 0.4, -0.6]],
+        dtype=np.float32,
+    )
+    mask = np.array([[1, 1, 1, 0], [1, 1, 1, 1], [1, 0, 0, 0]], dtype=np.float32)
+    expected = np.zeros_like(x)
+    for c in range(x.shape[0]):
+        edges = np.nonzero(mask[c])[0]
+        for v in edges:
+            others = x[c, edges[edges != v]]
+            if len(others) > 0:
+                expected[c, v] = np.prod(np.sign(others)) * np.min(np.abs(others))
+
+    y = extrinsic_min_sum(tf.constant(x), tf.constant(mask)).numpy()
+    np.testing.assert_allclose(y * mask, expected, atol=1e-7)
+
+    y = extrinsic_min_sum(tf.constant(x), tf.constant(mask), normalization=0.5)
+    np.testing.assert_allclose(y.numpy() * mask, 0.5 * expected, atol=1e-7)
+
+    y = extrinsic_min_sum(tf.constant(x), tf.constant(mask), offset=0.25)
+    expected = np.sign(expected) * np.maximum(np.abs(expected) - 0.25, 0.0)
+    np.testing.assert_allclose(y.numpy() * mask, expected, atol=1e-7)
+
+
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+@pytest.mark.parametrize("n_iter", [1, 5])
+def test_decoder_model_eq_min_sum(engine, n_iter):
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    systematic_bits = [True] * k + [False] * (n - k)
+
+    tf.random.set_seed(3)
+    llrs = tf.random.uniform(shape=[50, n], minval=-2.0, maxval=+2.0)
+
+    model_a = DecoderStandardBP(
+        n_variable_nodes=n,
+        n_check_nodes=m,
+        n_information_bits=k,
+        n_iter=n_iter,
+        trainable=False,
+        engine=engine,
+        H=H,
+        algorithm="min-sum",
+    )
+    model_b = FactorGraph("F1", H.numpy(), systematic_bits, algorithm=MinSum())
+
+    sigma = 1.0
+    a = tf.math.round(model_a([llrs, H, sigma]))
+    b = model_b.decode(
+        (-1.0) * 4 * llrs.numpy() / sigma,
+        max_iteration=n_iter,
+        min_iteration=n_iter,
+    )
+    b = tf.constant(np.array(b), dtype=tf.float32)
+    tf.debugging.assert_equal(a, b, summarize=-1)
+
+
+@pytest.mark.parametrize(
+    "algorithm", ["min-sum", "normalized-min-sum", "offset-min-sum"]
+)
+def test_dense_eq_sparse_min_sum(algorithm):
+    H = tf.constant(load_code("BCH_31_16", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+
+    tf.random.set_seed(4)
+    llrs = tf.random.uniform(shape=[100, n], minval=-2.0, maxval=+2.0)
+
+    outputs = []
+    for engine in ["dense", "sparse"]:
+        model = DecoderStandardBP(
+            n_variable_nodes=n,
+            n_check_nodes=m,
+            n_information_bits=k,
+            n_iter=5,
+            engine=engine,
+            H=H,
+            algorithm=algorithm,
+        )
+        outputs.append(model([llrs, H, 1.0]))
+    tf.debugging.assert_near(outputs[0], outputs[1], atol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "conf,weight_name",
+    [
+        ("NMS", "factor_graph_weights_normalization"),
+        ("OMS", "factor_graph_weights_offset"),
+    ],
+)
+@pytest.mark.parametrize("engine", ["dense", "sparse"])
+def test_trainable_min_sum_factors(conf, weight_name, engine):
+    G = tf.constant(load_code("BCH_15_7"), dtype=tf.float32)
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+
+    model = Decoder(
+        n_variable_nodes=n,
+        n_check_nodes=m,
+        n_information_bits=k,
+        n_iter=3,
+        trainable=True,
+        conf=conf,
+        engine=engine,
+        H=H,
+    )
+
+    tf.random.set_seed(5)
+    symbols = tf.random.uniform(shape=[20, n], minval=-2.0, maxval=+2.0)
+    with tf.GradientTape() as tape:
+        outputs = model([symbols, G, H, 1.0], training=True)
+        loss = tf.reduce_sum(outputs)
+
+    # Only the per-edge min-sum factors are trained, the BP weights stay frozen
+    assert len(model.trainable_weights) == 1
+    assert weight_name in model.trainable_weights[0].name
+    gradient = tf.convert_to_tensor(tape.gradient(loss, model.trainable_weights)[0])
+    assert np.any(gradient.numpy() != 0.0)
+
+    frozen = Decoder(
+        n_variable_nodes=n,
+        n_check_nodes=m,
+        n_information_bits=k,
+        n_iter=3,
+        trainable=False,
+        conf=conf,
+        engine=engine,
+        H=H,
+    )
+    frozen([symbols, G, H, 1.0])
+    assert len(frozen.trainable_weights) == 0
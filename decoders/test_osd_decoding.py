@@ -0,0 +1,94 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from . import MinDistanceDecoder, OrderedStatisticsDecoder, Decoder
+from .osd_decoding import error_patterns
+from tools import load_code
+
+
+def test_error_patterns():
+    assert error_patterns(7, 0).shape == (0, 7)
+    assert error_patterns(7, 3).shape == (7 + 21 + 35, 7)
+    np.testing.assert_array_equal(error_patterns(3, 1), np.eye(3))
+
+
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_15_7", "BCH_31_16"])
+@pytest.mark.parametrize("return_words", [True, False])
+def test_osd_eq_ml(codename, return_words):
+    G = tf.constant(load_code(codename), dtype=tf.float32)
+    (k, n) = G.shape
+    noisy_symbols = -1.0 + 0.75 * tf.random.stateless_normal([300, n], seed=[6, 1])
+    sigma2 = tf.constant(0.5625, dtype=tf.float32)
+
+    ml = MinDistanceDecoder(n=n, k=k, G=G, return_words=return_words)
+    # Order k-1 (every codeword is a test codeword): ML
+    osd = OrderedStatisticsDecoder(
+        n=n, k=k, G=G, order=min(k - 1, 3), return_words=return_words
+    )
+    expected = ml([noisy_symbols, G, sigma2])
+    decoded = osd([noisy_symbols, G, sigma2])
+    if k - 1 <= 3:
+        tf.debugging.assert_equal(decoded, expected)
+    else:
+        # Near ML
+        errors = tf.reduce_any(decoded != expected, axis=-1)
+        assert tf.reduce_sum(tf.cast(errors, tf.int32)) <= 3
+
+
+@pytest.mark.parametrize("order", [0, 1, 2])
+def test_osd_early_stopping(order):
+    G = tf.constant(load_code("BCH_31_16"), dtype=tf.float32)
+    (k, n) = G.shape
+    noisy_symbols = -1.0 + 0.6 * tf.random.stateless_normal([200, n], seed=[6, 2])
+    sigma2 = tf.constant(0.36, dtype=tf.float32)
+
+    decoders = [
+        OrderedStatisticsDecoder(
+            n=n, k=k, G=G, order=order, early_stopping=False, return_words=False
+        ),
+        OrderedStatisticsDecoder(n=n, k=k, G=G, order=order, return_words=False),
+        OrderedStatisticsDecoder(
+            n=n, k=k, G=G, order=order, minimum_distance=7, return_words=False
+        ),
+    ]
+    (reference, *early_stopping) = [
+        decoder([noisy_symbols, G, sigma2]) for decoder in decoders
+    ]
+
+    # Valid codewords
+    H = tf.constant(load_code("BCH_31_16", "H_systematic"), dtype=tf.float32)
+    tf.debugging.assert_equal(tf.matmul(reference, H, transpose_b=True) % 2, 0.0)
+    # The optimality test only skips codewords which are ML
+    for decoded in early_stopping:
+        tf.debugging.assert_equal(decoded, reference)
+
+
+def test_osd_decoder_conf():
+    G = tf.constant(load_code("BCH_15_7"), dtype=tf.float32)
+    decoder = Decoder(15, 8, 7, conf="OSD", osd_order=1)
+    assert decoder.decoder.order == 1
+    noisy_symbols = -tf.ones([4, 15])
+    tf.debugging.assert_equal(
+        decoder([noisy_symbols, G, None, tf.constant(1.0)]), tf.zeros([4, 7])
+    )
+    with pytest.raises(ValueError):
+        OrderedStatisticsDecoder(n=15, k=7, order=4)
@@ -0,0 +1,63 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import numpy as np
+
+from . import MinSum, BatchFactorGraph, ParallelFactorGraphDecoder
+from tools import load_code
+
+
+@pytest.mark.parametrize("engine", ["batch", "reference"])
+def test_parallel_decoding_eq_batch_factor_graph(engine):
+    H = load_code("BCH_15_7", "H_systematic")
+    (m, n) = H.shape
+    k = n - m
+    systematic_bits = [True] * k + [False] * (n - k)
+    LLRs = 4.0 * (1.0 + np.random.default_rng(17).normal(size=(37, n)))
+
+    batch = BatchFactorGraph("F1", H, systematic_bits, algorithm=MinSum())
+    expected = batch.decode(LLRs, max_iteration=5)
+
+    with ParallelFactorGraphDecoder(
+        "F1",
+        H,
+        systematic_bits,
+        algorithm=MinSum(),
+        engine=engine,
+        max_workers=2,
+        shard_size=5,
+    ) as decoder:
+        with np.errstate(divide="ignore"):
+            decoded = decoder.decode(LLRs, max_iteration=5)
+        # The pool is reused across calls
+        with np.errstate(divide="ignore"):
+            decoded_again = decoder.decode(LLRs[:3], max_iteration=5)
+
+    np.testing.assert_array_equal(decoded, expected)
+    np.testing.assert_array_equal(decoded_again, expected[:3])
+
+    statistics = decoder.worker_statistics
+    assert 1 <= len(statistics) <= 2
+    assert sum(worker["codewords"] for worker in statistics.values()) == 3
+    assert all(worker["throughput"] > 0 for worker in statistics.values())
+
+
+def test_parallel_decoding_unknown_engine():
+    H = load_code("BCH_15_7", "H_systematic")
+    with pytest.raises(ValueError):
+        ParallelFactorGraphDecoder("F1", H, [True] * 7 + [False] * 8, engine="gpu")
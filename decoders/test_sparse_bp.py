@@ -0,0 +1,69 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+import numpy as np
+
+from . import DecoderA, DecoderStandardBP
+from tools import load_code
+
+
+@pytest.mark.parametrize("codename", ["BCH_15_7", "BCH_31_16", "BCH_63_45"])
+@pytest.mark.parametrize("decoder_class", [DecoderStandardBP, DecoderA])
+@pytest.mark.parametrize("training", [False, True])
+def test_sparse_engine_eq_dense_engine(codename, decoder_class, training):
+    H = tf.constant(load_code(codename, "H_non_systematic"), dtype=tf.float32)
+    (m, n) = H.shape
+    k = n - m
+    n_iter = 5
+    trainable = decoder_class is DecoderA
+
+    tf.random.set_seed(1)
+    llrs = tf.random.uniform(shape=[100, n], minval=-2.0, maxval=+2.0)
+
+    dense_model = decoder_class(n, m, k, n_iter, trainable, engine="dense")
+    sparse_model = decoder_class(n, m, k, n_iter, trainable, engine="sparse", H=H)
+
+    dense_model([llrs, H, 1.0])
+    sparse_model([llrs, H, 1.0])
+    # Both engines share the same weights layout, compared with the same random weights (per edge gather of the
+    # trainable weights)
+    assert [w.shape for w in dense_model.weights] == [
+        w.shape for w in sparse_model.weights
+    ]
+    rng = np.random.default_rng(1)
+    weights = [
+        rng.uniform(0.5, 1.5, size=w.shape).astype(np.float32)
+        for w in dense_model.weights
+    ]
+    dense_model.set_weights(weights)
+    sparse_model.set_weights(weights)
+
+    a = dense_model([llrs, H, 1.0], training=training)
+    b = sparse_model([llrs, H, 1.0], training=training)
+    tf.debugging.assert_near(a, b, atol=1e-3)
+    tf.debugging.assert_equal(tf.math.round(a), tf.math.round(b))
+
+
+def test_sparse_engine_requires_H():
+    with pytest.raises(ValueError):
+        DecoderStandardBP(15, 8, 7, 5, False, engine="sparse")
+
+
+if __name__ == "__main__":
+    pytest.main()
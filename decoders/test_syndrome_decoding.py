@@ -0,0 +1,139 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import pytest
+
+import numpy as np
+import os
+import tensorflow as tf
+
+from . import MinDistanceDecoder, SyndromeDecoder, Decoder
+from .codebook import unpack_bits
+from .syndrome_decoding import build_syndrome_table, get_syndrome_table
+from tools import load_code
+
+
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_15_7", "BCH_31_16"])
+def test_syndrome_table(codename):
+    H = load_code(codename, "H_systematic").astype(np.int64)
+    (m, n) = H.shape
+    leaders = unpack_bits(build_syndrome_table(H), n)
+    assert leaders.shape == (2**m, n)
+
+    # The leader of each syndrome has this syndrome
+    syndromes = (leaders @ H.T % 2) @ (2 ** np.arange(m))
+    np.testing.assert_array_equal(syndromes, np.arange(2**m))
+
+    # Minimal weight: every error pattern of weight <= 2 weighs at least its coset leader
+    patterns = np.concatenate(
+        [np.zeros((1, n)), np.eye(n)]
+        + [np.eye(n)[i] + np.eye(n)[i + 1 :] for i in range(n - 1)]
+    ).astype(np.int64)
+    pattern_syndromes = (patterns @ H.T % 2) @ (2 ** np.arange(m))
+    assert np.all(leaders[pattern_syndromes].sum(-1) <= patterns.sum(-1))
+
+
+def test_syndrome_table_workers():
+    H = load_code("BCH_15_7", "H_systematic")
+    np.testing.assert_array_equal(
+        build_syndrome_table(H, max_workers=2), build_syndrome_table(H)
+    )
+
+
+def test_syndrome_table_not_full_rank():
+    H = load_code("BCH_7_4", "H_systematic")
+    with pytest.raises(ValueError):
+        build_syndrome_table(np.concatenate([H, H[:1]]))
+
+
+def test_syndrome_table_cache(tmp_path):
+    H = load_code("BCH_15_7", "H_non_systematic")
+    table = get_syndrome_table(H, cache_dir=str(tmp_path))
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].startswith("syndrome_table_")
+    np.testing.assert_array_equal(np.load(tmp_path / files[0]), table)
+    np.testing.assert_array_equal(table, build_syndrome_table(H))
+
+
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_15_7", "BCH_31_16"])
+def test_syndrome_eq_hard_decision_ml(codename):
+    G = tf.constant(load_code(codename), dtype=tf.float32)
+    H = tf.constant(load_code(codename, "H_systematic"), dtype=tf.float32)
+    (k, n) = G.shape
+    noisy_symbols = -1.0 + 0.75 * tf.random.stateless_normal([500, n], seed=[6, 2])
+    sigma2 = tf.constant(0.5625, dtype=tf.float32)
+    hard_decisions = tf.cast(noisy_symbols > 0, tf.float32)
+
+    decoder = SyndromeDecoder(n=n, k=k, H=H, return_words=False)
+    codewords = decoder([noisy_symbols, H, sigma2])
+    tf.debugging.assert_equal(
+        tf.reduce_sum(tf.matmul(codewords, H, transpose_b=True) % 2), 0.0
+    )
+
+    # Same Hamming distance to the hard decisions as the exhaustive hard-decision ML decoder (ties may differ)
+    ml = MinDistanceDecoder(n=n, k=k, G=G, return_words=False, metric="hamming")
+    expected = ml([noisy_symbols, G, sigma2])
+    tf.debugging.assert_equal(
+        tf.reduce_sum(tf.abs(codewords - hard_decisions), axis=-1),
+        tf.reduce_sum(tf.abs(expected - hard_decisions), axis=-1),
+    )
+
+    # Words: first k bits of the codewords (systematic G)
+    words = SyndromeDecoder(n=n, k=k, H=H)([noisy_symbols, H, sigma2])
+    tf.debugging.assert_equal(words, codewords[:, :k])
+
+
+def test_syndrome_corrects_t_errors():
+    # BCH_15_7: t = 2
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    errors = np.zeros((3, 15), dtype=np.float32)
+    errors[1, 4] = errors[2, [0, 14]] = 1.0
+    # All-zero codeword: BPSK symbols -1, flipped to +1 by the errors
+    noisy_symbols = tf.constant(2.0 * errors - 1.0)
+
+    decoder = SyndromeDecoder(n=15, k=7, return_words=False)
+    decoded = decoder([noisy_symbols, H, tf.constant(1.0)])
+    tf.debugging.assert_equal(decoded, tf.zeros([3, 15]))
+
+
+def test_syndrome_graph_mode():
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    decoder = SyndromeDecoder(n=15, k=7, H=H)
+    noisy_symbols = -1.0 + 0.75 * tf.random.stateless_normal([64, 15], seed=[6, 3])
+    sigma2 = tf.constant(0.5625)
+    tf.debugging.assert_equal(
+        tf.function(decoder)([noisy_symbols, H, sigma2]),
+        decoder([noisy_symbols, H, sigma2]),
+    )
+
+
+def test_syndrome_too_many_check_nodes():
+    with pytest.raises(ValueError):
+        SyndromeDecoder(n=63, k=30)
+
+
+def test_decoder_syndrome_conf():
+    H = tf.constant(load_code("BCH_15_7", "H_systematic"), dtype=tf.float32)
+    G = tf.constant(load_code("BCH_15_7"), dtype=tf.float32)
+    decoder = Decoder(15, 8, 7, conf="syndrome", H=H)
+    noisy_symbols = -1.0 + 0.75 * tf.random.stateless_normal([64, 15], seed=[6, 4])
+    sigma2 = tf.constant(0.5625)
+    expected = SyndromeDecoder(n=15, k=7, H=H)([noisy_symbols, H, sigma2])
+    tf.debugging.assert_equal(decoder([noisy_symbols, G, H, sigma2]), expected)
+
+    with pytest.raises(ValueError):
+        Decoder(15, 8, 7, conf="syndrome", H=H, fallback="ML")
@@ -0,0 +1,124 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from . import MinDistanceDecoder, TrellisDecoder, Decoder, ml_decoder_algorithm
+from .gf2 import gf2_null_space, gf2_inverse, gf2_row_reduce
+from tools import load_code
+
+
+def non_systematic(G):
+    # Same code, generated by a non systematic matrix with permuted columns
+    (k, n) = G.shape
+    rng = np.random.default_rng(3)
+    A = np.tril(np.ones((k, k)))
+    return ((A @ G) % 2)[:, rng.permutation(n)]
+
+
+def test_gf2():
+    G = non_systematic(load_code("BCH_15_7"))
+    H = gf2_null_space(G)
+    assert H.shape == (8, 15)
+    np.testing.assert_array_equal((G @ H.T) % 2, 0)
+    assert len(gf2_row_reduce(H)[1]) == 8
+
+    (_, pivots) = gf2_row_reduce(G)
+    np.testing.assert_array_equal(
+        (gf2_inverse(G[:, pivots]) @ G[:, pivots]) % 2, np.eye(7)
+    )
+    with pytest.raises(ValueError):
+        gf2_inverse(np.ones((2, 2)))
+
+
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_15_7"])
+@pytest.mark.parametrize("systematic", [True, False])
+@pytest.mark.parametrize("return_words", [True, False])
+def test_viterbi_eq_min_distance_decoding(codename, systematic, return_words):
+    G = load_code(codename)
+    if not systematic:
+        G = non_systematic(G)
+    (k, n) = G.shape
+    G = tf.constant(G, dtype=tf.float32)
+    noisy_symbols = -1.0 + 0.8 * tf.random.stateless_normal([200, n], seed=[2, 5])
+    sigma2 = tf.constant(0.64, dtype=tf.float32)
+
+    ml = MinDistanceDecoder(n=n, k=k, G=G, return_words=return_words)
+    trellis = TrellisDecoder(
+        n=n, k=k, G=G, return_words=return_words, batch_size=64
+    )
+    tf.debugging.assert_equal(
+        trellis([noisy_symbols, G, sigma2]), ml([noisy_symbols, G, sigma2])
+    )
+
+
+def test_bcjr_eq_exhaustive_map():
+    G = non_systematic(load_code("BCH_15_7"))
+    (k, n) = G.shape
+    G = tf.constant(G, dtype=tf.float32)
+    noisy_symbols = -1.0 + 0.8 * tf.random.stateless_normal([50, n], seed=[4, 5])
+    sigma2 = tf.constant(0.64, dtype=tf.float32)
+
+    trellis = TrellisDecoder(n=n, k=k, G=G, soft_output=True, batch_size=16)
+    app_llrs = trellis([noisy_symbols, G, sigma2])
+
+    # Exhaustive a posteriori LLRs of the code bits
+    codewords = MinDistanceDecoder(n=n, k=k, G=G).possible_codewords.numpy()
+    llrs = (-4.0 * noisy_symbols / sigma2).numpy().astype(np.float64)
+    log_likelihoods = llrs @ (1.0 - 2.0 * codewords).T / 2.0
+    expected = np.stack(
+        [
+            np.logaddexp.reduce(
+                np.where(codewords[:, j] == 0, log_likelihoods, -np.inf), axis=-1
+            )
+            - np.logaddexp.reduce(
+                np.where(codewords[:, j] == 1, log_likelihoods, -np.inf), axis=-1
+            )
+            for j in range(n)
+        ],
+        axis=-1,
+    )
+    np.testing.assert_allclose(app_llrs, expected, rtol=1e-4, atol=1e-3)
+
+
+def test_ml_decoder_algorithm():
+    assert ml_decoder_algorithm(31, 16) == "codebook"
+    assert ml_decoder_algorithm(63, 45) == "trellis"
+    assert ml_decoder_algorithm(63, 18) == "codebook"
+
+    decoder = Decoder(63, 18, 45, conf="ML")
+    assert type(decoder.decoder).__name__ == "TrellisDecoder"
+    decoder = Decoder(15, 8, 7, conf="ML", ml_algorithm="trellis")
+    assert type(decoder.decoder).__name__ == "TrellisDecoder"
+    decoder = Decoder(15, 8, 7, conf="ML")
+    assert type(decoder.decoder).__name__ == "MinDistanceDecoder"
+    with pytest.raises(ValueError):
+        Decoder(15, 8, 7, conf="ML", ml_algorithm="sphere")
+    # Neither the trellis nor the codebook is supported, e.g. BCH_63_36 (2^27 states, 2^36 codewords) or BCH_127_64
+    with pytest.raises(ValueError):
+        ml_decoder_algorithm(63, 36)
+    with pytest.raises(ValueError):
+        ml_decoder_algorithm(127, 64)
+    with pytest.raises(ValueError):
+        Decoder(127, 63, 64, conf="ML")
+
+
+def test_too_many_states():
+    with pytest.raises(ValueError):
+        TrellisDecoder(n=63, k=36)
@@ -0,0 +1,298 @@
+"""
+Trellis Decoder
+
+Brief: Exact ML (Viterbi) and bitwise MAP (BCJR) decoders over the syndrome trellis of a linear block code
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+import tensorflow as tf
+
+from .gf2 import gf2_null_space, gf2_information_set
+from .min_distance_decoding import MinDistanceDecoder
+
+# Largest number of trellis states (2^(n-k)) supported by the trellis decoder
+MAX_TRELLIS_STATE_BITS = 24
+# A trellis state update costs about 2^7 multiply-accumulates of the codebook search (measured on BCH_31_16)
+TRELLIS_COST_BITS = 7
+# Largest codebook (2^k codewords) selected by the automatic choice of the ML decoder
+MAX_CODEBOOK_BITS = 24
+# Memory budget (bytes) of the stored trellis decisions (Viterbi) or forward metrics (BCJR) per sub-batch
+TRELLIS_MEMORY_BUDGET = 2**28
+
+
+class TrellisDecoder(tf.keras.Model):
+    """
+    Decoder over the syndrome (Wolf) trellis of the code: the state after the j-th section is the partial syndrome
+    of the first j bits, so that each section has at most 2^(n-k) states and the codewords are the paths ending
+    in the all-zero state. The cost per codeword is O(n 2^(n-k)) instead of O(n 2^k) for the codebook search.
+
+    The parity-check matrix used for the trellis and the recovery of the information words are computed from G
+    (any full rank generator matrix, systematic or not), which must then be a concrete (eager) matrix.
+
+    Args:
+        n (int): codewords length
+        k (int): number of information bits
+        G ([k x n] array) [default=None]: generator matrix (the trellis is otherwise built at the first call)
+        return_words (bool) [default=True]: return the decoded information words (True) or codewords (False)
+        soft_output (bool) [default=False]: return the a posteriori LLRs of the code bits (BCJR, bitwise MAP)
+            instead of the ML hard decisions (Viterbi)
+        batch_size (int) [default=None]: number of codewords decoded at once, the batch is split in sub-batches
+            (the Viterbi decisions take n 2^(n-k) bytes per codeword and the BCJR forward metrics 4 (n+1) 2^(n-k)
+            bytes). Defaults to the number of codewords fitting in TRELLIS_MEMORY_BUDGET
+    """
+
+    # Symmetric decoder (soft metrics of the codewords translated by any codeword are permuted, ties have probability 0)
+    symmetric = True
+
+    def __init__(
+        self,
+        n,
+        k,
+        G=None,
+        return_words=True,
+        soft_output=False,
+        batch_size=None,
+        **kwargs,
+    ):
+        super(TrellisDecoder, self).__init__(**kwargs)
+        if n - k > MAX_TRELLIS_STATE_BITS:
+            raise ValueError(
+                f"The trellis of a ({n},{k}) code has 2^{n - k} states (at most 2^{MAX_TRELLIS_STATE_BITS} supported)"
+            )
+        self.n = n
+        self.k = k
+        self.number_of_states = 2 ** (n - k)
+        self.return_words = return_words
+        self.soft_output = soft_output
+        if batch_size is None:
+            bytes_per_codeword = (
+                4 * (n + 1) * self.number_of_states
+                if soft_output
+                else n * self.number_of_states
+            )
+            batch_size = max(1, TRELLIS_MEMORY_BUDGET // bytes_per_codeword)
+        self.batch_size = batch_size
+        self.code_book_generated = False
+
+        if G is not None:
+            self.init_codebook(G)
+
+    def init_codebook(self, G):
+        """build the trellis of the code generated by G (same entry point as MinDistanceDecoder)"""
+        G = np.array(G).astype(np.uint8) % 2
+        assert G.shape == (
+            self.k,
+            self.n,
+        ), f"The provided generator matrix shape {G.shape} doesn't match expected shape ({self.k},{self.n})"
+
+        (pivots, information_matrix) = gf2_information_set(G)
+        H = gf2_null_space(G)
+
+        self.G = tf.constant(G, dtype=tf.float32)
+        self.H = tf.constant(H, dtype=tf.float32)
+        # Syndrome contribution of each code bit, as an integer state
+        weights = 2 ** np.arange(self.n - self.k, dtype=np.int64)
+        self.sections = weights @ H.astype(np.int64)
+        # State reached from each state when the bit of the section is 1
+        states = np.arange(self.number_of_states)
+        self.transitions = [
+            tf.constant(states ^ section, dtype=tf.int32) for section in self.sections
+        ]
+        # Information words from the codewords: u = c[pivots] G[:, pivots]^-1
+        self.pivots = tf.constant(pivots, dtype=tf.int32)
+        self.information_matrix = tf.constant(information_matrix, dtype=tf.float32)
+
+        self.code_book_generated = True
+        return self.code_book_generated
+
+    def call(self, inputs, training=False):
+        noisy_symbols, G, sigma2 = inputs
+        noisy_symbols = tf.cast(noisy_symbols, dtype=tf.float32)
+        llrs = (-1.0) * 4.0 * noisy_symbols / sigma2
+
+        if not self.code_book_generated:
+            self.init_codebook(G)
+
+        if self.soft_output:
+            return self.by_sub_batches(self.bcjr, llrs)
+
+        codewords = self.by_sub_batches(self.viterbi, llrs)
+        if self.return_words:
+            return self.information_words(codewords)
+        return codewords
+
+    def by_sub_batches(self, function, llrs):
+        """apply function ([batch, n] -> [batch, n]) to sub-batches of at most batch_size codewords"""
+        batch_size = tf.shape(llrs)[0]
+
+        def condition(start, outputs):
+            return start < batch_size
+
+        def body(start, outputs):
+            sub_batch = llrs[start : start + self.batch_size]
+            outputs = outputs.write(start // self.batch_size, function(sub_batch))
+            return start + self.batch_size, outputs
+
+        (_, outputs) = tf.while_loop(
+            condition,
+            body,
+            (
+                tf.constant(0),
+                tf.TensorArray(
+                    tf.float32,
+                    size=(batch_size + self.batch_size - 1) // self.batch_size,
+                    infer_shape=False,
+                    element_shape=tf.TensorShape([None, self.n]),
+                ),
+            ),
+        )
+        return tf.reshape(outputs.concat(), [batch_size, self.n])
+
+    def information_words(self, codewords):
+        """information words of the [batch, n] codewords"""
+        information_bits = tf.gather(codewords, self.pivots, axis=-1)
+        return tf.matmul(information_bits, self.information_matrix) % 2
+
+    def initial_metrics(self, batch_size):
+        """path metrics of the initial (all-zero) state of the trellis"""
+        return tf.concat(
+            [
+                tf.zeros([batch_size, 1]),
+                tf.fill([batch_size, self.number_of_states - 1], float("-inf")),
+            ],
+            axis=-1,
+        )
+
+    def viterbi(self, llrs):
+        """
+        ML decoding: path of the trellis maximizing the correlation sum_j (1 - 2 c_j) llr_j / 2.
+
+        Args:
+            llrs ([batch, n] tensor): channel LLRs (positive for a 0 bit)
+
+        Returns:
+            [batch, n] tensor: ML codewords
+        """
+        metrics = self.initial_metrics(tf.shape(llrs)[0])
+        decisions = []
+        for j in range(self.n):
+            half_llr = llrs[:, j : j + 1] / 2.0
+            metric_0 = metrics + half_llr
+            metric_1 = tf.gather(metrics, self.transitions[j], axis=-1) - half_llr
+            # Survivor of each state: 1 if reached through a 1 bit (ties keep the 0 bit)
+            decisions.append(metric_1 > metric_0)
+            metrics = tf.maximum(metric_0, metric_1)
+
+        # Traceback from the all-zero final state (zero syndrome)
+        state = tf.zeros([tf.shape(llrs)[0]], dtype=tf.int32)
+        bits = []
+        for j in reversed(range(self.n)):
+            bit = tf.cast(
+                tf.gather(decisions[j], tf.expand_dims(state, -1), batch_dims=1)[:, 0],
+                tf.int32,
+            )
+            state = tf.bitwise.bitwise_xor(state, bit * int(self.sections[j]))
+            bits.append(bit)
+        return tf.cast(tf.stack(bits[::-1], axis=-1), tf.float32)
+
+    def bcjr(self, llrs):
+        """
+        Bitwise MAP decoding (forward-backward algorithm in the log domain).
+
+        Args:
+            llrs ([batch, n] tensor): channel LLRs (positive for a 0 bit)
+
+        Returns:
+            [batch, n] tensor: a posteriori LLRs of the code bits
+        """
+        alphas = [self.initial_metrics(tf.shape(llrs)[0])]
+        for j in range(self.n):
+            half_llr = llrs[:, j : j + 1] / 2.0
+            alphas.append(
+                tf.reduce_logsumexp(
+                    tf.stack(
+                        [
+                            alphas[-1] + half_llr,
+                            tf.gather(alphas[-1], self.transitions[j], axis=-1)
+                            - half_llr,
+                        ]
+                    ),
+                    axis=0,
+                )
+            )
+
+        # The paths end in the all-zero state
+        beta = self.initial_metrics(tf.shape(llrs)[0])
+        app_llrs = []
+        for j in reversed(range(self.n)):
+            half_llr = llrs[:, j : j + 1] / 2.0
+            beta_1 = tf.gather(beta, self.transitions[j], axis=-1)
+            app_llrs.append(
+                tf.reduce_logsumexp(alphas[j] + half_llr + beta, axis=-1)
+                - tf.reduce_logsumexp(alphas[j] - half_llr + beta_1, axis=-1)
+            )
+            beta = tf.reduce_logsumexp(
+                tf.stack([beta + half_llr, beta_1 - half_llr]), axis=0
+            )
+        return tf.stack(app_llrs[::-1], axis=-1)
+
+
+def ml_decoder_algorithm(n, k):
+    """
+    Cheapest exact ML decoder of a (n,k) code: "codebook" search (2^k codewords) or "trellis" (2^(n-k) states).
+    The trellis sections are sequential and gather based while the codebook search is a single matmul, so the
+    trellis is selected when it has 2^TRELLIS_COST_BITS times fewer states than the codebook has codewords (or
+    when the codebook is too large to be stored).
+
+    Raises:
+        ValueError: neither the trellis nor the codebook of the code is supported
+    """
+    if n - k > MAX_TRELLIS_STATE_BITS:
+        if k > MAX_CODEBOOK_BITS:
+            raise ValueError(
+                f"No exact ML decoder of a ({n},{k}) code: 2^{n - k} trellis states (at most 2^{MAX_TRELLIS_STATE_BITS} "
+                f"supported) and 2^{k} codewords (at most 2^{MAX_CODEBOOK_BITS} supported)"
+            )
+        return "codebook"
+    if k > MAX_CODEBOOK_BITS or n - k + TRELLIS_COST_BITS < k:
+        return "trellis"
+    return "codebook"
+
+
+def get_ml_decoder(n, k, G=None, return_words=True, algorithm="auto", **kwargs):
+    """
+    Exact ML decoder of a (n,k) code.
+
+    Args:
+        n (int): codewords length
+        k (int): number of information bits
+        G ([k x n] array) [default=None]: generator matrix
+        return_words (bool) [default=True]: return the decoded information words (True) or codewords (False)
+        algorithm (str) [default="auto"]: "codebook" (MinDistanceDecoder), "trellis" (TrellisDecoder) or "auto"
+            (see ml_decoder_algorithm)
+        **kwargs: MinDistanceDecoder options (chunk_size, metric, cache_dir), ignored by the trellis decoder
+
+    Returns:
+        MinDistanceDecoder or TrellisDecoder
+    """
+    if algorithm == "auto":
+        algorithm = ml_decoder_algorithm(n, k)
+    if algorithm == "trellis":
+        return TrellisDecoder(n=n, k=k, G=G, return_words=return_words)
+    if algorithm == "codebook":
+        return MinDistanceDecoder(n=n, k=k, G=G, return_words=return_words, **kwargs)
+    raise ValueError(f"Unknown ML decoding algorithm '{algorithm}'")
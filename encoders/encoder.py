@@ -28,12 +28,12 @@ from encoders import DifferentiableBPSKModulationLayer
 
 
 class Encoder(tf.keras.Model):
-    def __init__(self, n, k, **kwargs):
+    def __init__(self, n, k, fast_inference=True, **kwargs):
         super(Encoder, self).__init__(**kwargs)
         self.n = n
         self.k = k
         self.lbcpe = LinearBlockCodeProductEncoderWithExternalG(
-            self.n, self.k, return_binary=True
+            self.n, self.k, return_binary=True, fast_inference=fast_inference
         )
         self.modulation = DifferentiableBPSKModulationLayer(
             binary_inputs=True, differentiable_approximation=True
@@ -31,21 +31,27 @@ class ProductWithExternalWeights(tf.keras.layers.Layer):
     GF2 liner transformation where the modulo 2 operation (XOR) is replaced by using a bipolar product
     e.g. 0 XOR 1 XOR 1 = 0 --> +1 x -1 x -1 = +1
 
+    In inference (training=False), bipolar inputs and binary weights are transformed by an exact matmul modulo 2
+    instead of the [batch, units, input size] product (see gf2_product), with the same outputs.
+
     Args:
         ###FALSE IN CURRENT VERSION. units (int): size of the layer output (the dimension of the wieght matrix is dependant on the input size which can be defined dynamically as in a Dense layer)
         activation (tf.keras.layers.Activation) [default: None]: The activation function to apply to the output of the layer
+        fast_inference (bool) [default: True]: whether the matmul modulo 2 is used in inference
     """
 
     def __init__(
         self,
         units,
         activation=None,
+        fast_inference=True,
         **kwargs,
     ):
         super(ProductWithExternalWeights, self).__init__(**kwargs)
         # self.input_spec = InputSpec(ndim=2)
         self.units = units
         self.activation = activation
+        self.fast_inference = fast_inference
 
     def build(self, input_shape):
 
@@ -62,20 +68,62 @@ class ProductWithExternalWeights(tf.keras.layers.Layer):
         g = 1 - w
         return g
 
-    def call(self, inputs):
+    def call(self, inputs, training=False):
         (inputs, weights) = inputs
         self.kernel = tf.reshape(weights, [tf.shape(inputs)[-1], self.units])
+
+        if training or not self.fast_inference:
+            x = self.product(inputs)
+        else:
+            # The matmul modulo 2 is exact for bipolar inputs and binary weights only
+            exact = tf.logical_and(
+                tf.reduce_all(tf.abs(inputs) == 1),
+                tf.reduce_all((self.kernel == 0) | (self.kernel == 1)),
+            )
+            x = tf.cond(
+                exact, lambda: self.gf2_product(inputs), lambda: self.product(inputs)
+            )
+
+        if self.activation is not None:
+            output = self.activation_layer(x)
+        else:
+            output = x
+
+        return output
+
+    def product(self, inputs):
+        """differentiable bipolar product of the inputs by the kernel ([batch, units, input size] product)"""
         repeated_inputs = tf.keras.backend.repeat(inputs, n=1)
         x = tf.multiply(repeated_inputs, self.f(tf.transpose(self.kernel))) + self.g(
             tf.transpose(self.kernel)
         )
-
-        if self.activation is not None:
-            output = self.activation_layer(tf.reduce_prod(x, axis=-1))
+        return tf.reduce_prod(x, axis=-1)
+
+    def gf2_product(self, inputs):
+        """
+        GF2 linear transformation of bipolar inputs (+1 <-> 0 ; -1 <-> 1) by a binary kernel, computed as a matmul
+        modulo 2 (the sums of bits are exact integers in floating point). With a systematic kernel [I | P], only the
+        parity bits are computed (matmul by P).
+        """
+        bits = (1 - inputs) / 2
+        k = inputs.shape[-1]
+
+        def full_product():
+            return tf.math.floormod(tf.matmul(bits, self.kernel), 2)
+
+        if k is None or k > self.units:
+            codewords = full_product()
         else:
-            output = tf.reduce_prod(x, axis=-1)
 
-        return output
+            def systematic_product():
+                parity_bits = tf.math.floormod(tf.matmul(bits, self.kernel[:, k:]), 2)
+                return tf.concat([bits, parity_bits], axis=-1)
+
+            systematic = tf.reduce_all(
+                self.kernel[:, :k] == tf.eye(k, dtype=self.kernel.dtype)
+            )
+            codewords = tf.cond(systematic, systematic_product, full_product)
+        return 1 - 2 * codewords
 
 
 class LinearBlockCodeProductEncoderWithExternalG(tf.keras.layers.Layer):
@@ -89,6 +137,7 @@ class LinearBlockCodeProductEncoderWithExternalG(tf.keras.layers.Layer):
         n (int): code length
         k (int): message length
         return_binary (bool) [default: True]: whether the model should apply a sigmoid activation to return binary like outputs
+        fast_inference (bool) [default: True]: whether the exact matmul modulo 2 replaces the bipolar product in inference (see ProductWithExternalWeights)
     """
 
     def __init__(
@@ -96,6 +145,7 @@ class LinearBlockCodeProductEncoderWithExternalG(tf.keras.layers.Layer):
         n,
         k,
         return_binary=True,
+        fast_inference=True,
         **kwargs,
     ):
         super(LinearBlockCodeProductEncoderWithExternalG, self).__init__(**kwargs)
@@ -105,14 +155,16 @@ class LinearBlockCodeProductEncoderWithExternalG(tf.keras.layers.Layer):
         # Encoder properties
         self.return_binary = return_binary
         # Layers definition
-        self.product = ProductWithExternalWeights(units=self.n)
+        self.product = ProductWithExternalWeights(
+            units=self.n, fast_inference=fast_inference
+        )
         ## Build model
         # self.build_graph(input_shape=(1, self.k))
 
     def call(self, inputs, training=False):
         (inputs, G) = inputs
         x = 1 - inputs * 2
-        x = self.product(inputs=[x, G])
+        x = self.product(inputs=[x, G], training=training)
         if self.return_binary:
             x = tf.sigmoid(-x)
         return x
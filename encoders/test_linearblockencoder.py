@@ -15,11 +15,14 @@ IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTI
 """
 
 import pytest
+import numpy as np
 import tensorflow as tf
 
 from .linearblockencoder import (
     LinearBlockCodeProductEncoderWithExternalG,
 )
+from .encoder import Encoder
+from tools import load_code
 
 
 def test_linearcoder_with_external_G_product():
@@ -81,5 +84,52 @@ def test_linearcoder_with_external_G_product():
     tf.debugging.assert_equal(y_pred, y_true)
 
 
+@pytest.mark.parametrize("codename", ["BCH_7_4", "BCH_31_16", "BCH_63_45"])
+@pytest.mark.parametrize("systematic", [True, False])
+@pytest.mark.parametrize("return_binary", [True, False])
+def test_gf2_fast_path_eq_product(codename, systematic, return_binary):
+    G = load_code(codename).astype(np.float32)
+    (k, n) = G.shape
+    if not systematic:
+        G = G[:, np.random.default_rng(0).permutation(n)]
+    G = tf.constant(G)
+    x = tf.cast(
+        tf.random.stateless_uniform([200, k], seed=[1, 7], maxval=2, dtype=tf.int32),
+        tf.float32,
+    )
+    encoder = LinearBlockCodeProductEncoderWithExternalG(
+        n=n, k=k, return_binary=return_binary
+    )
+    expected = encoder([x, G], training=True)
+    tf.debugging.assert_equal(encoder([x, G], training=False), expected)
+    tf.debugging.assert_equal(tf.function(encoder)([x, G]), expected)
+
+
+def test_gf2_fast_path_non_binary_G():
+    # Relaxed (non binary) generator matrix: the bipolar product is kept
+    G = tf.constant(load_code("BCH_7_4"), dtype=tf.float32) * 0.75
+    x = tf.cast(
+        tf.random.stateless_uniform([50, 4], seed=[1, 8], maxval=2, dtype=tf.int32),
+        tf.float32,
+    )
+    encoder = LinearBlockCodeProductEncoderWithExternalG(n=7, k=4)
+    tf.debugging.assert_equal(
+        encoder([x, G], training=False), encoder([x, G], training=True)
+    )
+
+
+def test_encoder_symbols_fast_path():
+    G = tf.constant(load_code("BCH_31_16"), dtype=tf.float32)
+    x = tf.cast(
+        tf.random.stateless_uniform([200, 16], seed=[1, 9], maxval=2, dtype=tf.int32),
+        tf.float32,
+    )
+    expected = Encoder(31, 16, fast_inference=False)([x, G])
+    tf.debugging.assert_equal(Encoder(31, 16)([x, G]), expected)
+    # BPSK symbols of the codewords (bit 0 -> -1)
+    codewords = tf.math.floormod(tf.matmul(x, G), 2)
+    tf.debugging.assert_equal(expected, 2 * codewords - 1)
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -27,3 +27,5 @@ from .blec import BlockErrorCount
 from .ber import BitErrorRate
 from .bler import BlockErrorRate
 from .bpci import BinomialProportionConfidenceInterval
+from .per_snr import PerSNRBitErrorRate, PerSNRBlockErrorRate
+from .error_statistics import ErrorStatistics
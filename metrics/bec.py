@@ -35,8 +35,9 @@ class BitErrorCount(tf.keras.metrics.Metric):
             mode (str, optional): Defaults to None. 'average': average accross batches, 'sum': sum over batches.
         """
         super(BitErrorCount, self).__init__(name=name, **kwargs)
-        self.bec = self.add_weight(name="BEC", initializer="zeros", dtype=tf.float32)
-        self.n = self.add_weight(name="n", initializer="zeros", dtype=tf.float32)
+        # Exact accumulators (see BitErrorRate): count in float64 (average mode), bits count in int64
+        self.bec = self.add_weight(name="BEC", initializer="zeros", dtype=tf.float64)
+        self.n = self.add_weight(name="n", initializer="zeros", dtype=tf.int64)
         self.from_logits = from_logits
         self.mode = mode
 
@@ -48,12 +49,15 @@ class BitErrorCount(tf.keras.metrics.Metric):
         y_pred = tf.clip_by_value(y_pred, 0, 1)
         y_pred = tf.round(y_pred)
         differences = tf.abs(y_true - y_pred)
-        bec = tf.reduce_sum(differences)
+        bec = tf.reduce_sum(tf.cast(differences, tf.float64))
         if self.mode == "average":
-            count = tf.cast(tf.size(y_pred), dtype=tf.float32)
-            bec = self.bec * self.n + count * bec
+            count = tf.size(y_pred, out_type=tf.int64)
+            bec = (
+                self.bec * tf.cast(self.n, tf.float64)
+                + tf.cast(count, tf.float64) * bec
+            )
             self.n.assign_add(count)
-            self.bec.assign(bec / self.n)
+            self.bec.assign(bec / tf.cast(self.n, tf.float64))
         elif self.mode == "sum":
             self.bec.assign_add(bec)
         else:
@@ -64,7 +68,7 @@ class BitErrorCount(tf.keras.metrics.Metric):
 
     def reset_state(self):
         self.bec.assign(0.0)
-        self.n.assign(0.0)
+        self.n.assign(0)
         tf.print(f"{self.name} is reset")
 
     def get_config(self):
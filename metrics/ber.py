@@ -26,23 +26,32 @@ import tensorflow as tf
 
 
 class BitErrorRate(tf.keras.metrics.Metric):
-    def __init__(self, name="BER", from_logits=False, **kwargs):
+    def __init__(
+        self, name="BER", from_logits=False, likelihood_ratios=False, **kwargs
+    ):
         """Bit Error Rate metric
 
         Args:
             name (str, optional): metric's name. Defaults to 'BER'.
             from_logits (bool, optional): evaluate the BER from logits? Defaults to False.
+            likelihood_ratios (bool, optional): the sample weights are the likelihood ratios of an importance sampling
+                channel (see channels.ImportanceSamplingAWGN): the errors are weighted, the bits count is not
+                (unbiased importance sampling estimator). Defaults to False (weighted errors and bits count).
         """
         super(BitErrorRate, self).__init__(name=name, **kwargs)
         self.from_logits = from_logits
+        self.likelihood_ratios = likelihood_ratios
+        # Exact accumulators in float64: errors and bits count (integer or weighted increments, integers are exact up
+        # to 2^53)
         self.errors = self.add_weight(
-            name="errors", initializer="zeros", dtype=tf.float32
+            name="errors", initializer="zeros", dtype=tf.float64
         )
         self.total = self.add_weight(
-            name="total", initializer="zeros", dtype=tf.float32
+            name="total", initializer="zeros", dtype=tf.float64
         )
 
-    def update_state(self, y_true, y_pred, sample_weight=None):
+    def bit_errors(self, y_true, y_pred):
+        """[batch, k] bit errors"""
         if self.from_logits == True:
             y_pred = tf.math.sign(y_pred)
             y_pred += 1
@@ -50,12 +59,39 @@ class BitErrorRate(tf.keras.metrics.Metric):
         y_pred = tf.clip_by_value(y_pred, 0, 1)
         y_pred = tf.round(y_pred)
 
-        errors = tf.abs(y_true - y_pred)
-        errors_count = tf.reduce_sum(errors)
-        self.errors.assign_add(errors_count)
+        return tf.abs(y_true - y_pred)
+
+    def sample_errors(self, y_true, y_pred):
+        """[batch] bit error rate of each sample"""
+        return tf.reduce_mean(self.bit_errors(y_true, y_pred), axis=-1)
+
+    def update_state(self, y_true, y_pred, sample_weight=None):
+        """
+        Args:
+            y_true ([batch, k] tensor): transmitted bits
+            y_pred ([batch, k] tensor): decoded bits (or logits)
+            sample_weight ([batch] tensor, optional): weights of the samples, or likelihood ratios of the samples (see
+                likelihood_ratios). Defaults to None.
 
-        bits_count = tf.cast(tf.size(y_pred), dtype=tf.float32)
-        self.total.assign_add(bits_count)
+        Returns:
+            update op of the bits count
+        """
+        errors = tf.reduce_sum(
+            tf.cast(self.bit_errors(y_true, y_pred), tf.float64), axis=-1
+        )
+        bits_count = tf.cast(tf.size(y_pred), tf.float64)
+        if sample_weight is not None:
+            sample_weight = tf.reshape(tf.cast(sample_weight, tf.float64), [-1])
+            errors *= sample_weight
+            if not self.likelihood_ratios:
+                bits_count = tf.reduce_sum(sample_weight) * tf.cast(
+                    tf.shape(y_pred)[-1], tf.float64
+                )
+        errors_update = self.errors.assign_add(tf.reduce_sum(errors))
+        # The count of static shapes does not depend on the batch: updated after the errors, not counted by a call
+        # failing to get the batch (end of a dataset of unknown size)
+        with tf.control_dependencies([errors_update]):
+            return self.total.assign_add(bits_count)
 
     def reset_state(self):
         self.errors.assign(0.0)
@@ -63,10 +99,13 @@ class BitErrorRate(tf.keras.metrics.Metric):
         # tf.print(f'{self.name} is reset')
 
     def result(self):
-        return self.errors / self.total
+        return tf.cast(self.errors / self.total, tf.float32)
 
     def get_config(self):
-        return {"from_logits": self.from_logits}
+        return {
+            "from_logits": self.from_logits,
+            "likelihood_ratios": self.likelihood_ratios,
+        }
 
     @classmethod
     def from_config(cls, config):
@@ -34,10 +34,11 @@ class BlockErrorCount(tf.keras.metrics.Metric):
             mode (str, optional): Defaults to None. 'average': average accross batches, 'sum': sum over batches.
         """
         super(BlockErrorCount, self).__init__(name=name, **kwargs)
-        self.blec = self.add_weight(name="BLEC", initializer="zeros", dtype=tf.float32)
+        # Exact accumulators (see BitErrorRate): count in float64 (average mode), blocks count in int64
+        self.blec = self.add_weight(name="BLEC", initializer="zeros", dtype=tf.float64)
+        self.n = self.add_weight(name="n", initializer="zeros", dtype=tf.int64)
         self.from_logits = from_logits
         self.mode = mode
-        self.n = 0
 
     @tf.function
     def update_state(self, y_true, y_pred, sample_weight=None):
@@ -49,13 +50,16 @@ class BlockErrorCount(tf.keras.metrics.Metric):
         y_pred = tf.round(y_pred)
         differences = tf.abs(y_true - y_pred)
         differences = tf.reduce_max(differences, axis=1)
-        blec = tf.reduce_sum(differences)
+        blec = tf.reduce_sum(tf.cast(differences, tf.float64))
 
         if self.mode == "average":
-            count = tf.cast(tf.size(differences), dtype=tf.float32)
-            blec = self.blec * self.n + count * blec
-            self.n += count
-            self.blec.assign(blec / self.n)
+            count = tf.size(differences, out_type=tf.int64)
+            blec = (
+                self.blec * tf.cast(self.n, tf.float64)
+                + tf.cast(count, tf.float64) * blec
+            )
+            self.n.assign_add(count)
+            self.blec.assign(blec / tf.cast(self.n, tf.float64))
         elif self.mode == "sum":
             blec = self.blec + blec
             self.blec.assign(blec)
@@ -26,23 +26,30 @@ import tensorflow as tf
 
 
 class BlockErrorRate(tf.keras.metrics.Metric):
-    def __init__(self, name="BLER", from_logits=False, **kwargs):
+    def __init__(
+        self, name="BLER", from_logits=False, likelihood_ratios=False, **kwargs
+    ):
         """Bit Error Rate metric
 
         Args:
             name (str, optional): metric's name. Defaults to 'BLER'.
             from_logits (bool, optional): evaluate the BER from logits? Defaults to False.
+            likelihood_ratios (bool, optional): the sample weights are the likelihood ratios of an importance sampling
+                channel (see BitErrorRate). Defaults to False (weighted errors and blocks count).
         """
         super(BlockErrorRate, self).__init__(name=name, **kwargs)
         self.from_logits = from_logits
+        self.likelihood_ratios = likelihood_ratios
+        # Exact accumulators in float64 (see BitErrorRate): errors and blocks count
         self.errors = self.add_weight(
-            name="errors", initializer="zeros", dtype=tf.float32
+            name="errors", initializer="zeros", dtype=tf.float64
         )
         self.total = self.add_weight(
-            name="total", initializer="zeros", dtype=tf.float32
+            name="total", initializer="zeros", dtype=tf.float64
         )
 
-    def update_state(self, y_true, y_pred, sample_weight=None):
+    def block_errors(self, y_true, y_pred):
+        """[batch] block errors"""
         if self.from_logits == True:
             y_pred = tf.math.sign(y_pred)
             y_pred += 1
@@ -51,12 +58,34 @@ class BlockErrorRate(tf.keras.metrics.Metric):
         y_pred = tf.round(y_pred)
 
         bit_errors = tf.abs(y_true - y_pred)
-        block_errors = tf.reduce_max(bit_errors, axis=-1)
-        errors_count = tf.reduce_sum(block_errors)
-        self.errors.assign_add(errors_count)
+        return tf.reduce_max(bit_errors, axis=-1)
+
+    def sample_errors(self, y_true, y_pred):
+        """[batch] block error of each sample"""
+        return self.block_errors(y_true, y_pred)
 
-        blocks_count = tf.cast(tf.size(block_errors), dtype=tf.float32)
-        self.total.assign_add(blocks_count)
+    def update_state(self, y_true, y_pred, sample_weight=None):
+        """
+        Args:
+            y_true ([batch, k] tensor): transmitted bits
+            y_pred ([batch, k] tensor): decoded bits (or logits)
+            sample_weight ([batch] tensor, optional): weights of the samples, or likelihood ratios of the samples (see
+                likelihood_ratios). Defaults to None.
+
+        Returns:
+            update op of the blocks count
+        """
+        block_errors = tf.cast(self.block_errors(y_true, y_pred), tf.float64)
+        blocks_count = tf.cast(tf.size(block_errors), tf.float64)
+        if sample_weight is not None:
+            sample_weight = tf.reshape(tf.cast(sample_weight, tf.float64), [-1])
+            block_errors *= sample_weight
+            if not self.likelihood_ratios:
+                blocks_count = tf.reduce_sum(sample_weight)
+        errors_update = self.errors.assign_add(tf.reduce_sum(block_errors))
+        # Count updated after the errors (see BitErrorRate.update_state)
+        with tf.control_dependencies([errors_update]):
+            return self.total.assign_add(blocks_count)
 
     def reset_state(self):
         self.errors.assign(0.0)
@@ -64,10 +93,13 @@ class BlockErrorRate(tf.keras.metrics.Metric):
         # tf.print(f'{self.name} is reset')
 
     def result(self):
-        return self.errors / self.total
+        return tf.cast(self.errors / self.total, tf.float32)
 
     def get_config(self):
-        return {"from_logits": self.from_logits}
+        return {
+            "from_logits": self.from_logits,
+            "likelihood_ratios": self.likelihood_ratios,
+        }
 
     @classmethod
     def from_config(cls, config):
@@ -50,34 +50,68 @@ class BinomialProportionConfidenceInterval(tf.keras.metrics.Metric):
         self.alpha = 1 - fraction
         self.z = 1.0 / (1 - self.alpha / 2)
 
-        self.n = self.add_weight(name="n", initializer="zeros", dtype=tf.float32)
+        # Sample weights of the monitored metric: weights of the samples, or likelihood ratios of an importance
+        # sampling channel (see BitErrorRate)
+        self.likelihood_ratios = getattr(
+            self.monitored_metric, "likelihood_ratios", False
+        )
+
+        # Exact accumulators (see BitErrorRate): number of counted items in float64, samples count in int64
+        self.n = self.add_weight(name="n", initializer="zeros", dtype=tf.float64)
+        # Likelihood ratios (importance sampling): count and sum of the squared weighted errors of the samples
+        self.weighted_samples = self.add_weight(
+            name="weighted_samples", initializer="zeros", dtype=tf.int64
+        )
+        self.squared_weighted_errors = self.add_weight(
+            name="squared_weighted_errors", initializer="zeros", dtype=tf.float64
+        )
 
     def update_state(self, y_true, y_pred, sample_weight=None):
-        self.monitored_metric.update_state(y_true, y_pred, sample_weight)
+        monitored_update = self.monitored_metric.update_state(
+            y_true, y_pred, sample_weight
+        )
         if self.dimensions is None:
-            batch_count = tf.cast(tf.size(y_pred), dtype=tf.float32)
+            batch_count = tf.size(y_pred, out_type=tf.int64)
         else:
-            shape = tf.cast(tf.shape(y_pred), dtype=tf.float32)
+            shape = tf.shape(y_pred, out_type=tf.int64)
             batch_count = tf.reduce_prod([shape[d] for d in self.dimensions])
-        self.n.assign_add(batch_count)
+        batch_count = tf.cast(batch_count, tf.float64)
+        if sample_weight is not None and not self.likelihood_ratios:
+            # Counted items of the samples weighted by the sample weights
+            sample_weight = tf.reshape(tf.cast(sample_weight, tf.float64), [-1])
+            batch_count *= tf.reduce_sum(sample_weight) / tf.cast(
+                tf.size(sample_weight), tf.float64
+            )
+        # Count updated after the monitored metric (see BitErrorRate.update_state)
+        with tf.control_dependencies([monitored_update]):
+            self.n.assign_add(batch_count)
+
+        if sample_weight is not None and self.likelihood_ratios:
+            # Weighted errors of each sample (see sample_errors of BitErrorRate and BlockErrorRate)
+            weighted_errors = tf.reshape(
+                tf.cast(sample_weight, tf.float32), [-1]
+            ) * self.monitored_metric.sample_errors(y_true, y_pred)
+            self.weighted_samples.assign_add(
+                tf.size(weighted_errors, out_type=tf.int64)
+            )
+            self.squared_weighted_errors.assign_add(
+                tf.reduce_sum(tf.square(tf.cast(weighted_errors, tf.float64)))
+            )
 
     def reset_state(self):
         self.monitored_metric.reset_state()
         self.n.assign(0.0)
+        self.weighted_samples.assign(0)
+        self.squared_weighted_errors.assign(0.0)
 
     def result(self):
-        value = self.monitored_metric.result()
-        n_tilde = self.n + self.z ** 2
-        k = value * self.n
-
-        if k == 0.0:
-            half_span = 3.0 / (2 * self.n)
-            confidence_interval = (0.0, 3.0 / self.n)
-        else:
-            p_tilde = (1.0 / n_tilde) * (k + (self.z ** 2) / 2)
-            half_span = self.z * tf.sqrt(p_tilde * (1 - p_tilde) / n_tilde)
-            confidence_interval = (p_tilde - half_span, p_tilde + half_span)
-        return (2 * half_span, confidence_interval[0], value, confidence_interval[1])
+        return confidence_interval(
+            self.monitored_metric.result(),
+            self.n,
+            self.z,
+            self.weighted_samples,
+            self.squared_weighted_errors,
+        )
 
     def get_config(self):
         return {"monitored_metric": self.monitored_metric, "n": self.n}
@@ -85,3 +119,53 @@ class BinomialProportionConfidenceInterval(tf.keras.metrics.Metric):
     @classmethod
     def from_config(cls, config):
         return cls(**config)
+
+
+def confidence_interval(value, n, z, weighted_samples=0.0, squared_weighted_errors=0.0):
+    """
+    Confidence interval of an error rate: Agresti-Coull interval of the binomial proportion (rule of three without
+    errors) or, with weighted samples (importance sampling), normal interval of the mean of the weighted errors.
+
+    Args:
+        value (scalar tensor): error rate
+        n (scalar tensor): number of counted items (e.g. bits or blocks)
+        z (float): quantile of the interval
+        weighted_samples (scalar tensor) [default=0.0]: number of samples weighted by their likelihood ratios (importance
+            sampling), binomial interval when 0
+        squared_weighted_errors (scalar tensor) [default=0.0]: sum of the squared weighted errors of the samples
+
+    Returns:
+        (span, lower bound, value, upper bound) float32 tensors
+    """
+    # Evaluated in float64 from the exact counts
+    (value, n, weighted_samples, squared_weighted_errors) = [
+        tf.cast(x, tf.float64)
+        for x in (value, n, weighted_samples, squared_weighted_errors)
+    ]
+    n_tilde = n + z ** 2
+    k = value * n
+
+    # Importance sampling: the errors are not binomial, normal interval of the mean of the weighted errors
+    variance = tf.math.divide_no_nan(
+        tf.math.divide_no_nan(squared_weighted_errors, weighted_samples) - value ** 2,
+        weighted_samples,
+    )
+    weighted_half_span = z * tf.sqrt(tf.maximum(variance, 0.0))
+
+    p_tilde = (1.0 / n_tilde) * (k + (z ** 2) / 2)
+    binomial_half_span = z * tf.sqrt(p_tilde * (1 - p_tilde) / n_tilde)
+
+    # No error: [0, 3 / n]
+    no_error_half_span = 3.0 / (2 * n)
+
+    weighted = weighted_samples > 0.0
+    half_span = tf.where(
+        weighted,
+        weighted_half_span,
+        tf.where(k == 0.0, no_error_half_span, binomial_half_span),
+    )
+    center = tf.where(weighted, value, tf.where(k == 0.0, no_error_half_span, p_tilde))
+    return tuple(
+        tf.cast(x, tf.float32)
+        for x in (2 * half_span, center - half_span, value, center + half_span)
+    )
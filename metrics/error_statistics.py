@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Error statistics metric
+
+keras metric evaluating the BER, BLER, error counts and their confidence intervals from a single comparison of the
+transmitted and decoded bits of each batch
+
+Brief: fused BER, BLER, BEC, BLEC and BPCI metrics
+
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import tensorflow as tf
+
+from .bpci import confidence_interval
+from .per_snr import hard_decisions
+
+
+class ErrorStatistics(tf.keras.metrics.Metric):
+    def __init__(
+        self,
+        name="error_statistics",
+        from_logits=False,
+        fraction=0.95,
+        likelihood_ratios=False,
+        **kwargs
+    ):
+        """Bit and block error statistics: the bits of each batch are hard-decided and compared once and the results
+        of BitErrorRate, BlockErrorRate, BitErrorCount and BlockErrorCount (mode "sum") and of the
+        BinomialProportionConfidenceInterval of the BER and BLER are derived from shared accumulators. The result is a
+        dict of the logs keys "BER", "BLER", "BEC", "BLEC", "BPCI_BER" and "BPCI_BLER".
+
+        Args:
+            name (str, optional): metric's name. Defaults to 'error_statistics'.
+            from_logits (bool, optional): evaluate the errors from logits? Defaults to False.
+            fraction (float, optional): fraction of the values in the confidence intervals. Defaults to 0.95.
+            likelihood_ratios (bool, optional): the sample weights are the likelihood ratios of an importance sampling
+                channel (see BitErrorRate). Defaults to False (weighted errors and counts). The error counts "BEC" and
+                "BLEC" are not weighted.
+        """
+        super(ErrorStatistics, self).__init__(name=name, **kwargs)
+        self.from_logits = from_logits
+        self.fraction = fraction
+        self.likelihood_ratios = likelihood_ratios
+        # Same quantile as BinomialProportionConfidenceInterval
+        self.z = 1.0 / (1 - (1 - fraction) / 2)
+
+        # Exact accumulators (see BitErrorRate): error and samples counts in int64, bits and blocks counts, weighted
+        # errors (sample_weight, see BitErrorRate and BlockErrorRate) and their squares in float64
+        self.bit_errors = self.add_weight(
+            name="bit_errors", initializer="zeros", dtype=tf.int64
+        )
+        self.block_errors = self.add_weight(
+            name="block_errors", initializer="zeros", dtype=tf.int64
+        )
+        self.weighted_bit_errors = self.add_weight(
+            name="weighted_bit_errors", initializer="zeros", dtype=tf.float64
+        )
+        self.weighted_block_errors = self.add_weight(
+            name="weighted_block_errors", initializer="zeros", dtype=tf.float64
+        )
+        self.bits = self.add_weight(name="bits", initializer="zeros", dtype=tf.float64)
+        self.blocks = self.add_weight(
+            name="blocks", initializer="zeros", dtype=tf.float64
+        )
+        # Likelihood ratios (importance sampling): count and sums of the squared weighted errors of the samples
+        self.weighted_samples = self.add_weight(
+            name="weighted_samples", initializer="zeros", dtype=tf.int64
+        )
+        self.squared_weighted_bit_errors = self.add_weight(
+            name="squared_weighted_bit_errors", initializer="zeros", dtype=tf.float64
+        )
+        self.squared_weighted_block_errors = self.add_weight(
+            name="squared_weighted_block_errors", initializer="zeros", dtype=tf.float64
+        )
+
+    def update_state(self, y_true, y_pred, sample_weight=None):
+        """
+        Args:
+            y_true ([batch, k] tensor): transmitted bits
+            y_pred ([batch, k] tensor): decoded bits (or logits)
+            sample_weight ([batch] tensor, optional): weights (or likelihood ratios) of the samples (see
+                likelihood_ratios). Defaults to None.
+        """
+        # [batch] errors of each sample
+        bit_errors = tf.cast(
+            tf.reduce_sum(
+                tf.abs(y_true - hard_decisions(y_pred, self.from_logits)), axis=-1
+            ),
+            tf.int64,
+        )
+        block_errors = tf.minimum(bit_errors, 1)
+        errors_updates = [
+            self.bit_errors.assign_add(tf.reduce_sum(bit_errors)),
+            self.block_errors.assign_add(tf.reduce_sum(block_errors)),
+        ]
+
+        bit_errors = tf.cast(bit_errors, tf.float64)
+        block_errors = tf.cast(block_errors, tf.float64)
+        blocks = tf.ones_like(block_errors)
+        if sample_weight is not None:
+            sample_weight = tf.reshape(tf.cast(sample_weight, tf.float64), [-1])
+            bit_errors *= sample_weight
+            block_errors *= sample_weight
+            if self.likelihood_ratios:
+                # Per sample bit error rate (see BitErrorRate.sample_errors)
+                sample_bit_errors = bit_errors / tf.cast(
+                    tf.shape(y_pred)[-1], tf.float64
+                )
+                self.weighted_samples.assign_add(
+                    tf.size(block_errors, out_type=tf.int64)
+                )
+                self.squared_weighted_bit_errors.assign_add(
+                    tf.reduce_sum(tf.square(sample_bit_errors))
+                )
+                self.squared_weighted_block_errors.assign_add(
+                    tf.reduce_sum(tf.square(block_errors))
+                )
+            else:
+                blocks *= sample_weight
+        self.weighted_bit_errors.assign_add(tf.reduce_sum(bit_errors))
+        self.weighted_block_errors.assign_add(tf.reduce_sum(block_errors))
+        # Counts updated after the errors (see BitErrorRate.update_state)
+        with tf.control_dependencies(errors_updates):
+            self.bits.assign_add(
+                tf.reduce_sum(blocks) * tf.cast(tf.shape(y_pred)[-1], tf.float64)
+            )
+            self.blocks.assign_add(tf.reduce_sum(blocks))
+
+    def reset_state(self):
+        for variable in self.variables:
+            variable.assign(tf.zeros_like(variable))
+
+    def result(self):
+        # Rates evaluated in float64 from the exact counts
+        ber = self.weighted_bit_errors / self.bits
+        bler = self.weighted_block_errors / self.blocks
+        return {
+            "BER": tf.cast(ber, tf.float32),
+            "BLER": tf.cast(bler, tf.float32),
+            "BEC": self.bit_errors,
+            "BLEC": self.block_errors,
+            "BPCI_BER": confidence_interval(
+                ber,
+                self.bits,
+                self.z,
+                self.weighted_samples,
+                self.squared_weighted_bit_errors,
+            ),
+            "BPCI_BLER": confidence_interval(
+                bler,
+                self.blocks,
+                self.z,
+                self.weighted_samples,
+                self.squared_weighted_block_errors,
+            ),
+        }
+
+    def get_config(self):
+        return {
+            "from_logits": self.from_logits,
+            "fraction": self.fraction,
+            "likelihood_ratios": self.likelihood_ratios,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
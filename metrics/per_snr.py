@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Per SNR error rate metrics
+
+keras metrics to evaluate the BER and BLER of a system at several SNR levels at once, the errors of each sample
+being accumulated in the bin of its SNR index
+
+Brief: per SNR BER (Bit Error Rate) and BLER (Block Error Rate) metrics
+
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import tensorflow as tf
+
+
+class PerSNRBitErrorRate(tf.keras.metrics.Metric):
+    def __init__(
+        self,
+        n_snr,
+        name="SNR_BER",
+        from_logits=False,
+        likelihood_ratios=False,
+        **kwargs,
+    ):
+        """Bit Error Rate metric per SNR bin
+
+        Args:
+            n_snr (int): number of SNR bins
+            name (str, optional): metric's name. Defaults to 'SNR_BER'.
+            from_logits (bool, optional): evaluate the BER from logits? Defaults to False.
+            likelihood_ratios (bool, optional): the sample weights are the likelihood ratios of an importance sampling
+                channel (see BitErrorRate). Defaults to False.
+        """
+        super(PerSNRBitErrorRate, self).__init__(name=name, **kwargs)
+        self.n_snr = n_snr
+        self.from_logits = from_logits
+        self.likelihood_ratios = likelihood_ratios
+        # Exact accumulators in float64 (see BitErrorRate): errors and counts
+        self.errors = self.add_weight(
+            name="errors", shape=(n_snr,), initializer="zeros", dtype=tf.float64
+        )
+        self.total = self.add_weight(
+            name="total", shape=(n_snr,), initializer="zeros", dtype=tf.float64
+        )
+
+    def update_state(self, y_true, y_pred, snr_indices, sample_weight=None):
+        """
+        Args:
+            y_true ([batch, k] tensor): transmitted bits
+            y_pred ([batch, k] tensor): decoded bits (or logits)
+            snr_indices ([batch] int tensor): SNR bin of each sample
+            sample_weight ([batch] tensor, optional): weights (or likelihood ratios) of the samples (see BitErrorRate)
+        """
+        y_pred = hard_decisions(y_pred, self.from_logits)
+
+        errors = tf.cast(tf.reduce_sum(tf.abs(y_true - y_pred), axis=-1), tf.float64)
+        bits_count = tf.fill(
+            tf.shape(errors), tf.cast(tf.shape(y_pred)[-1], tf.float64)
+        )
+        if sample_weight is not None:
+            sample_weight = tf.reshape(tf.cast(sample_weight, tf.float64), [-1])
+            errors *= sample_weight
+            if not self.likelihood_ratios:
+                bits_count *= sample_weight
+        self.errors.assign_add(
+            tf.math.unsorted_segment_sum(errors, snr_indices, self.n_snr)
+        )
+        self.total.assign_add(
+            tf.math.unsorted_segment_sum(bits_count, snr_indices, self.n_snr)
+        )
+
+    def reset_state(self):
+        self.errors.assign(tf.zeros_like(self.errors))
+        self.total.assign(tf.zeros_like(self.total))
+
+    def result(self):
+        # NaN for the SNR bins without samples
+        return tf.cast(self.errors / self.total, tf.float32)
+
+    def get_config(self):
+        return {
+            "n_snr": self.n_snr,
+            "from_logits": self.from_logits,
+            "likelihood_ratios": self.likelihood_ratios,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+
+class PerSNRBlockErrorRate(tf.keras.metrics.Metric):
+    def __init__(
+        self,
+        n_snr,
+        name="SNR_BLER",
+        from_logits=False,
+        likelihood_ratios=False,
+        **kwargs,
+    ):
+        """Block Error Rate metric per SNR bin
+
+        Args:
+            n_snr (int): number of SNR bins
+            name (str, optional): metric's name. Defaults to 'SNR_BLER'.
+            from_logits (bool, optional): evaluate the BLER from logits? Defaults to False.
+            likelihood_ratios (bool, optional): the sample weights are the likelihood ratios of an importance sampling
+                channel (see BlockErrorRate). Defaults to False.
+        """
+        super(PerSNRBlockErrorRate, self).__init__(name=name, **kwargs)
+        self.n_snr = n_snr
+        self.from_logits = from_logits
+        self.likelihood_ratios = likelihood_ratios
+        # Exact accumulators in float64 (see BitErrorRate): errors and counts
+        self.errors = self.add_weight(
+            name="errors", shape=(n_snr,), initializer="zeros", dtype=tf.float64
+        )
+        self.total = self.add_weight(
+            name="total", shape=(n_snr,), initializer="zeros", dtype=tf.float64
+        )
+
+    def update_state(self, y_true, y_pred, snr_indices, sample_weight=None):
+        """
+        Args:
+            y_true ([batch, k] tensor): transmitted bits
+            y_pred ([batch, k] tensor): decoded bits (or logits)
+            snr_indices ([batch] int tensor): SNR bin of each sample
+            sample_weight ([batch] tensor, optional): weights (or likelihood ratios) of the samples (see BlockErrorRate)
+        """
+        y_pred = hard_decisions(y_pred, self.from_logits)
+
+        block_errors = tf.cast(
+            tf.reduce_max(tf.abs(y_true - y_pred), axis=-1), tf.float64
+        )
+        blocks_count = tf.ones_like(block_errors)
+        if sample_weight is not None:
+            sample_weight = tf.reshape(tf.cast(sample_weight, tf.float64), [-1])
+            block_errors *= sample_weight
+            if not self.likelihood_ratios:
+                blocks_count *= sample_weight
+        self.errors.assign_add(
+            tf.math.unsorted_segment_sum(block_errors, snr_indices, self.n_snr)
+        )
+        self.total.assign_add(
+            tf.math.unsorted_segment_sum(blocks_count, snr_indices, self.n_snr)
+        )
+
+    def reset_state(self):
+        self.errors.assign(tf.zeros_like(self.errors))
+        self.total.assign(tf.zeros_like(self.total))
+
+    def result(self):
+        # NaN for the SNR bins without samples
+        return tf.cast(self.errors / self.total, tf.float32)
+
+    def get_config(self):
+        return {
+            "n_snr": self.n_snr,
+            "from_logits": self.from_logits,
+            "likelihood_ratios": self.likelihood_ratios,
+        }
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(**config)
+
+
+def hard_decisions(y_pred, from_logits=False):
+    """decoded bits (same decisions as BitErrorRate and BlockErrorRate)"""
+    if from_logits == True:
+        y_pred = tf.math.sign(y_pred)
+        y_pred += 1
+        y_pred /= 2
+    y_pred = tf.clip_by_value(y_pred, 0, 1)
+    return tf.round(y_pred)
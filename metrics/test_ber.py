@@ -57,5 +57,42 @@ def test_ber_average_across_batches():
     assert ber == expected_ber
 
 
+def test_ber_sample_weight():
+    # errors in positions 5, 6, 7 of sample 0 (weight 0.5), no error in sample 1
+    bits_truth = tf.constant([[0, 0, 1, 1, 1, 1, 0, 1], [0] * 8], dtype=tf.float32)
+    bits_pred = tf.constant([[0, 0, 1, 1, 1, 0, 1, 0], [0] * 8], dtype=tf.float32)
+
+    # Weighted errors and bits count
+    expected_ber = 0.5 * 3.0 / (8 * 4.5)
+
+    ber_metric = BitErrorRate(from_logits=False)
+    ber = ber_metric(
+        y_true=bits_truth, y_pred=bits_pred, sample_weight=tf.constant([0.5, 4.0])
+    )
+    assert float(ber) == pytest.approx(expected_ber)
+
+    # Masked sample (weight 0)
+    ber_metric = BitErrorRate(from_logits=False)
+    ber = ber_metric(
+        y_true=bits_truth, y_pred=bits_pred, sample_weight=tf.constant([1.0, 0.0])
+    )
+    assert ber == 3.0 / 8
+
+
+def test_ber_likelihood_ratios():
+    # errors in positions 5, 6, 7 of sample 0 (likelihood ratio 0.5), no error in sample 1
+    bits_truth = tf.constant([[0, 0, 1, 1, 1, 1, 0, 1], [0] * 8], dtype=tf.float32)
+    bits_pred = tf.constant([[0, 0, 1, 1, 1, 0, 1, 0], [0] * 8], dtype=tf.float32)
+
+    # Weighted errors, unweighted bits count
+    expected_ber = 0.5 * 3.0 / 16
+
+    ber_metric = BitErrorRate(from_logits=False, likelihood_ratios=True)
+    ber = ber_metric(
+        y_true=bits_truth, y_pred=bits_pred, sample_weight=tf.constant([0.5, 4.0])
+    )
+    assert ber == expected_ber
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -77,5 +77,48 @@ def test_bler_nologits():
     assert bler == expected_bler
 
 
+def test_bler_sample_weight():
+    # errors in blocks 0 (weight 0.5) and 2 (weight 0.25), no error in block 1
+    block_truth = tf.zeros([3, 8])
+    block_pred = tf.constant([[1] + [0] * 7, [0] * 8, [1] * 8], dtype=tf.float32)
+
+    # Weighted errors and blocks count
+    expected_bler = (0.5 + 0.25) / 4.75
+
+    bler_metric = BlockErrorRate(from_logits=False)
+    bler = bler_metric(
+        y_true=block_truth,
+        y_pred=block_pred,
+        sample_weight=tf.constant([0.5, 4.0, 0.25]),
+    )
+    assert float(bler) == pytest.approx(expected_bler)
+
+    # Masked block (weight 0)
+    bler_metric = BlockErrorRate(from_logits=False)
+    bler = bler_metric(
+        y_true=block_truth,
+        y_pred=block_pred,
+        sample_weight=tf.constant([1.0, 1.0, 0.0]),
+    )
+    assert bler == 0.5
+
+
+def test_bler_likelihood_ratios():
+    # errors in blocks 0 (likelihood ratio 0.5) and 2 (likelihood ratio 0.25), no error in block 1
+    block_truth = tf.zeros([3, 8])
+    block_pred = tf.constant([[1] + [0] * 7, [0] * 8, [1] * 8], dtype=tf.float32)
+
+    # Weighted errors, unweighted blocks count
+    expected_bler = (0.5 + 0.25) / 3
+
+    bler_metric = BlockErrorRate(from_logits=False, likelihood_ratios=True)
+    bler = bler_metric(
+        y_true=block_truth,
+        y_pred=block_pred,
+        sample_weight=tf.constant([0.5, 4.0, 0.25]),
+    )
+    assert bler == expected_bler
+
+
 if __name__ == "__main__":
     pytest.main()
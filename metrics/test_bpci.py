@@ -18,7 +18,7 @@ import pytest
 
 import tensorflow as tf
 
-from . import BitErrorRate
+from . import BitErrorRate, BlockErrorRate
 from . import BinomialProportionConfidenceInterval
 
 
@@ -51,5 +51,27 @@ def test_bpci_ber_nologits():
     assert all(confidence_interval == [0.22328992, 0.555763])
 
 
+def test_bpci_bler_likelihood_ratios():
+    # errors in blocks 0 and 1 (weight 0.5)
+    block_truth = tf.zeros([4, 8])
+    block_pred = tf.constant([[1] * 8, [1] * 8, [0] * 8, [0] * 8], dtype=tf.float32)
+    bpci_metric = BinomialProportionConfidenceInterval(
+        monitor_class=BlockErrorRate,
+        monitor_params={"name": "bpci_bler", "likelihood_ratios": True},
+    )
+    (span, ci_low, bler, ci_high) = bpci_metric(
+        y_true=block_truth,
+        y_pred=block_pred,
+        sample_weight=tf.constant([0.5, 0.5, 1.0, 1.0]),
+    )
+
+    # Normal interval of the mean of the weighted errors [0.5, 0.5, 0, 0]
+    half_span = bpci_metric.z * tf.sqrt((0.125 - 0.25**2) / 4)
+    tf.debugging.assert_near(bler, 0.25)
+    tf.debugging.assert_near(span, 2 * half_span)
+    tf.debugging.assert_near(ci_low, 0.25 - half_span)
+    tf.debugging.assert_near(ci_high, 0.25 + half_span)
+
+
 if __name__ == "__main__":
     pytest.main()
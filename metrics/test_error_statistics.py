@@ -0,0 +1,114 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+
+from . import (
+    BitErrorRate,
+    BlockErrorRate,
+    BitErrorCount,
+    BlockErrorCount,
+    BinomialProportionConfidenceInterval,
+    ErrorStatistics,
+)
+
+
+def separate_metrics(from_logits, likelihood_ratios=False):
+    params = {"from_logits": from_logits, "likelihood_ratios": likelihood_ratios}
+    return {
+        "BER": BitErrorRate(**params),
+        "BLER": BlockErrorRate(**params),
+        "BEC": BitErrorCount(from_logits=from_logits, mode="sum"),
+        "BLEC": BlockErrorCount(from_logits=from_logits, mode="sum"),
+        "BPCI_BER": BinomialProportionConfidenceInterval(
+            monitor_class=BitErrorRate,
+            monitor_params={"name": "bpci_ber", **params},
+        ),
+        "BPCI_BLER": BinomialProportionConfidenceInterval(
+            monitor_class=BlockErrorRate,
+            monitor_params={"name": "bpci_bler", **params},
+            # Blocks count
+            dimensions=[0],
+        ),
+    }
+
+
+@pytest.mark.parametrize("from_logits", [False, True])
+@pytest.mark.parametrize("weighted", [None, "sample_weight", "likelihood_ratios"])
+def test_error_statistics(from_logits, weighted):
+    likelihood_ratios = weighted == "likelihood_ratios"
+    metric = ErrorStatistics(
+        from_logits=from_logits, likelihood_ratios=likelihood_ratios
+    )
+    metrics = separate_metrics(from_logits, likelihood_ratios)
+    for seed in range(3):
+        y_true = tf.cast(
+            tf.random.stateless_uniform([50, 7], [seed, 0], maxval=2, dtype=tf.int32),
+            tf.float32,
+        )
+        y_pred = tf.random.stateless_normal([50, 7], [seed, 1]) + 2.0 * (y_true - 0.5)
+        if not from_logits:
+            y_pred = tf.sigmoid(y_pred)
+        sample_weight = None
+        if weighted is not None:
+            sample_weight = tf.random.stateless_uniform([50], [seed, 2])
+        metric.update_state(y_true, y_pred, sample_weight)
+        for (key, separate_metric) in metrics.items():
+            if key in ["BEC", "BLEC"]:
+                # Unweighted counts
+                separate_metric.update_state(y_true, y_pred)
+            else:
+                separate_metric.update_state(y_true, y_pred, sample_weight)
+
+    results = metric.result()
+    assert set(results) == set(metrics)
+    for (key, separate_metric) in metrics.items():
+        # The separate metrics evaluate the intervals from the float32 rates
+        tf.debugging.assert_near(
+            tf.cast(tf.stack(results[key]), tf.float32),
+            tf.cast(tf.stack(separate_metric.result()), tf.float32),
+            rtol=1e-6,
+            atol=0.0,
+        )
+
+    metric.reset_state()
+    assert metric.result()["BEC"] == 0
+
+
+def test_error_statistics_no_error():
+    metric = ErrorStatistics()
+    (span, ci_low, ber, ci_high) = metric(tf.zeros([10, 8]), tf.zeros([10, 8]))[
+        "BPCI_BER"
+    ]
+    # Rule of three
+    assert (span, ci_low, ber, ci_high) == (3.0 / 80, 0.0, 0.0, 3.0 / 80)
+
+
+def test_error_statistics_logs():
+    model = tf.keras.Sequential([tf.keras.layers.Lambda(lambda x: x)])
+    model.compile(loss="binary_crossentropy", metrics=[ErrorStatistics()])
+    y_pred = tf.constant([[0, 0, 1, 1], [0, 0, 0, 0]], dtype=tf.float32)
+    logs = model.evaluate(y_pred, tf.zeros([2, 4]), verbose=0, return_dict=True)
+    assert logs["BER"] == 0.25 and logs["BLER"] == 0.5
+    assert logs["BEC"] == 2.0 and logs["BLEC"] == 1.0
+    (ci_span, ci_low, ber, ci_high) = logs["BPCI_BER"]
+    assert ber == 0.25 and ci_low < ber < ci_high
+
+
+if __name__ == "__main__":
+    pytest.main()
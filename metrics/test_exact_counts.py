@@ -0,0 +1,116 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import numpy as np
+import tensorflow as tf
+
+from . import (
+    BitErrorRate,
+    BlockErrorRate,
+    BitErrorCount,
+    BlockErrorCount,
+    BinomialProportionConfidenceInterval,
+    PerSNRBitErrorRate,
+    PerSNRBlockErrorRate,
+    ErrorStatistics,
+)
+
+
+@pytest.mark.parametrize("offset", [2**24, 2**31])
+def test_exact_counts(offset):
+    # Long evaluation: the counts start beyond the float32 (2^24) or int32 (2^31) exact range
+    ber = BitErrorRate()
+    bler = BlockErrorRate()
+    bec = BitErrorCount(mode="sum")
+    blec = BlockErrorCount(mode="sum")
+    bpci = BinomialProportionConfidenceInterval(
+        monitor_class=BitErrorRate, monitor_params={"name": "bpci_ber"}
+    )
+    snr_ber = PerSNRBitErrorRate(2)
+    snr_bler = PerSNRBlockErrorRate(2)
+    statistics = ErrorStatistics()
+    for variable in (
+        ber.errors,
+        ber.total,
+        bler.errors,
+        bler.total,
+        bec.bec,
+        blec.blec,
+        bpci.n,
+        bpci.monitored_metric.errors,
+        bpci.monitored_metric.total,
+        snr_ber.errors,
+        snr_ber.total,
+        snr_bler.errors,
+        snr_bler.total,
+        statistics.bit_errors,
+        statistics.block_errors,
+        statistics.weighted_bit_errors,
+        statistics.weighted_block_errors,
+        statistics.bits,
+        statistics.blocks,
+    ):
+        variable.assign(tf.fill(variable.shape, tf.cast(offset, variable.dtype)))
+
+    # 3 bit errors, 1 block error in 31 bits
+    y_true = tf.zeros([1, 31])
+    y_pred = tf.constant([[1.0] * 3 + [0.0] * 28])
+    steps = 10
+    for _ in range(steps):
+        for metric in (ber, bler, bec, blec, bpci, statistics):
+            metric.update_state(y_true, y_pred)
+        for metric in (snr_ber, snr_bler):
+            metric.update_state(y_true, y_pred, tf.constant([1]))
+
+    assert ber.errors.numpy() == offset + 3 * steps
+    assert ber.total.numpy() == offset + 31 * steps
+    assert bler.errors.numpy() == offset + steps
+    assert bler.total.numpy() == offset + steps
+    assert bec.result().numpy() == offset + 3 * steps
+    assert blec.result().numpy() == offset + steps
+    assert bpci.n.numpy() == offset + 31 * steps
+    np.testing.assert_array_equal(snr_ber.errors, [offset, offset + 3 * steps])
+    np.testing.assert_array_equal(snr_ber.total, [offset, offset + 31 * steps])
+    np.testing.assert_array_equal(snr_bler.errors, [offset, offset + steps])
+    np.testing.assert_array_equal(snr_bler.total, [offset, offset + steps])
+
+    results = statistics.result()
+    assert results["BEC"].numpy() == offset + 3 * steps
+    assert results["BLEC"].numpy() == offset + steps
+    assert statistics.bits.numpy() == offset + 31 * steps
+    assert statistics.blocks.numpy() == offset + steps
+
+    # Rates of the exact counts
+    expected_ber = (offset + 3 * steps) / (offset + 31 * steps)
+    np.testing.assert_allclose(ber.result(), expected_ber, rtol=1e-7)
+    np.testing.assert_allclose(results["BER"], expected_ber, rtol=1e-7)
+    np.testing.assert_allclose(bpci.result()[2], expected_ber, rtol=1e-7)
+
+
+def test_exact_counts_accumulation():
+    # Batches of 31 bits accumulated across 2^24 (2^24 + 31 is not a float32)
+    ber = BitErrorRate()
+    ber.total.assign(2**24 - 31 * 5)
+    y_true = tf.zeros([1, 31])
+    for _ in range(10):
+        ber.update_state(y_true, y_true)
+    assert ber.total.numpy() == 2**24 + 31 * 5
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,103 @@
+"""
+Copyright (c) 2022 Orange
+
+Author: Quentin Lampin <quentin.lampin@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import pytest
+
+import tensorflow as tf
+
+from . import BitErrorRate, BlockErrorRate, PerSNRBitErrorRate, PerSNRBlockErrorRate
+
+
+def test_per_snr_ber_bler():
+    bits_truth = tf.zeros([4, 4], dtype=tf.float32)
+    bits_pred = tf.constant(
+        [[0, 0, 0, 1], [0, 0, 0, 0], [1, 1, 0, 0], [0, 1, 1, 1]], dtype=tf.float32
+    )
+    snr_indices = tf.constant([0, 0, 2, 2])
+
+    ber = PerSNRBitErrorRate(3)
+    ber.update_state(bits_truth, bits_pred, snr_indices)
+    bler = PerSNRBlockErrorRate(3)
+    bler.update_state(bits_truth, bits_pred, snr_indices)
+
+    tf.debugging.assert_equal(ber.errors, tf.constant([1.0, 0.0, 5.0], tf.float64))
+    tf.debugging.assert_equal(ber.total, tf.constant([8.0, 0.0, 8.0], tf.float64))
+    tf.debugging.assert_equal(bler.errors, tf.constant([1.0, 0.0, 2.0], tf.float64))
+    tf.debugging.assert_equal(bler.total, tf.constant([2.0, 0.0, 2.0], tf.float64))
+    # No sample in bin 1
+    assert tf.math.is_nan(ber.result()[1]) and tf.math.is_nan(bler.result()[1])
+
+
+def test_per_snr_eq_global_metrics():
+    bits_truth = tf.cast(
+        tf.random.stateless_uniform([100, 8], seed=[2, 1], maxval=2, dtype=tf.int32),
+        tf.float32,
+    )
+    logits = tf.random.stateless_normal([100, 8], seed=[2, 2])
+    snr_indices = tf.range(100) % 5
+
+    ber = PerSNRBitErrorRate(5, from_logits=True)
+    ber.update_state(bits_truth, logits, snr_indices)
+    bler = PerSNRBlockErrorRate(5, from_logits=True)
+    bler.update_state(bits_truth, logits, snr_indices)
+    for snr_index in range(5):
+        selected = snr_indices == snr_index
+        y_true, y_pred = (bits_truth[selected], logits[selected])
+        tf.debugging.assert_near(
+            ber.result()[snr_index], BitErrorRate(from_logits=True)(y_true, y_pred)
+        )
+        tf.debugging.assert_near(
+            bler.result()[snr_index],
+            BlockErrorRate(from_logits=True)(y_true, y_pred),
+        )
+
+    ber.reset_state()
+    tf.debugging.assert_equal(ber.total, tf.zeros([5], dtype=tf.float64))
+
+
+@pytest.mark.parametrize("likelihood_ratios", [False, True])
+def test_per_snr_sample_weight(likelihood_ratios):
+    bits_truth = tf.zeros([4, 4], dtype=tf.float32)
+    bits_pred = tf.constant(
+        [[0, 0, 0, 1], [0, 0, 0, 0], [1, 1, 0, 0], [0, 1, 1, 1]], dtype=tf.float32
+    )
+    snr_indices = tf.constant([0, 1, 0, 1])
+    sample_weight = tf.constant([0.5, 2.0, 0.0, 1.0])
+
+    params = {"likelihood_ratios": likelihood_ratios}
+    ber = PerSNRBitErrorRate(2, **params)
+    ber.update_state(bits_truth, bits_pred, snr_indices, sample_weight)
+    bler = PerSNRBlockErrorRate(2, **params)
+    bler.update_state(bits_truth, bits_pred, snr_indices, sample_weight)
+    # Same rates as the global metrics of the samples of each bin
+    for snr_index in range(2):
+        selected = snr_indices == snr_index
+        (y_true, y_pred, weights) = (
+            bits_truth[selected],
+            bits_pred[selected],
+            sample_weight[selected],
+        )
+        tf.debugging.assert_near(
+            ber.result()[snr_index], BitErrorRate(**params)(y_true, y_pred, weights)
+        )
+        tf.debugging.assert_near(
+            bler.result()[snr_index],
+            BlockErrorRate(**params)(y_true, y_pred, weights),
+        )
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -26,3 +26,4 @@ from .conversion import lineartodecibel, decibeltolinear, ebno_db_to_snr_db, ebn
 from .summary import Summary
 from .configuration import configurations_product, configurations_list
 from .study import create_paths_and_summaries
+from .reference_codes import load_code
@@ -0,0 +1,44 @@
+"""
+Reference codes
+
+Brief: Matrices of the reference codes of encoders/linearblockencoders_reference
+
+Copyright (c) 2022 Orange
+
+Author: Guillaume Larue <guillaume.larue@orange.com>
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), 
+to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, 
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice (including the next paragraph) shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS 
+FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER 
+IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+
+import os
+
+import numpy as np
+
+REFERENCE_CODES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "encoders",
+    "linearblockencoders_reference",
+)
+
+
+def load_code(codename, matrix="G"):
+    """load a matrix of a reference code (npz file)
+
+    Args:
+        codename (str): name of the code, e.g. "BCH_31_16"
+        matrix (str, optional): "G", "H_systematic" or "H_non_systematic". Defaults to "G".
+
+    Returns:
+        np.array: matrix
+    """
+    return np.load(os.path.join(REFERENCE_CODES_PATH, f"{codename}.npz"))[matrix]